@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmarks del procesamiento de CSV
+===================================
+
+Mide process_csv, process_csv_with_pandas, validate_csv_format,
+parse_ext_entries y calculate_hours_summary sobre CSV sintéticos de varios
+tamaños y compara contra la línea base guardada.
+
+Uso:
+    python benchmarks/bench_csv.py                     # comparar contra la línea base
+    python benchmarks/bench_csv.py --save-baseline     # actualizar la línea base
+    python benchmarks/bench_csv.py --sizes 1000,100000 --threshold 1.3
+
+Sale con código 1 si algún caso es más lento que la línea base por encima
+del umbral.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(ROOT_DIR)
+
+from synthetic_csv import write_csv
+from src.core.csv_processor import CSVProcessor
+from src.core.parse_cache import ParseCache
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "csv_baseline.json")
+HORARIOS = [
+    {"start_time": "7:00am", "end_time": "1:00pm"},
+    {"start_time": "2:00pm", "end_time": "4:00pm"},
+]
+
+
+def load_mapping():
+    with open(os.path.join(ROOT_DIR, "config", "cuentas.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def best_time(func, repeat):
+    """Mejor tiempo (segundos) de varias ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_cases(rows, workdir, repeat, options):
+    """Ejecutar todos los casos para un tamaño y retornar {caso: segundos}"""
+    mapping = load_mapping()
+    csv_path = write_csv(os.path.join(workdir, f"bench_{rows}.csv"), rows, **options)
+    csv_2col = write_csv(os.path.join(workdir, f"bench_{rows}_2col.csv"), rows, with_ext_column=False, **options)
+
+    # Cache deshabilitado para medir el parseo real
+    processor = CSVProcessor(cache=ParseCache(max_items=0))
+    processor.set_csv_file(csv_path)
+    processor_2col = CSVProcessor(cache=ParseCache(max_items=0))
+    processor_2col.set_csv_file(csv_2col)
+
+    time_entries = processor.process_csv_with_pandas(HORARIOS, mapping)
+    with open(csv_path, "r", encoding="utf-8") as f:
+        ext_strings = [line.rstrip("\n").split(",", 2)[2] for line in f if "EXT/" in line]
+
+    def parse_all_ext():
+        for ext in ext_strings:
+            processor.parse_ext_entries(ext, mapping)
+
+    cases = {
+        "process_csv": lambda: processor_2col.process_csv(HORARIOS, mapping),
+        "process_csv_with_pandas": lambda: processor.process_csv_with_pandas(HORARIOS, mapping),
+        "validate_csv_format": processor.validate_csv_format,
+        "parse_ext_entries": parse_all_ext,
+        "calculate_hours_summary": lambda: processor.calculate_hours_summary(time_entries),
+    }
+    return {f"{name}@{rows}": best_time(func, repeat) for name, func in cases.items()}
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, options):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "options": options,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regression_report(results, baseline, threshold):
+    """Tabla de comparación contra la línea base; retorna (texto, hay_regresiones)"""
+    base_results = baseline["results"] if baseline else {}
+    width = max(len(name) for name in results)
+    lines = [f"{'Caso':<{width}}  {'Actual (ms)':>12}  {'Base (ms)':>10}  {'Ratio':>7}  Estado", "-" * (width + 46)]
+    regressions = False
+    for name, seconds in results.items():
+        base = base_results.get(name)
+        if base:
+            ratio = seconds / base
+            status = "REGRESIÓN" if ratio > threshold else "ok"
+            regressions = regressions or ratio > threshold
+            lines.append(f"{name:<{width}}  {seconds * 1000:>12.2f}  {base * 1000:>10.2f}  {ratio:>7.2f}  {status}")
+        else:
+            lines.append(f"{name:<{width}}  {seconds * 1000:>12.2f}  {'-':>10}  {'-':>7}  sin base")
+    return "\n".join(lines), regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del procesamiento de CSV")
+    parser.add_argument("--sizes", default="1000,10000", help="Tamaños (filas) separados por coma")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por caso (se toma la mejor)")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Ratio actual/base a partir del cual se considera regresión")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Archivo de línea base")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--ext-density", type=float, default=0.1)
+    parser.add_argument("--nd-ratio", type=float, default=0.02)
+    parser.add_argument("--unknown-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    options = {
+        "ext_density": args.ext_density,
+        "nd_ratio": args.nd_ratio,
+        "unknown_ratio": args.unknown_ratio,
+        "seed": args.seed,
+    }
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            results.update(run_cases(rows, workdir, args.repeat, options))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, options)
+        print(f"Línea base guardada en {args.baseline}")
+
+    report, regressions = regression_report(results, load_baseline(args.baseline), args.threshold)
+    print(report)
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
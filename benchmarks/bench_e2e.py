@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo contra el mock de Replicon
+=========================================================
+
+Levanta benchmarks/mock_replicon.py en un puerto libre, apunta LOGIN_URL a
+él y ejecuta la automatización completa (login, mes y todas las entradas)
+con el navegador oculto.
+
+Con --strategies se comparan las estrategias de registro de entradas
+(webdriver, js, js_day) reportando segundos e idas y vueltas a chromedriver
+por punch en la etapa de entradas. Con --day-actions el mock ofrece "Copiar
+día anterior" y "Llenar semana" y se mide el plan que copia los días iguales.
+
+Uso:
+    python benchmarks/bench_e2e.py --csv mes.csv --save-latency 0.1 --profile perfiles/
+    python benchmarks/bench_e2e.py --strategies webdriver,js,js_day
+    python benchmarks/bench_e2e.py --day-actions
+    python benchmarks/bench_e2e.py --record grabacion.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(ROOT_DIR)
+
+from mock_replicon import MockReplicon, add_settings_arguments, settings_from_args
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la automatización contra el mock local")
+    parser.add_argument("--csv", default=os.path.join(ROOT_DIR, "mes.csv"), help="CSV del mes a registrar")
+    parser.add_argument("--show-browser", action="store_true", help="Mostrar el navegador")
+    parser.add_argument("--profile", metavar="DIR", help="Guardar el perfil de tiempos en DIR")
+    parser.add_argument("--events", action="store_true", help="Imprimir los eventos de progreso (JSON)")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON")
+    parser.add_argument("--strategies", default="webdriver",
+                        help="Estrategias de registro a comparar, separadas por coma (webdriver, js, js_day)")
+    parser.add_argument("--record", metavar="ARCHIVO",
+                        help="Grabar los comandos de WebDriver (JSONL) para benchmarks/bench_replay.py; "
+                             "con varias estrategias se agrega el nombre de cada una al archivo")
+    add_settings_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def record_file(path, entry_strategy, strategies):
+    """Archivo de grabación de la estrategia (grabacion.jsonl -> grabacion.js_day.jsonl si hay varias)"""
+    if not path or "," not in strategies:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}.{entry_strategy}{ext}"
+
+
+def run_benchmark(args, mock, entry_strategy):
+    """Ejecutar la automatización contra el mock con una estrategia y retornar las métricas"""
+    from config.config import Config
+    from src.core.account_mapper import AccountMapper
+    from src.core.automation_runner import AutomationRunner
+
+    mock.state.reset()
+    on_event = (lambda event: print(event.to_json(), flush=True)) if args.events else None
+    runner = AutomationRunner(
+        "benchmark@example.com",
+        "mock",
+        args.csv,
+        Config.load_horarios(),
+        AccountMapper().get_mapping(),
+        headless=not args.show_browser,
+        on_event=on_event,
+        profile_dir=args.profile,
+        entry_strategy=entry_strategy,
+        record_file=record_file(args.record, entry_strategy, args.strategies)
+    )
+
+    start = time.perf_counter()
+    error = None
+    try:
+        runner.run()
+    except Exception as e:
+        error = str(e)
+    wall_time = time.perf_counter() - start
+
+    with mock.state.lock:
+        punches = len(mock.state.punches)
+
+    timings = runner.tracker.stage_timings
+    entries_time = timings.get("entries", 0.0)
+    entries = punches // 2
+    return {
+        "strategy": entry_strategy,
+        "ok": error is None,
+        "error": error,
+        "wall_time": wall_time,
+        "stage_timings": timings,
+        "punches_saved": punches,
+        "entries_saved": entries,
+        "seconds_per_entry": entries_time / entries if entries else None,
+        "seconds_per_punch": entries_time / punches if punches else None,
+        "round_trips": runner.entries_commands,
+        "round_trips_per_punch": runner.entries_commands / punches if punches else None,
+        "profile": runner.profile_paths[0] if runner.profile_paths else None,
+        "plan": runner.plan.summary() if runner.plan else None,
+        "lookups_saved": runner.selenium_handler.page_cache.hits if runner.selenium_handler else 0,
+    }
+
+
+def run_strategies(args):
+    """Levantar el mock una vez y ejecutar cada estrategia pedida"""
+    strategies = [strategy.strip() for strategy in args.strategies.split(",") if strategy.strip()]
+    with MockReplicon(settings_from_args(args)) as mock:
+        # Config lee LOGIN_URL (y DAY_COPY) al importarse, así que se definen antes
+        os.environ["LOGIN_URL"] = mock.login_url
+        if args.day_actions:
+            os.environ.setdefault("DAY_COPY", "1")
+        return [run_benchmark(args, mock, strategy) for strategy in strategies]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_strategies(args)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0 if all(result["ok"] for result in results) else 1
+
+    for result in results:
+        print(f"Estrategia: {result['strategy']}")
+        print(f"Resultado: {'OK' if result['ok'] else 'ERROR: ' + result['error']}")
+        print(f"Tiempo total: {result['wall_time']:.2f}s")
+        for stage, seconds in result["stage_timings"].items():
+            print(f"  {stage:<10} {seconds:8.2f}s")
+        if result["plan"]:
+            print(result["plan"])
+        print(f"Entradas guardadas: {result['entries_saved']} ({result['punches_saved']} punches)")
+        if result["seconds_per_entry"]:
+            print(f"Segundos por entrada: {result['seconds_per_entry']:.2f}")
+        if result["profile"]:
+            print(f"Perfil: {result['profile']}")
+        print()
+
+    print(f"{'Estrategia':<12} {'Punches':>8} {'s/punch':>8} {'Idas y vueltas':>15} {'por punch':>10}")
+    for result in results:
+        per_punch = result["seconds_per_punch"]
+        trips = result["round_trips_per_punch"]
+        print(f"{result['strategy']:<12} {result['punches_saved']:>8} "
+              f"{per_punch if per_punch is not None else float('nan'):>8.2f} {result['round_trips']:>15} "
+              f"{trips if trips is not None else float('nan'):>10.1f}")
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark de lectores de CSV grandes
+====================================
+
+Compara process_csv (csv.reader), process_csv_with_pandas (chunks de
+pandas) y process_csv_mmap (rangos de bytes con mmap, en procesos y en el
+proceso actual) sobre un CSV sintético. Cada caso corre en un subproceso
+propio para medir el pico de memoria (RSS) sin interferencias.
+
+Uso:
+    python benchmarks/bench_reader.py --rows 1000000
+    python benchmarks/bench_reader.py --csv export.csv --cases mmap,mmap_inproc
+    python benchmarks/bench_reader.py --rows 300000 --range-mb 4 --save-baseline
+
+Reporta MB/s, la aceleración frente a pandas (el lector de los archivos de
+menos de 256 MB) y el pico de RSS (del proceso principal y del mayor proceso
+trabajador); termina con código 1 si un lector mmap no supera a pandas.
+Requiere el módulo resource (Linux/macOS).
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(ROOT_DIR)
+
+from synthetic_csv import write_csv
+
+CASES = ["csv_reader", "pandas", "mmap", "mmap_inproc"]
+MMAP_CASES = ("mmap", "mmap_inproc")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "reader_baseline.json")
+
+
+def load_json(*parts):
+    with open(os.path.join(ROOT_DIR, *parts), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def peak_rss_mb(who):
+    """Pico de RSS en MB (ru_maxrss está en KB en Linux y en bytes en macOS)"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case, csv_path, range_mb):
+    """Ejecutar un caso en el proceso actual y retornar sus métricas"""
+    from src.core.csv_processor import CSVProcessor
+    from src.core.parse_cache import ParseCache
+
+    horarios = load_json("config", "horarios.json")
+    mapping = load_json("config", "cuentas.json")
+    processor = CSVProcessor(cache=ParseCache(max_items=0))
+    processor.set_csv_file(csv_path)
+    processor.mmap_range_bytes = int(range_mb * 1024 * 1024)
+
+    start = time.perf_counter()
+    if case == "csv_reader":
+        entries = processor.process_csv(horarios, mapping)
+    elif case == "pandas":
+        entries = processor.process_csv_with_pandas(horarios, mapping)
+    elif case == "mmap":
+        entries = processor.process_csv_mmap(horarios, mapping)
+    else:
+        entries = processor.process_csv_mmap(horarios, mapping, processes=False)
+    seconds = time.perf_counter() - start
+
+    size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+    return {
+        "case": case,
+        "rows": len(entries),
+        "size_mb": size_mb,
+        "seconds": seconds,
+        "mb_per_s": size_mb / seconds if seconds else None,
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "worker_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_isolated(case, csv_path, range_mb):
+    """Ejecutar un caso en un subproceso para aislar su pico de memoria"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-case", case, "--csv", csv_path,
+         "--range-mb", str(range_mb)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def add_speedups(results):
+    """Agregar a cada resultado su aceleración frente al caso pandas (si se midió)"""
+    pandas = next((r for r in results if r["case"] == "pandas"), None)
+    for r in results:
+        r["vs_pandas"] = pandas["seconds"] / r["seconds"] if pandas and r["seconds"] else None
+    return results
+
+
+def slower_than_pandas(results):
+    """Casos mmap que no superan a pandas"""
+    return [r["case"] for r in results
+            if r["case"] in MMAP_CASES and r["vs_pandas"] is not None and r["vs_pandas"] <= 1]
+
+
+def save_baseline(path, results, options):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "options": options,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_results(results):
+    lines = [
+        f"{'Caso':<12} {'Filas':>10} {'MB':>8} {'Segundos':>9} {'MB/s':>8} {'x pandas':>9} "
+        f"{'RSS (MB)':>9} {'RSS trab.':>9}",
+        "-" * 81,
+    ]
+    for r in results:
+        speedup = f"{r['vs_pandas']:>9.1f}" if r.get("vs_pandas") else f"{'-':>9}"
+        lines.append(
+            f"{r['case']:<12} {r['rows']:>10} {r['size_mb']:>8.1f} {r['seconds']:>9.2f} "
+            f"{r['mb_per_s']:>8.2f} {speedup} {r['peak_rss_mb']:>9.1f} {r['worker_peak_rss_mb']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de lectores de CSV grandes")
+    parser.add_argument("--csv", help="CSV a leer (por defecto se genera uno sintético)")
+    parser.add_argument("--rows", type=int, default=200000, help="Filas del CSV sintético")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Casos separados por coma ({', '.join(CASES)})")
+    parser.add_argument("--range-mb", type=float, default=64, help="Tamaño de cada rango del lector mmap (MB)")
+    parser.add_argument("--json", action="store_true", help="Imprimir los resultados como JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Archivo de línea base")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.csv, args.range_mb)))
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = args.csv or write_csv(os.path.join(workdir, "bench.csv"), args.rows, seed=42)
+        # process_csv solo acepta el formato de dos columnas
+        csv_2col = None
+        if "csv_reader" in cases and not args.csv:
+            csv_2col = write_csv(os.path.join(workdir, "bench_2col.csv"), args.rows, with_ext_column=False, seed=42)
+
+        results = []
+        for case in cases:
+            if case == "csv_reader" and not csv_2col:
+                print("csv_reader omitido: requiere un CSV de dos columnas", file=sys.stderr)
+                continue
+            path = csv_2col if case == "csv_reader" else csv_path
+            results.append(run_isolated(case, path, args.range_mb))
+
+    add_speedups(results)
+    if args.save_baseline:
+        options = {"rows": None if args.csv else args.rows, "range_mb": args.range_mb}
+        save_baseline(args.baseline, results, options)
+        print(f"Línea base guardada en {args.baseline}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results))
+    slower = slower_than_pandas(results)
+    if slower:
+        print(f"Más lentos que pandas: {', '.join(slower)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Reproducción offline de una grabación de comandos de WebDriver
+===============================================================
+
+Una ejecución real con --record (o RECORD_COMMANDS) guarda cada comando de
+WebDriver con su latencia y la forma de su resultado. Este benchmark vuelve a
+ejecutar plan_days y batch_entries_same_day del código actual contra un driver
+falso que responde con lo grabado y avanza un reloj virtual con las latencias
+grabadas (y con las esperas de WebDriverWait y de los reintentos), sin
+navegador ni Replicon.
+
+Cada comando se reconoce por su clave (localizador, hash del script o la
+búsqueda que encontró el elemento) y recibe la siguiente respuesta grabada con
+esa clave; si se acaban se repite la última. Los comandos que el código actual
+envía y la grabación no tiene se responden con un valor neutro (elemento
+encontrado, lista vacía, None) y se cuentan como "sin grabar".
+
+Así un cambio en add_time_entry, batch_entries_same_day o en las esperas se
+compara por cantidad de comandos y tiempo simulado contra la ejecución grabada.
+
+Uso:
+    python cli.py --csv mes.csv --record grabacion.jsonl
+    python benchmarks/bench_replay.py grabacion.jsonl --csv mes.csv --month 2026-10
+    python benchmarks/bench_replay.py grabacion.jsonl --csv mes.csv --entry-strategy js_day --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(ROOT_DIR)
+
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import wait as support_wait
+
+from src.core.command_recorder import CDP_COMMAND, ELEMENT_PLACEHOLDER, MARK_ENTRIES, command_key, load_recording
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"  # Referencia de elemento W3C
+
+
+class VirtualClock:
+    """Reloj que solo avanza con las latencias grabadas y las esperas (sleep)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+
+class ReplayExecutor:
+    """Reemplazo de RemoteConnection que responde cada comando con la grabación"""
+
+    def __init__(self, commands, clock):
+        self.clock = clock
+        self.queues = defaultdict(deque)
+        latencies = defaultdict(list)
+        for record in commands:
+            self.queues[record["key"]].append(record)
+            latencies[record["command"]].append(record["latency"])
+        # Latencia para los comandos sin grabar: la mediana de ese tipo de comando
+        self.median_latency = {command: statistics.median(values) for command, values in latencies.items()}
+        self.origins = {}  # id de elemento falso -> clave de la búsqueda que lo retornó
+        self.commands = 0
+        self.unmatched = defaultdict(int)  # clave -> veces sin respuesta grabada
+        self._next_id = 0
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            return {"value": {"sessionId": "replay", "capabilities": {"browserName": "chrome"}}}
+        self.commands += 1
+        key = command_key(command, params, self.origins)
+        queue = self.queues.get(key)
+        if queue:
+            record = queue.popleft() if len(queue) > 1 else queue[0]
+        else:
+            self.unmatched[key] += 1
+            record = {"latency": self.median_latency.get(command, 0.0), "value": self.default_value(command)}
+        self.clock.sleep(record["latency"])
+        if "error" in record:
+            return {"status": record["error"], "value": {"error": record["error"], "message": "respuesta grabada"}}
+        return {"status": 0, "value": self.decode(record["value"], key)}
+
+    @staticmethod
+    def default_value(command):
+        if command in (Command.FIND_ELEMENT, Command.FIND_CHILD_ELEMENT):
+            return ELEMENT_PLACEHOLDER
+        if command in (Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS):
+            return []
+        if command == CDP_COMMAND:
+            return {}
+        return None
+
+    def decode(self, value, key):
+        """Convertir los marcadores de elemento en referencias nuevas ligadas a la clave"""
+        if value == ELEMENT_PLACEHOLDER:
+            self._next_id += 1
+            element_id = f"replay-{self._next_id}"
+            self.origins[element_id] = key
+            return {ELEMENT_KEY: element_id}
+        if isinstance(value, list):
+            return [self.decode(item, key) for item in value]
+        if isinstance(value, dict):
+            return {name: self.decode(item, key) for name, item in value.items()}
+        return value
+
+
+class ReplayDriver(WebDriver):
+    """Driver de Selenium real sobre ReplayExecutor (WebElement, esperas y errores sin cambios)"""
+
+    def __init__(self, executor):
+        super().__init__(command_executor=executor, options=ChromeOptions())
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute(CDP_COMMAND, {"cmd": cmd, "params": cmd_args})["value"]
+
+
+@contextmanager
+def virtual_time(clock):
+    """Hacer que WebDriverWait y las pausas del handler usen el reloj virtual"""
+    import src.core.selenium_handler as selenium_handler
+
+    original_time, original_sleep = support_wait.time, selenium_handler.sleep
+    support_wait.time = clock
+    selenium_handler.sleep = clock.sleep
+    try:
+        yield clock
+    finally:
+        support_wait.time = original_time
+        selenium_handler.sleep = original_sleep
+
+
+def load_entries(csv_file):
+    """Entradas del CSV procesadas igual que en la ejecución real"""
+    from config.config import Config
+    from src.core.account_mapper import AccountMapper
+    from src.core.csv_processor import CSVProcessor
+
+    processor = CSVProcessor()
+    processor.set_csv_file(csv_file)
+    return processor.load_time_entries(Config.load_horarios(), AccountMapper().get_mapping())
+
+
+def replay(recording, csv_file, month=None, entry_strategy=None):
+    """Reproducir la etapa de entradas y retornar las métricas grabadas y simuladas"""
+    from config.config import Config
+    from src.core.selenium_handler import SeleniumHandler
+    from src.core.work_calendar import parse_month, work_calendar
+
+    commands = load_recording(recording, since=MARK_ENTRIES)
+    time_entries = load_entries(csv_file)
+    month_calendar = work_calendar.month(*parse_month(month)) if month else work_calendar.month()
+
+    # No grabar encima de la grabación que se reproduce
+    Config.RECORD_COMMANDS = ""
+    handler = SeleniumHandler(entry_strategy=entry_strategy)
+    handler.watchdog = None  # Reciclar abriría un Chrome real
+    clock = VirtualClock()
+    executor = ReplayExecutor(commands, clock)
+    handler.driver = ReplayDriver(executor)
+    handler.retrier.sleep = clock.sleep
+
+    error = None
+    start = time.perf_counter()
+    with virtual_time(clock):
+        try:
+            plan = handler.plan_days(time_entries, month_calendar)
+            handler.batch_entries_same_day(time_entries, month_calendar=month_calendar, plan=plan)
+        except Exception as e:
+            error = str(e)
+    python_seconds = time.perf_counter() - start
+
+    return {
+        "strategy": handler.entry_strategy,
+        "ok": error is None,
+        "error": error,
+        "recorded_commands": len(commands),
+        "recorded_seconds": sum(record["latency"] for record in commands),
+        "replayed_commands": executor.commands,
+        "waited_seconds": clock.now,
+        "python_seconds": python_seconds,
+        "simulated_seconds": clock.now + python_seconds,
+        "unmatched_commands": sum(executor.unmatched.values()),
+        "unmatched": dict(sorted(executor.unmatched.items(), key=lambda item: -item[1])),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproducir una grabación de comandos de WebDriver sin navegador")
+    parser.add_argument("recording", help="Archivo JSONL grabado con --record o RECORD_COMMANDS")
+    parser.add_argument("--csv", default=os.path.join(ROOT_DIR, "mes.csv"), help="CSV de la ejecución grabada")
+    parser.add_argument("--month", metavar="AAAA-MM", help="Mes del CSV (por defecto el actual)")
+    parser.add_argument("--entry-strategy", help="Estrategia de registro (por defecto ENTRY_STRATEGY)")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("LOGIN_URL", "http://replay.invalid/login")
+    result = replay(args.recording, args.csv, args.month, args.entry_strategy)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0 if result["ok"] else 1
+
+    print(f"Estrategia: {result['strategy']}")
+    print(f"Resultado: {'OK' if result['ok'] else 'ERROR: ' + result['error']}")
+    print(f"{'':<12} {'Comandos':>9} {'Segundos':>9}")
+    print(f"{'Grabado':<12} {result['recorded_commands']:>9} {result['recorded_seconds']:>9.2f}")
+    print(f"{'Simulado':<12} {result['replayed_commands']:>9} {result['simulated_seconds']:>9.2f}")
+    print(f"  esperas y latencias {result['waited_seconds']:.2f}s, Python {result['python_seconds']:.2f}s")
+    if result["unmatched_commands"]:
+        print(f"Comandos sin grabar: {result['unmatched_commands']}")
+        for key, count in list(result["unmatched"].items())[:10]:
+            print(f"  {count:>4} {key}")
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque de la interfaz gráfica
+=============================================
+
+Lanza main.py varias veces con REPLICON_STARTUP_TIMING=1 y
+REPLICON_STARTUP_EXIT=1. La aplicación imprime sus marcas internas (imports,
+ventana creada, primer pintado) y se cierra al primer pintado. Se mide además
+el tiempo de reloj desde que se lanza el proceso hasta que la ventana es
+visible, que incluye el arranque del intérprete.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --offscreen --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+
+def run_once(offscreen=False, timeout=60):
+    """Lanzar la aplicación una vez y retornar sus marcas más el tiempo de reloj"""
+    env = dict(os.environ, REPLICON_STARTUP_TIMING="1", REPLICON_STARTUP_EXIT="1")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT_DIR, "main.py")],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    marks = None
+    try:
+        for line in process.stdout:
+            if line.startswith('{"startup"'):
+                wall = time.perf_counter() - start
+                marks = json.loads(line)["startup"]
+                marks["proceso_a_ventana"] = round(wall, 4)
+                break
+        process.wait(timeout=timeout)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    if marks is None:
+        raise RuntimeError(f"La aplicación no reportó el arranque: {process.stderr.read().strip()}")
+    return marks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo desde el inicio del proceso hasta la primera ventana visible")
+    parser.add_argument("--runs", type=int, default=5, help="Cantidad de arranques a medir")
+    parser.add_argument("--offscreen", action="store_true", help="Usar la plataforma offscreen de Qt (sin pantalla)")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.offscreen) for _ in range(args.runs)]
+    names = list(dict.fromkeys(name for marks in runs for name in marks))
+    medians = {
+        name: statistics.median(marks[name] for marks in runs if name in marks)
+        for name in names
+    }
+
+    if args.json:
+        print(json.dumps({"runs": runs, "median": medians}, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"Arranques medidos: {len(runs)} (mediana)")
+    for name, seconds in medians.items():
+        print(f"  {name:<20} {seconds:8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
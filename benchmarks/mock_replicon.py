@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Servidor local que simula Okta y Replicon
+=========================================
+
+Reproduce la estructura del DOM que esperan los métodos de SeleniumHandler
+(login, switch_to_replicon, select_month, batch_entries_same_day y
+add_time_entry) para medir la automatización sin conexión y sin tocar el
+tenant real. Las latencias son configurables para obtener mediciones
+deterministas.
+
+Uso:
+    python benchmarks/mock_replicon.py --port 8765 --save-latency 0.2
+
+Luego definir LOGIN_URL=http://127.0.0.1:8765/login en el .env o en el entorno.
+"""
+
+import argparse
+import calendar
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import date
+from urllib.parse import urlparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAVE_PUNCH_PATH = "/replicon/services/TimePunchService/SavePunch"
+COPY_PUNCHES_PATH = "/replicon/services/TimePunchService/CopyDayPunches"
+TIME_PATTERN = re.compile(r"^(1[0-2]|[1-9]):[0-5][0-9](am|pm)$")
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+#timesheet { width: 55%; padding: 10px; }
+.timesheetDays > li { border-bottom: 1px solid #ccc; padding: 6px; list-style: none; }
+.componentPunchSegment a { margin-right: 8px; }
+.contextPopupNode { position: fixed; top: 20px; right: 20px; width: 35%; background: #fff;
+                    border: 1px solid #333; padding: 10px; z-index: 10; }
+.loading { position: fixed; top: 0; left: 0; width: 10px; height: 10px; background: #999; }
+.error { color: #c00; }
+"""
+
+
+class MockSettings:
+    """Latencias y datos del mock"""
+
+    def __init__(self, page_latency=0.0, save_latency=0.0, loading_ms=0, reopen_ms=1000,
+                 days=31, holidays=None, vacations=None, reject_projects=None, mapping_file=None,
+                 day_actions=False, first_weekday=None):
+        self.page_latency = page_latency  # Segundos de espera al servir cada página
+        self.save_latency = save_latency  # Segundos que tarda el servidor en guardar un punch
+        self.loading_ms = loading_ms  # Duración del overlay "loading" tras elegir la cuenta
+        self.reopen_ms = reopen_ms  # Espera antes de reabrir el diálogo para el siguiente punch
+        self.days = days
+        self.holidays = set(holidays or [])
+        self.vacations = set(vacations or [])
+        self.reject_projects = set(reject_projects or [])  # Proyectos que el servidor rechaza
+        self.projects = load_project_tree(mapping_file or os.path.join(ROOT_DIR, "config", "cuentas.json"))
+        self.day_actions = day_actions  # Mostrar "Copiar día anterior" y "Llenar semana" en cada día
+        # Día de la semana del día 1 (0 = lunes); por defecto el del mes actual
+        today = date.today()
+        self.first_weekday = (calendar.monthrange(today.year, today.month)[0]
+                              if first_weekday is None else first_weekday)
+
+
+def load_project_tree(mapping_file):
+    """Construir el árbol proyecto → cuentas que muestra el multiLevelSelector"""
+    with open(mapping_file, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    projects = {}
+    for info in mapping.values():
+        name = info.get("name", "")
+        if not name or name in ("Vacation", "No work"):
+            continue
+        accounts = projects.setdefault(name, [])
+        for account in info.get("projects", {}).values():
+            if account and account not in accounts:
+                accounts.append(account)
+    for name, accounts in projects.items():
+        if not accounts:
+            accounts.append(f"{name}-General")
+    return projects
+
+
+class MockState:
+    """Punches guardados por el servidor (para verificar las corridas)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.punches = []
+        self.requests = 0
+
+    def reset(self):
+        with self.lock:
+            self.punches = []
+            self.requests = 0
+
+
+# ----------------------------------------------------------------------------
+# Páginas
+# ----------------------------------------------------------------------------
+
+def login_page():
+    """Formulario de Okta con la misma anidación que las XPath absolutas de login()"""
+    return """<!DOCTYPE html>
+<html><head><title>Okta (mock)</title><style>__STYLE__</style></head>
+<body>
+<div id="skip"></div>
+<div>
+  <div></div>
+  <div>
+    <main>
+      <div></div>
+      <div><div><div>
+        <div></div>
+        <div>
+          <form onsubmit="return false;">
+            <div>
+              <div></div>
+              <div></div>
+              <div>
+                <div></div>
+                <div><div>Usuario</div><div><span><input type="text" name="identifier"></span></div></div>
+              </div>
+              <div>
+                <div><div>Contraseña</div><div><span><input type="password" name="credentials.passcode"></span></div></div>
+              </div>
+            </div>
+            <div>
+              <input type="button" value="Siguiente" onclick="submitStep()">
+              <div><div></div><div><div></div><div><div></div><div id="push" onclick="pushVerified()">Enviar push</div></div></div></div>
+            </div>
+          </form>
+        </div>
+      </div></div></div>
+    </main>
+  </div>
+</div>
+<script>
+var step = 0;
+function submitStep() { step += 1; }
+function pushVerified() {
+  setTimeout(function () { window.location = "/dashboard"; }, 0);
+}
+</script>
+</body></html>
+""".replace("__STYLE__", STYLE)
+
+
+def dashboard_page():
+    """Panel de Okta con el enlace que abre Replicon en otra ventana"""
+    return """<!DOCTYPE html>
+<html><head><title>Okta Dashboard (mock)</title></head>
+<body>
+<div id="main-content">
+  <section><section><section><div><section><div>
+    <a aria-label="launch app Replicon" href="/replicon/overview" target="_blank">Replicon</a>
+  </div></section></div></section></section></section>
+</div>
+</body></html>
+"""
+
+
+def overview_page():
+    """Página inicial de Replicon con la tarjeta del timesheet actual"""
+    return """<!DOCTYPE html>
+<html><head><title>Replicon Overview (mock)</title></head>
+<body>
+<div>
+  <div><span class="userWelcomeText">Bienvenido</span></div>
+  <div></div>
+  <div>
+    <div></div>
+    <div></div>
+    <div><div>
+      <div></div>
+      <div>
+        <div>
+          <overview-page>
+            <div></div>
+            <div><div><div>
+              <div></div>
+              <div></div>
+              <div>
+                <timesheet-card><div><article>
+                  <current-timesheet-card-item><div><ul>
+                    <li onclick="window.location='/replicon/timesheet'">Timesheet actual</li>
+                  </ul></div></current-timesheet-card-item>
+                </article></div></timesheet-card>
+              </div>
+            </div></div></div>
+          </overview-page>
+        </div>
+      </div>
+    </div></div>
+  </div>
+</div>
+</body></html>
+"""
+
+
+def timesheet_page(settings):
+    """Timesheet del mes: li[día + 1] para cada día, como espera batch_entries_same_day"""
+    days_html = ['<li class="timesheetHeader">Días</li>']
+    for day in range(1, settings.days + 1):
+        parts = [f'<li class="day" data-day="{day}"><div class="dayHeader">Día {day}</div>']
+        if settings.day_actions:
+            parts.append(f'<div class="dayActions"><a class="copyPreviousDay" href="#" onclick="copyDay({day}); '
+                         f'return false;">Copiar día anterior</a> <a class="fillWeek" href="#" '
+                         f'onclick="fillWeek({day}); return false;">Llenar semana</a></div>')
+        if day in settings.holidays:
+            parts.append('<div><div class="holidayIndicator"></div></div>')
+        parts.append(f'<div class="punches" id="punches-{day}"></div><ul>')
+        if day in settings.vacations:
+            parts.append('<li><div><span>Col-Vacations</span></div></li>')
+        parts.append(f'<li><a class="timeEntryCell" href="#" onclick="openPunchDialog({day}); return false;">+</a></li>')
+        parts.append('</ul></li>')
+        days_html.append("".join(parts))
+
+    config = {
+        "projects": settings.projects,
+        "loadingMs": settings.loading_ms,
+        "reopenMs": settings.reopen_ms,
+        "savePath": SAVE_PUNCH_PATH,
+        "copyPath": COPY_PUNCHES_PATH,
+        "days": settings.days,
+        "firstWeekday": settings.first_weekday,
+        "skipDays": sorted(settings.holidays | settings.vacations),
+    }
+    return """<!DOCTYPE html>
+<html><head><title>Replicon Timesheet (mock)</title><style>__STYLE__</style></head>
+<body>
+<div><span class="userWelcomeText">Bienvenido</span></div>
+<div id="timesheet"><ul class="timesheetDays">__DAYS__</ul></div>
+<div id="popupHost"></div>
+<script>
+var CONFIG = __CONFIG__;
+var current = null;  // {day, mode, segment, project, account}
+var reopenTimer = null;
+
+function closeDialog() {
+  document.getElementById("popupHost").innerHTML = "";
+}
+
+function openPunchDialog(day, mode, segment) {
+  mode = mode || "in";
+  clearTimeout(reopenTimer);
+  current = {day: day, mode: mode, segment: segment || null, project: null, account: null};
+  var html = '<div class="contextPopupNode editPunchDialog">' +
+    '<table class="fieldTable fieldTableNarrow"><tr><th>Hora</th><td><input class="time" type="text"></td></tr>';
+  if (mode === "in") {
+    html += '<tr><th>Proyecto</th><td><a class="divDropdown multiLevelSelector divDropdownSelectionNeeded" href="#" ' +
+      'onclick="openProjects(); return false;">Seleccionar</a><div id="projectList"></div><div id="accountList"></div></td></tr>';
+  }
+  html += '</table><div class="error" id="punchError"></div>' +
+    '<input type="button" value="OK" onclick="savePunch()"> ' +
+    '<input type="button" value="Cancelar" onclick="closeDialog()"></div>';
+  document.getElementById("popupHost").innerHTML = html;
+}
+
+function openProjects() {
+  var names = Object.keys(CONFIG.projects);
+  var html = '<div class="multiLevelSelectorList"><ul>';
+  for (var i = 0; i < names.length; i++) {
+    html += '<li><a href="#" data-project-id="p' + i + '" onclick="chooseProject(' + i + '); return false;">' +
+      names[i] + '</a></li>';
+  }
+  document.getElementById("projectList").innerHTML = html + '</ul></div>';
+}
+
+function chooseProject(index) {
+  var name = Object.keys(CONFIG.projects)[index];
+  current.project = name;
+  document.getElementById("projectList").innerHTML = "";
+  var accounts = CONFIG.projects[name];
+  var html = '<div class="listArea overthrow"><ul>';
+  for (var i = 0; i < accounts.length; i++) {
+    html += '<li><a href="#" data-account-id="p' + index + '-a' + i + '" onclick="chooseAccount(' + i + '); return false;">' +
+      accounts[i] + '</a></li>';
+  }
+  document.getElementById("accountList").innerHTML = html + '</ul></div>';
+}
+
+function chooseAccount(index) {
+  current.account = CONFIG.projects[current.project][index];
+  document.getElementById("accountList").innerHTML = "";
+  var dropdown = document.querySelector(".multiLevelSelector");
+  dropdown.className = "divDropdown multiLevelSelector";
+  dropdown.textContent = current.project + " / " + current.account;
+  if (CONFIG.loadingMs > 0) {
+    var overlay = document.createElement("div");
+    overlay.className = "loading";
+    document.body.appendChild(overlay);
+    setTimeout(function () { overlay.parentNode.removeChild(overlay); }, CONFIG.loadingMs);
+  }
+}
+
+function savePunch() {
+  var time = document.querySelector(".editPunchDialog input.time").value.trim();
+  var payload = {day: current.day, type: current.mode, time: time,
+                 project: current.project, account: current.account};
+  var punch = current;
+  var xhr = new XMLHttpRequest();
+  xhr.open("POST", CONFIG.savePath);
+  xhr.setRequestHeader("Content-Type", "application/json");
+  xhr.onload = function () {
+    if (xhr.status !== 200) {
+      document.getElementById("punchError").textContent = xhr.responseText;
+      return;
+    }
+    closeDialog();
+    if (punch.mode === "in") {
+      addSegment(punch.day, time);
+    } else {
+      completeSegment(punch.segment, time);
+      reopenTimer = setTimeout(function () { openPunchDialog(punch.day); }, CONFIG.reopenMs);
+    }
+  };
+  xhr.send(JSON.stringify(payload));
+}
+
+function addSegment(day, time) {
+  var segment = document.createElement("div");
+  segment.className = "componentPunchSegment combinedInput";
+  segment.innerHTML = '<a href="#"><span>' + time + '</span></a><a href="#"><span>--</span></a>';
+  segment.children[1].onclick = function () { openPunchDialog(day, "out", segment); return false; };
+  document.getElementById("punches-" + day).appendChild(segment);
+}
+
+function completeSegment(segment, time) {
+  segment.className = "componentPunchSegment combinedInput completed";
+  segment.children[1].onclick = null;
+  segment.children[1].innerHTML = '<span>' + time + '</span><span>ok</span>';
+}
+
+function copyDay(day) {
+  copyPunches(day - 1, [day]);
+}
+
+function fillWeek(day) {
+  // Laborables restantes de la semana, sin feriados, vacaciones ni punches
+  var targets = [];
+  for (var d = day + 1; d <= CONFIG.days; d++) {
+    var weekday = (CONFIG.firstWeekday + d - 1) % 7;
+    if (weekday === 0) { break; }
+    if (weekday >= 5 || CONFIG.skipDays.indexOf(d) >= 0 ||
+        document.getElementById("punches-" + d).children.length) { continue; }
+    targets.push(d);
+  }
+  copyPunches(day, targets);
+}
+
+function copyPunches(source, targets) {
+  var xhr = new XMLHttpRequest();
+  xhr.open("POST", CONFIG.copyPath);
+  xhr.setRequestHeader("Content-Type", "application/json");
+  xhr.onload = function () {
+    if (xhr.status !== 200) { return; }
+    var segments = JSON.parse(xhr.responseText).segments;
+    targets.forEach(function (day) {
+      segments.forEach(function (times) {
+        addSegment(day, times[0]);
+        var host = document.getElementById("punches-" + day);
+        completeSegment(host.lastChild, times[1]);
+      });
+    });
+  };
+  xhr.send(JSON.stringify({from: source, to: targets}));
+}
+</script>
+</body></html>
+""".replace("__STYLE__", STYLE).replace("__DAYS__", "\n".join(days_html)).replace(
+        "__CONFIG__", json.dumps(config, ensure_ascii=False))
+
+
+# ----------------------------------------------------------------------------
+# Servidor
+# ----------------------------------------------------------------------------
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Atiende las páginas del mock y el endpoint de guardado de punches"""
+
+    settings = None
+    state = None
+
+    def log_message(self, format, *args):
+        """Silenciar el log por petición"""
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        pages = {
+            "/login": login_page,
+            "/dashboard": dashboard_page,
+            "/replicon/overview": overview_page,
+            "/replicon/timesheet": lambda: timesheet_page(self.settings),
+        }
+        with self.state.lock:
+            self.state.requests += 1
+
+        if path in pages:
+            if self.settings.page_latency:
+                time.sleep(self.settings.page_latency)
+            self._send(200, pages[path]())
+        elif path == "/api/punches":
+            with self.state.lock:
+                body = json.dumps(self.state.punches, ensure_ascii=False)
+            self._send(200, body, "application/json")
+        else:
+            self._send(404, "No encontrado", "text/plain; charset=utf-8")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+
+        if path == "/api/reset":
+            self.state.reset()
+            self._send(200, "{}", "application/json")
+            return
+        if path not in (SAVE_PUNCH_PATH, COPY_PUNCHES_PATH):
+            self._send(404, "No encontrado", "text/plain; charset=utf-8")
+            return
+
+        if self.settings.save_latency:
+            time.sleep(self.settings.save_latency)
+        try:
+            punch = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            self._send(400, "JSON inválido", "text/plain; charset=utf-8")
+            return
+
+        if path == COPY_PUNCHES_PATH:
+            self._copy_punches(punch.get("from"), punch.get("to", []))
+            return
+
+        error = self._validate_punch(punch)
+        if error:
+            self._send(422, error, "text/plain; charset=utf-8")
+            return
+
+        with self.state.lock:
+            self.state.punches.append(punch)
+            punch_id = len(self.state.punches)
+        self._send(200, json.dumps({"status": "ok", "punchId": punch_id}), "application/json")
+
+    def _copy_punches(self, source, targets):
+        """Copiar los punches de un día a otros (copiar día anterior y llenar semana)"""
+        with self.state.lock:
+            copied = [punch for punch in self.state.punches if punch.get("day") == source]
+            for target in targets:
+                self.state.punches.extend({**punch, "day": target} for punch in copied)
+        ins = [punch["time"] for punch in copied if punch.get("type") == "in"]
+        outs = [punch["time"] for punch in copied if punch.get("type") == "out"]
+        self._send(200, json.dumps({"status": "ok", "segments": list(zip(ins, outs))}), "application/json")
+
+    def _validate_punch(self, punch):
+        """Reglas mínimas que aplica Replicon al guardar"""
+        if not TIME_PATTERN.match(str(punch.get("time", ""))):
+            return f"Hora inválida: {punch.get('time')}"
+        if punch.get("type") == "in":
+            if not punch.get("project") or not punch.get("account"):
+                return "Debe seleccionar proyecto y cuenta"
+            if punch.get("project") in self.settings.reject_projects:
+                return f"Proyecto cerrado: {punch.get('project')}"
+        return None
+
+
+class MockReplicon:
+    """Servidor mock en un hilo propio (para usar desde benchmarks)"""
+
+    def __init__(self, settings=None, host="127.0.0.1", port=0):
+        self.settings = settings or MockSettings()
+        self.state = MockState()
+        handler = type("BoundMockHandler", (MockHandler,), {"settings": self.settings, "state": self.state})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def login_url(self):
+        return f"{self.base_url}/login"
+
+    def start(self):
+        """Iniciar el servidor en segundo plano"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Detener el servidor"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def parse_day_list(value):
+    """Convertir '5,6,12' en lista de enteros"""
+    return [int(item) for item in value.split(",") if item.strip()] if value else []
+
+
+def add_settings_arguments(parser):
+    """Argumentos de latencia y datos compartidos por el mock y los benchmarks"""
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Segundos por página servida")
+    parser.add_argument("--save-latency", type=float, default=0.0, help="Segundos para guardar cada punch")
+    parser.add_argument("--loading-ms", type=int, default=0, help="Duración del overlay 'loading' (ms)")
+    parser.add_argument("--reopen-ms", type=int, default=1000,
+                        help="Espera antes de reabrir el diálogo para el siguiente punch (ms)")
+    parser.add_argument("--days", type=int, default=31, help="Días del timesheet")
+    parser.add_argument("--holidays", default="", help="Días feriados, separados por coma")
+    parser.add_argument("--vacations", default="", help="Días de vacaciones, separados por coma")
+    parser.add_argument("--day-actions", action="store_true",
+                        help="Ofrecer las acciones 'Copiar día anterior' y 'Llenar semana'")
+
+
+def settings_from_args(args):
+    """Crear MockSettings a partir de los argumentos"""
+    return MockSettings(
+        page_latency=args.page_latency,
+        save_latency=args.save_latency,
+        loading_ms=args.loading_ms,
+        reopen_ms=args.reopen_ms,
+        days=args.days,
+        holidays=parse_day_list(args.holidays),
+        vacations=parse_day_list(args.vacations),
+        day_actions=args.day_actions,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor mock de Okta/Replicon")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_settings_arguments(parser)
+    args = parser.parse_args(argv)
+
+    mock = MockReplicon(settings_from_args(args), host=args.host, port=args.port)
+    print(f"Mock de Replicon en {mock.login_url} (Ctrl+C para detener)")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
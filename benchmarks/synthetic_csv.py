@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Generador de CSV sintéticos para benchmarks
+===========================================
+
+Genera archivos con el formato de mes.csv (Cuenta, Projecto, Extras) de
+tamaño configurable usando los códigos reales de config/cuentas.json.
+
+Uso:
+    python benchmarks/synthetic_csv.py salida.csv --rows 100000 --ext-density 0.2 \\
+        --nd-ratio 0.05 --unknown-ratio 0.01 --seed 42
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MAPPING = os.path.join(ROOT_DIR, "config", "cuentas.json")
+
+
+def load_codes(mapping_file=DEFAULT_MAPPING):
+    """Obtener pares (cuenta, proyecto) de trabajo y códigos de descanso del mapeo"""
+    with open(mapping_file, "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    work_pairs = []
+    rest_codes = []
+    for code, info in mapping.items():
+        if info.get("name") in ("Vacation", "No work"):
+            rest_codes.append(code)
+            continue
+        for project_code in info.get("projects", {}):
+            work_pairs.append((code, project_code))
+    return work_pairs, rest_codes
+
+
+def random_ext(rng, work_pairs, max_segments=2):
+    """Generar una entrada EXT con segmentos después de la jornada normal"""
+    segments = []
+    start_hour = 16
+    for _ in range(rng.randint(1, max_segments)):
+        if start_hour >= 23:
+            break
+        code, project = rng.choice(work_pairs)
+        end_hour = min(23, start_hour + rng.randint(1, 2))
+        minute = rng.choice(["00", "30"])
+        segments.append(f"{code}:{project}:{start_hour:02d}{minute}:{end_hour:02d}{minute}")
+        start_hour = end_hour + 1
+    return "EXT/" + ";".join(segments)
+
+
+def generate_rows(rows, ext_density=0.1, nd_ratio=0.02, unknown_ratio=0.0, rest_ratio=0.1,
+                  seed=None, mapping_file=DEFAULT_MAPPING):
+    """Generar filas (cuenta, proyecto, extras) con las proporciones indicadas"""
+    rng = random.Random(seed)
+    work_pairs, rest_codes = load_codes(mapping_file)
+
+    for _ in range(rows):
+        roll = rng.random()
+        if roll < nd_ratio:
+            # Días ND siempre llevan EXT
+            yield ["ND", "ND", random_ext(rng, work_pairs)]
+            continue
+        if roll < nd_ratio + unknown_ratio:
+            yield [f"ZZ{rng.randint(0, 99)}", "XX", ""]
+            continue
+        if rest_codes and roll < nd_ratio + unknown_ratio + rest_ratio:
+            yield [rng.choice(rest_codes), "", ""]
+            continue
+
+        code, project = rng.choice(work_pairs)
+        extras = random_ext(rng, work_pairs) if rng.random() < ext_density else ""
+        yield [code, project, extras]
+
+
+def write_csv(path, rows, with_ext_column=True, **options):
+    """Escribir un CSV sintético; retorna la ruta escrita"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if with_ext_column:
+            writer.writerow(["Cuenta", "Projecto", "Extras"])
+            writer.writerows(generate_rows(rows, **options))
+        else:
+            # Formato de dos columnas (el que acepta process_csv)
+            writer.writerow(["Cuenta", "Projecto"])
+            writer.writerows(row[:2] for row in generate_rows(rows, **options))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generar CSV sintéticos de cuentas por día")
+    parser.add_argument("output", help="Ruta del CSV a generar")
+    parser.add_argument("--rows", type=int, default=10000, help="Cantidad de filas (días)")
+    parser.add_argument("--ext-density", type=float, default=0.1, help="Proporción de filas con EXT")
+    parser.add_argument("--nd-ratio", type=float, default=0.02, help="Proporción de filas ND,ND")
+    parser.add_argument("--unknown-ratio", type=float, default=0.0, help="Proporción de códigos desconocidos")
+    parser.add_argument("--rest-ratio", type=float, default=0.1, help="Proporción de días de descanso")
+    parser.add_argument("--two-columns", action="store_true", help="Escribir solo Cuenta y Projecto")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    write_csv(
+        args.output,
+        args.rows,
+        with_ext_column=not args.two_columns,
+        ext_density=args.ext_density,
+        nd_ratio=args.nd_ratio,
+        unknown_ratio=args.unknown_ratio,
+        rest_ratio=args.rest_ratio,
+        seed=args.seed,
+    )
+    print(f"CSV generado: {args.output} ({args.rows} filas)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Automatizador de Replicon - Ejecución sin interfaz gráfica
+==========================================================
+
+Ejecuta la automatización desde la línea de comandos y escribe cada
+evento de progreso como una línea JSON en la salida estándar.
+
+Uso:
+    python cli.py --csv mes.csv [--email correo] [--password clave] [--show-browser]
+    python cli.py --csv mes.csv --dry-run [--plan-out plan.json]
+    python cli.py --from-plan plan.json
+    python cli.py --enqueue --csv mes.csv --email correo --password clave
+    python cli.py --run-queue [--max-browsers 3]
+    python cli.py --list-jobs
+
+Si no se indican credenciales se usan REPLICON_EMAIL / REPLICON_PASSWORD
+o las credenciales guardadas desde la aplicación.
+"""
+
+import argparse
+import os
+import sys
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(__file__))
+
+from config.config import Config
+from src.core.account_mapper import AccountMapper
+from src.core.punch_script import ENTRY_STRATEGIES
+
+
+def parse_args(argv=None):
+    """Leer argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Automatizador de Replicon sin interfaz gráfica")
+    parser.add_argument("--csv", help="Archivo CSV con las cuentas del mes")
+    parser.add_argument("--email", default=os.getenv("REPLICON_EMAIL"), help="Correo de Replicon")
+    parser.add_argument("--password", default=os.getenv("REPLICON_PASSWORD"), help="Contraseña de Replicon")
+    parser.add_argument("--show-browser", action="store_true", help="Mostrar el navegador (por defecto oculto)")
+    parser.add_argument("--min-interval", type=float, default=0.25,
+                        help="Segundos mínimos entre eventos de progreso")
+    parser.add_argument("--month", metavar="AAAA-MM",
+                        help="Mes del CSV para festivos y días del mes (por defecto el actual)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Enviar solo los días agregados o modificados desde la última ejecución")
+    parser.add_argument("--entry-strategy", choices=ENTRY_STRATEGIES,
+                        help="Cómo registrar las entradas (por defecto ENTRY_STRATEGY o webdriver)")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Guardar el perfil de tiempos (trace JSON y resumen) en DIR")
+    parser.add_argument("--record", metavar="ARCHIVO",
+                        help="Grabar los comandos de WebDriver y sus latencias en ARCHIVO (JSONL) "
+                             "para reproducirlos con benchmarks/bench_replay.py")
+    plan = parser.add_argument_group("plan de ejecución")
+    plan.add_argument("--dry-run", action="store_true",
+                      help="Compilar y mostrar el plan (días, entradas, duración estimada) sin abrir el navegador")
+    plan.add_argument("--plan-out", metavar="ARCHIVO", help="Guardar el plan de ejecución como JSON")
+    plan.add_argument("--from-plan", metavar="ARCHIVO", help="Registrar un plan JSON guardado en lugar del CSV")
+    jobs = parser.add_argument_group("cola de trabajos (varias cuentas)")
+    jobs.add_argument("--enqueue", action="store_true", help="Agregar el CSV a la cola en lugar de ejecutarlo")
+    jobs.add_argument("--run-queue", action="store_true", help="Ejecutar la cola hasta vaciarla")
+    jobs.add_argument("--list-jobs", action="store_true", help="Mostrar el estado de los trabajos")
+    jobs.add_argument("--max-browsers", type=int, default=Config.JOBS_MAX_BROWSERS,
+                      help="Navegadores simultáneos al ejecutar la cola")
+    args = parser.parse_args(argv)
+    if not (args.csv or args.from_plan or args.run_queue or args.list_jobs):
+        parser.error("se requiere --csv (salvo con --from-plan, --run-queue o --list-jobs)")
+    return args
+
+
+def emit_event(event):
+    """Escribir un evento de progreso como línea JSON"""
+    print(event.to_json(), flush=True)
+
+
+def resolve_credentials(args):
+    """Credenciales de los argumentos, del entorno o las guardadas desde la aplicación"""
+    email, password = args.email, args.password
+    if not email or not password:
+        email, password = Config.load_credentials()
+    if not email or not password:
+        print("No se indicaron credenciales (use --email/--password o REPLICON_EMAIL/REPLICON_PASSWORD)",
+              file=sys.stderr)
+    return email, password
+
+
+def open_queue():
+    from src.core.job_queue import JobQueue
+    return JobQueue(Config.JOBS_DB)
+
+
+def enqueue(args):
+    """Agregar un trabajo a la cola compartida"""
+    email, password = resolve_credentials(args)
+    if not email or not password:
+        return 2
+    queue = open_queue()
+    job_id = queue.enqueue(email, password, args.csv, month=args.month, incremental=args.incremental,
+                           max_attempts=Config.JOBS_MAX_ATTEMPTS)
+    print(f"Trabajo {job_id} en cola ({email}, {args.csv})")
+    return 0
+
+
+def list_jobs(args):
+    """Mostrar el estado de los trabajos de la cola"""
+    jobs = open_queue().list_jobs()
+    print(f"{'Id':>4}  {'Estado':<13} {'Int.':>4}  {'Cuenta':<30} {'CSV':<30} Progreso / error")
+    for job in jobs:
+        detail = job.last_error if job.status != "done" and job.last_error else job.progress
+        print(f"{job.id:>4}  {job.status_label:<13} {job.attempts:>4}  {job.email:<30} "
+              f"{os.path.basename(job.csv_file):<30} {detail.splitlines()[0] if detail else ''}")
+    return 0
+
+
+def run_queue(args):
+    """Ejecutar los trabajos de la cola hasta vaciarla, con eventos JSON por trabajo"""
+    import json
+    from src.core.job_scheduler import JobScheduler
+
+    def emit_job_event(job_id, event):
+        data = event.to_dict()
+        data["job_id"] = job_id
+        print(json.dumps(data, ensure_ascii=False), flush=True)
+
+    queue = open_queue()
+    scheduler = JobScheduler(
+        queue,
+        Config.load_horarios(),
+        AccountMapper().get_mapping(),
+        max_browsers=args.max_browsers,
+        account_interval=Config.JOBS_ACCOUNT_INTERVAL,
+        retry_backoff=Config.JOBS_RETRY_BACKOFF,
+        headless=not args.show_browser,
+        on_event=emit_job_event
+    )
+    scheduler.start(until_empty=True)
+    try:
+        scheduler.wait()
+    except KeyboardInterrupt:
+        # Los trabajos interrumpidos se reanudan en la próxima ejecución
+        scheduler.stop()
+        scheduler.wait()
+        return 130
+    return 1 if queue.counts().get("failed") else 0
+
+
+def run(args):
+    """Ejecutar la automatización con los argumentos indicados"""
+    from src.core.automation_runner import AutomationRunner
+    from src.core.execution_plan import ExecutionPlan
+
+    # La simulación no abre el navegador: no necesita contraseña, pero el correo
+    # elige el manifiesto de la cuenta (igual que en la ejecución real)
+    if args.dry_run:
+        email, password = args.email or Config.load_credentials()[0], None
+    else:
+        email, password = resolve_credentials(args)
+        if not email or not password:
+            return 2
+    plan = ExecutionPlan.load(args.from_plan) if args.from_plan else None
+
+    runner = AutomationRunner(
+        email,
+        password,
+        args.csv or (plan.csv_file if plan else None),
+        Config.load_horarios(),
+        AccountMapper().get_mapping(),
+        headless=not args.show_browser,
+        on_event=emit_event,
+        min_interval=args.min_interval,
+        profile_dir=args.profile,
+        month=args.month,
+        incremental=args.incremental,
+        entry_strategy=args.entry_strategy or (plan.strategy if plan else None),
+        dry_run=args.dry_run,
+        plan=plan,
+        record_file=args.record
+    )
+
+    try:
+        runner.run()
+        return 0
+    except Exception:
+        # El error ya se emitió como evento de progreso
+        return 1
+    finally:
+        if args.plan_out and runner.execution_plan:
+            runner.execution_plan.save(args.plan_out)
+            print(f"Plan guardado en: {args.plan_out}", file=sys.stderr)
+        if runner.profile_paths:
+            from src.core.profiler import profiler
+            print(profiler.format_summary(), file=sys.stderr)
+            print(f"Perfil guardado en: {runner.profile_paths[0]}", file=sys.stderr)
+
+
+def main(argv=None):
+    """Función principal de la ejecución sin interfaz"""
+    args = parse_args(argv)
+    if args.list_jobs:
+        return list_jobs(args)
+    if args.enqueue:
+        return enqueue(args)
+    if args.run_queue:
+        return run_queue(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,11 +14,81 @@ class Config:
     WEBDRIVER_TIMEOUT = int(os.getenv('WEBDRIVER_TIMEOUT', 45))  # Aumentado de 30 a 45 segundos
     SCROLL_BEHAVIOR = os.getenv('SCROLL_BEHAVIOR', 'smooth')
     
+    # Registro de entradas: webdriver (un comando por acción), js (un script por entrada) o js_day (uno por día)
+    ENTRY_STRATEGY = os.getenv('ENTRY_STRATEGY', 'webdriver')
+    
+    # Confirmar cada punch con la respuesta del XHR de guardado (eventos de red de CDP).
+    # Desactivado por defecto: el patrón solo se verificó contra el mock (benchmarks/mock_replicon.py)
+    CDP_NETWORK = os.getenv('CDP_NETWORK', '0') == '1'
+    SAVE_XHR_PATTERN = os.getenv('SAVE_XHR_PATTERN', r'TimePunchService/.*Punch')
+    
+    # Bloqueo de analítica y recursos pesados por CDP: block, measure (solo medir el ahorro) u off.
+    # Desactivado por defecto: la lista no se verificó contra las páginas reales de Okta y Replicon
+    BLOCK_URLS_MODE = os.getenv('BLOCK_URLS_MODE', 'off')
+    BLOCKED_URLS_FILE = os.getenv('BLOCKED_URLS_FILE', os.path.join(os.path.dirname(__file__), 'urls_bloqueadas.json'))
+    
+    # Leer una vez por sesión el árbol proyecto → cuentas y validar las entradas antes de registrar.
+    # Desactivado por defecto: los selectores del árbol solo se verificaron contra el mock
+    OPTION_INDEX = os.getenv('OPTION_INDEX', '0') == '1'
+    
+    # Copiar días idénticos con las acciones de la hoja ({cell} es el índice li[...] del día).
+    # Desactivado por defecto: los XPath de copiar día y llenar semana no se confirmaron en Replicon
+    DAY_COPY = os.getenv('DAY_COPY', '0') == '1'
+    COPY_DAY_XPATH = os.getenv('COPY_DAY_XPATH', "//li[{cell}]//a[contains(@class,'copyPreviousDay')]")
+    FILL_WEEK_XPATH = os.getenv('FILL_WEEK_XPATH', "//li[{cell}]//a[contains(@class,'fillWeek')]")
+    
+    # Reintentos por paso al agregar una entrada (espera exponencial con jitter)
+    STEP_RETRY_ATTEMPTS = int(os.getenv('STEP_RETRY_ATTEMPTS', 3))
+    STEP_RETRY_BASE_DELAY = float(os.getenv('STEP_RETRY_BASE_DELAY', 0.5))
+    STEP_RETRY_MAX_DELAY = float(os.getenv('STEP_RETRY_MAX_DELAY', 4))
+    
     # Configuración de la aplicación
     APP_TITLE = os.getenv('APP_TITLE', 'ReplicionAutomator - Por Hector David Rubio Tabares')
     APP_WIDTH = int(os.getenv('APP_WIDTH', 1400))  # Ajuste: ventana un poco más ancha
     APP_HEIGHT = int(os.getenv('APP_HEIGHT', 1600))  # Altura aumentada de 1400 a 1600
     
+    # Cache de resultados de parseo del CSV (el cache en disco es opcional)
+    PARSE_CACHE_DISK = os.getenv('PARSE_CACHE_DISK', '0') == '1'
+    PARSE_CACHE_DIR = os.getenv('PARSE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.replicon_automator', 'cache'))
+    PARSE_CACHE_MIN_BYTES = int(os.getenv('PARSE_CACHE_MIN_BYTES', 5 * 1024 * 1024))  # Solo archivos de 5 MB o más
+    
+    # Log de actividad (buffer del widget y archivo rotativo)
+    LOG_DIR = os.getenv('LOG_DIR', os.path.join(os.path.expanduser('~'), '.replicon_automator', 'logs'))
+    LOG_MAX_LINES = int(os.getenv('LOG_MAX_LINES', 1000))
+    LOG_FLUSH_INTERVAL_MS = int(os.getenv('LOG_FLUSH_INTERVAL_MS', 200))
+    
+    # Perfilado de tiempos por etapa (desactivado por defecto)
+    PROFILE_ENABLED = os.getenv('REPLICON_PROFILE', '0') == '1'
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.expanduser('~'), '.replicon_automator', 'profiles'))
+    
+    # Medición del arranque: imprimir las marcas al primer pintado (y salir, para el benchmark)
+    STARTUP_TIMING = os.getenv('REPLICON_STARTUP_TIMING', '0') == '1'
+    STARTUP_EXIT = os.getenv('REPLICON_STARTUP_EXIT', '0') == '1'
+    
+    # Vigilancia de memoria del navegador: se mide el RSS (chromedriver + Chrome) y el heap de
+    # JavaScript al terminar cada día. Con WATCHDOG_RECYCLE=1 se recicla Chrome en un límite de
+    # día al superar los límites, o cada N días (0 = solo por memoria). El reciclaje está
+    # desactivado por defecto: la restauración por cookies y el nuevo login no se verificaron
+    # contra el sitio real
+    WATCHDOG = os.getenv('WATCHDOG', '1') == '1'
+    WATCHDOG_RECYCLE = os.getenv('WATCHDOG_RECYCLE', '0') == '1'
+    WATCHDOG_RSS_MB = int(os.getenv('WATCHDOG_RSS_MB', 1500))
+    WATCHDOG_HEAP_MB = int(os.getenv('WATCHDOG_HEAP_MB', 512))
+    RECYCLE_EVERY_DAYS = int(os.getenv('RECYCLE_EVERY_DAYS', 0))
+    
+    # Grabar los comandos de WebDriver en este archivo JSONL (vacío = no grabar)
+    RECORD_COMMANDS = os.getenv('RECORD_COMMANDS', '')
+    
+    # Tiempos de las últimas ejecuciones, para estimar la duración del plan
+    RUN_HISTORY_FILE = os.getenv('RUN_HISTORY_FILE', os.path.join(os.path.expanduser('~'), '.replicon_automator', 'run_history.json'))
+    
+    # Cola de trabajos para varias cuentas (SQLite)
+    JOBS_DB = os.getenv('JOBS_DB', os.path.join(os.path.expanduser('~'), '.replicon_automator', 'jobs.sqlite3'))
+    JOBS_MAX_BROWSERS = int(os.getenv('JOBS_MAX_BROWSERS', 2))  # Navegadores simultáneos
+    JOBS_ACCOUNT_INTERVAL = float(os.getenv('JOBS_ACCOUNT_INTERVAL', 60))  # Segundos entre inicios de una cuenta
+    JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+    JOBS_RETRY_BACKOFF = float(os.getenv('JOBS_RETRY_BACKOFF', 60))  # Espera base antes de reintentar
+    
     # Configuración de credenciales
     APP_NAME = "ReplicionAutomator"
     
@@ -10,6 +10,15 @@ Autor: Hector David Rubio Tabares
 Fecha: 2025
 """
 
+import time
+PROCESS_START = time.perf_counter()  # Antes de cualquier import pesado, para medir el arranque
+
+import multiprocessing
+if __name__ == "__main__":
+    # En el ejecutable de PyInstaller los procesos del lector mmap relanzan este
+    # archivo: freeze_support los atiende antes de abrir otra ventana
+    multiprocessing.freeze_support()
+
 import sys
 import os
 from PyQt6.QtWidgets import QApplication
@@ -19,7 +28,10 @@ from PyQt6.QtGui import QIcon
 # Agregar el directorio actual al path
 sys.path.append(os.path.dirname(__file__))
 
+from src.core.startup_timing import startup_timer
+startup_timer.start(PROCESS_START)
 from src.ui.main_window import MainWindow
+startup_timer.mark("imports")
 
 def main():
     """Función principal de la aplicación"""
@@ -44,6 +56,7 @@ def main():
     try:
         # Crear y mostrar ventana principal
         window = MainWindow()
+        startup_timer.mark("ventana")
         window.show()
         
         # Ejecutar aplicación
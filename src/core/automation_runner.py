@@ -0,0 +1,253 @@
+from datetime import datetime
+
+from config.config import Config
+from src.core.command_recorder import MARK_ENTRIES
+from src.core.csv_processor import CSVProcessor
+from src.core.day_intervals import find_overlaps
+from src.core.execution_plan import RunHistory, build_execution_plan
+from src.core.profiler import profiler
+from src.core.progress import (ProgressTracker, STAGE_CSV, STAGE_BROWSER, STAGE_LOGIN,
+                               STAGE_MONTH, STAGE_ENTRIES)
+from src.core.selenium_handler import SeleniumHandler, NON_WORK_PROJECTS
+from src.core.work_calendar import parse_month, work_calendar
+
+
+class AutomationRunner:
+    """Ejecuta la automatización completa y reporta el avance como eventos de progreso
+
+    Lo usan tanto el worker de la interfaz gráfica como el ejecutor de línea de comandos.
+    """
+
+    def __init__(self, email, password, csv_file, horarios, mapeo_cuentas,
+                 headless=False, on_event=None, min_interval=0.25, profile_dir=None, month=None,
+                 incremental=False, entry_strategy=None, dry_run=False, plan=None, record_file=None):
+        self.email = email
+        self.password = password
+        self.csv_file = csv_file
+        self.horarios = horarios
+        self.mapeo_cuentas = mapeo_cuentas
+        self.headless = headless
+        self.selenium_handler = None  # Referencia al handler para poder cerrarlo
+        self.profile_dir = profile_dir  # Si se indica, se guarda el perfil de tiempos de la ejecución
+        self.profile_paths = None
+        self.tracker = ProgressTracker(on_event, min_interval=min_interval)
+        # Mes del CSV como "AAAA-MM" o (año, mes); por defecto el actual
+        if isinstance(month, str):
+            month = parse_month(month)
+        self.month_calendar = work_calendar.month(*month) if month else work_calendar.month()
+        # Solo enviar los días agregados o modificados desde la última ejecución
+        self.incremental = incremental
+        self.change_set = None
+        self.entry_strategy = entry_strategy  # None: la de la configuración (ENTRY_STRATEGY)
+        self.entries_commands = 0  # Comandos de WebDriver enviados en la etapa de entradas
+        self.record_file = record_file  # JSONL con los comandos de WebDriver (None: RECORD_COMMANDS)
+        self.plan = None  # DayPlan con los días escritos, copiados y saltados
+        # Plan de ejecución: se compila antes de abrir el navegador; si se recibe uno, se registra ese
+        self.execution_plan = plan
+        self.dry_run = dry_run  # Solo compilar y reportar el plan, sin abrir el navegador
+        if plan is not None:
+            self.month_calendar = work_calendar.month(*parse_month(plan.month))
+        self.history = RunHistory(Config.RUN_HISTORY_FILE)
+
+    def run(self):
+        """Ejecutar todas las etapas; lanza excepción si alguna falla"""
+        if self.profile_dir:
+            profiler.enable()
+        try:
+            with profiler.span("runner.run"):
+                self._run_stages()
+        finally:
+            if self.profile_dir:
+                profiler.disable()
+                self.profile_paths = profiler.export(self.profile_dir)
+
+    def _run_stages(self):
+        """Ejecutar cada etapa registrando su duración"""
+        tracker = self.tracker
+        try:
+            # Procesar CSV (o tomar las entradas del plan recibido)
+            tracker.start_stage(STAGE_CSV, "Procesando archivo CSV...")
+            csv_processor = None
+            with profiler.span("runner.csv"):
+                if self.execution_plan is not None:
+                    time_entries = self.execution_plan.time_entries()
+                    only_days = self.execution_plan.only_days()
+                    tracker.update(f"Plan recibido con {len(only_days)} días a registrar", force=True)
+                else:
+                    csv_processor = CSVProcessor()
+                    csv_processor.set_csv_file(self.csv_file)
+                    if self.incremental:
+                        self.change_set, time_entries = csv_processor.load_changed_entries(
+                            self.horarios, self.mapeo_cuentas, account=self.email
+                        )
+                        tracker.update(self.change_set.describe(), force=True)
+                    else:
+                        time_entries = csv_processor.load_time_entries(self.horarios, self.mapeo_cuentas)
+                        self.change_set = csv_processor.diff_against_manifest(
+                            self.horarios, self.mapeo_cuentas, account=self.email
+                        )
+                    only_days = set(self.change_set.changed_days) if self.incremental else None
+                self.check_overlaps(time_entries, tracker)
+                if self.execution_plan is None:
+                    self.execution_plan = self.build_plan(time_entries, only_days)
+            tracker.set_totals(len(time_entries), self.count_work_entries(time_entries, only_days))
+            for line in (self.execution_plan.describe() if self.dry_run else [self.execution_plan.summary()]):
+                tracker.update(line, force=True)
+
+            if self.dry_run:
+                tracker.finish("Simulación terminada: no se abrió el navegador")
+                return
+            if only_days is not None and not only_days:
+                tracker.finish("Sin días modificados desde la última ejecución")
+                return
+            self.check_current_month(self.month_calendar)
+
+            # Configurar navegador (en segundo plano si se especifica)
+            tracker.start_stage(STAGE_BROWSER, "Iniciando navegador...")
+            with profiler.span("runner.browser"):
+                self.selenium_handler = SeleniumHandler(entry_strategy=self.entry_strategy,
+                                                        record_file=self.record_file)
+                self.selenium_handler.setup_driver(headless=self.headless)
+
+            # Login
+            tracker.start_stage(STAGE_LOGIN, "Iniciando sesión...")
+            with profiler.span("runner.login"):
+                self.selenium_handler.login(self.email, self.password)
+
+            # Seleccionar mes
+            tracker.start_stage(STAGE_MONTH, "Seleccionando mes...")
+            with profiler.span("runner.month"):
+                self.selenium_handler.select_month()
+
+            # Si al reciclar el navegador no se puede restaurar la sesión, se repiten login y mes
+            self.selenium_handler.relogin = self.relogin
+
+            if self.selenium_handler.recorder:
+                self.selenium_handler.recorder.mark(MARK_ENTRIES)
+
+            # Plan de registro: días idénticos copiados con las acciones de la hoja
+            self.plan = self.selenium_handler.plan_days(time_entries, self.month_calendar, only_days)
+            tracker.update(self.plan.summary(), force=True)
+
+            # Procesar entradas día por día
+            tracker.start_stage(STAGE_ENTRIES, "Registrando entradas...")
+            done_days = []
+            commands_before = self.selenium_handler.command_count
+            with profiler.span("runner.entries"):
+                try:
+                    self.selenium_handler.batch_entries_same_day(
+                        time_entries, progress=tracker, month_calendar=self.month_calendar,
+                        only_days=only_days, on_day_done=done_days.append, plan=self.plan
+                    )
+                finally:
+                    self.entries_commands = self.selenium_handler.command_count - commands_before
+                    # Registrar lo enviado aunque falle a mitad, para reanudar desde ahí
+                    if done_days and csv_processor:
+                        csv_processor.record_submitted_days(self.change_set, done_days, account=self.email)
+                    retries = self.selenium_handler.retry_stats.summary()
+                    if retries:
+                        tracker.update(f"Reintentos por paso: {retries}", force=True)
+                    lookups = self.selenium_handler.page_cache.summary()
+                    if lookups:
+                        tracker.update(f"Caché de elementos: {lookups}", force=True)
+                    if self.selenium_handler.watchdog:
+                        memory = self.selenium_handler.watchdog.summary()
+                        if memory:
+                            tracker.update(f"Memoria del navegador: {memory}", force=True)
+
+            traffic = self.selenium_handler.traffic_summary()
+            if traffic:
+                tracker.update(traffic, force=True)
+
+            tracker.finish("Proceso completado exitosamente")
+            self.record_history()
+        except Exception as e:
+            tracker.fail(f"Error en el proceso: {str(e)}")
+            raise
+        finally:
+            # Asegurar que se cierre el navegador
+            self.close_browser()
+
+    def relogin(self):
+        """Iniciar sesión y abrir la hoja del mes en el navegador actual"""
+        with profiler.span("runner.relogin"):
+            self.selenium_handler.login(self.email, self.password)
+            self.selenium_handler.select_month()
+
+    def build_plan(self, time_entries, only_days=None):
+        """Compilar el plan de ejecución sin abrir el navegador"""
+        return build_execution_plan(
+            time_entries, self.month_calendar, self.entry_strategy or Config.ENTRY_STRATEGY, NON_WORK_PROJECTS,
+            only_days=only_days, actions=self.history.last_actions() if Config.DAY_COPY else frozenset(),
+            history=self.history, csv_file=self.csv_file, incremental=self.incremental
+        )
+
+    def record_history(self):
+        """Guardar los tiempos de esta ejecución para estimar las siguientes"""
+        timings = self.tracker.stage_timings
+        try:
+            self.history.record({
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "strategy": self.selenium_handler.entry_strategy,
+                "typed_entries": self.plan.typed_entries if self.plan else 0,
+                "copied_entries": self.plan.saved_entries if self.plan else 0,
+                "entries_seconds": timings.get(STAGE_ENTRIES, 0.0),
+                "setup_seconds": sum(timings.get(stage, 0.0) for stage in (STAGE_BROWSER, STAGE_LOGIN, STAGE_MONTH)),
+                "commands": self.entries_commands,
+                "actions": sorted(self.plan.actions) if self.plan else [],
+            })
+        except OSError:
+            pass  # El historial solo mejora la estimación
+
+    def close_browser(self):
+        """Cerrar navegador si está abierto"""
+        if self.selenium_handler:
+            try:
+                self.selenium_handler.close_driver()
+            except Exception:
+                pass
+            if self.selenium_handler.recorder:
+                self.selenium_handler.recorder.close()
+
+    @staticmethod
+    def check_overlaps(time_entries, tracker=None, max_reported=10):
+        """Advertir antes de abrir el navegador las entradas superpuestas; retorna cuántas hay
+
+        Igual que ext_superpone_horario en la validación del CSV es una
+        advertencia: Replicon puede rechazar esos punches, pero no se cancela la
+        ejecución.
+        """
+        overlaps = find_overlaps(time_entries, NON_WORK_PROJECTS)
+        if overlaps and tracker:
+            messages = [overlap["message"] for overlap in overlaps[:max_reported]]
+            if len(overlaps) > max_reported:
+                messages.append(f"... y {len(overlaps) - max_reported} superposiciones más")
+            tracker.update("Entradas superpuestas en el CSV (Replicon puede rechazarlas):\n" + "\n".join(messages),
+                           force=True, level="warning")
+        return len(overlaps)
+
+    @staticmethod
+    def check_current_month(month_calendar, today=None):
+        """Fallar antes de abrir el navegador si el mes no es el actual
+
+        select_month abre la hoja actual de Replicon; con otro mes los festivos y
+        las celdas de los días no corresponderían a la hoja abierta.
+        """
+        today = today or datetime.now()
+        if (month_calendar.year, month_calendar.month) != (today.year, today.month):
+            raise ValueError(
+                f"Solo se puede registrar el mes actual ({today.year:04d}-{today.month:02d}); "
+                f"el CSV es de {month_calendar.year:04d}-{month_calendar.month:02d}. "
+                "Use la simulación para revisar otros meses"
+            )
+
+    @staticmethod
+    def count_work_entries(time_entries, only_days=None):
+        """Contar las entradas que se registrarán en Replicon"""
+        return sum(
+            1
+            for day_number, daily_entries in enumerate(time_entries, 1)
+            if only_days is None or day_number in only_days
+            for entry in daily_entries
+            if entry["project"] not in NON_WORK_PROJECTS
+        )
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorCode, ExceptionMapping
+from selenium.webdriver.remote.webelement import WebElement
+
+RECORDING_VERSION = 1
+
+# Marca que separa el inicio de sesión de la etapa de entradas en la grabación
+MARK_ENTRIES = "entries"
+
+# Un elemento de la grabación (los id reales no sirven fuera de esa sesión)
+ELEMENT_PLACEHOLDER = {"__element__": True}
+
+MAX_STRING = 500  # Textos más largos se recortan al grabar
+
+FIND_COMMANDS = (Command.FIND_ELEMENT, Command.FIND_ELEMENTS)
+FIND_CHILD_COMMANDS = (Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS)
+SCRIPT_COMMANDS = (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC)
+CDP_COMMAND = "executeCdpCommand"
+
+
+def error_code(exception):
+    """Código de error W3C ("no such element", "timeout", ...) de una excepción de WebDriver"""
+    for name in dir(ErrorCode):
+        codes = getattr(ErrorCode, name)
+        if (isinstance(codes, list) and len(codes) > 1
+                and getattr(ExceptionMapping, name, None) is type(exception)):
+            return codes[1]
+    return "unknown error"
+
+
+def script_hash(script):
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()[:12]
+
+
+def command_key(command, params, origins):
+    """Clave con la que se reconoce un comando al reproducirlo
+
+    Las búsquedas se identifican por su localizador, los scripts por su hash y
+    los comandos sobre un elemento por la búsqueda que lo encontró (origins:
+    id del elemento -> clave de esa búsqueda). Nunca incluye el texto enviado.
+    """
+    params = params or {}
+    if command in FIND_COMMANDS:
+        return f"{command} {params.get('using')}={params.get('value')}"
+    if command in FIND_CHILD_COMMANDS:
+        parent = origins.get(params.get("id"), "?")
+        return f"{command} {params.get('using')}={params.get('value')} <- {parent}"
+    if command in SCRIPT_COMMANDS:
+        return f"{command} {script_hash(params.get('script', ''))}"
+    if command == CDP_COMMAND:
+        return f"{command} {params.get('cmd')}"
+    if "id" in params:
+        return f"{command} @ {origins.get(params['id'], '?')}"
+    return command
+
+
+def encode_value(value):
+    """Forma del resultado apta para JSON: elementos como marcadores y textos recortados"""
+    if isinstance(value, WebElement):
+        return ELEMENT_PLACEHOLDER
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, str):
+        return value[:MAX_STRING]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return repr(value)[:MAX_STRING]
+
+
+def _redact(key, value):
+    """Quitar los valores de las cookies de sesión antes de escribirlos al disco"""
+    if key == f"{CDP_COMMAND} Network.getAllCookies" and isinstance(value, dict):
+        return {"cookies": [dict(cookie, value="") for cookie in value.get("cookies", [])]}
+    return value
+
+
+def _elements(value):
+    """Elementos dentro de un resultado (find_elements retorna listas)"""
+    if isinstance(value, WebElement):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, WebElement)]
+    return []
+
+
+class CommandRecorder:
+    """Graba cada comando de WebDriver con su latencia y la forma de su resultado (JSONL)
+
+    La grabación sirve para reproducir la misma secuencia sin Replicon
+    (benchmarks/bench_replay.py). Se graban el comando, su clave y el resultado;
+    no los parámetros, así que las contraseñas y los textos tecleados no quedan
+    en el archivo.
+    """
+
+    def __init__(self, filepath, clock=time.perf_counter):
+        self.filepath = filepath
+        self.clock = clock
+        self.count = 0
+        self.origins = {}  # id de elemento -> clave de la búsqueda que lo encontró
+        self._file = open(filepath, "w", encoding="utf-8")
+        self._write({"version": RECORDING_VERSION, "started_at": time.time()})
+
+    def wrap(self, driver):
+        """Grabar los comandos del driver (se puede llamar con cada navegador nuevo)"""
+        execute = driver.execute
+
+        def recorded_execute(driver_command, params=None):
+            key = command_key(driver_command, params, self.origins)
+            start = self.clock()
+            try:
+                response = execute(driver_command, params)
+            except WebDriverException as e:
+                self.record(driver_command, key, self.clock() - start, error=error_code(e))
+                raise
+            value = response.get("value") if isinstance(response, dict) else None
+            for element in _elements(value):
+                self.origins[element.id] = key
+            self.record(driver_command, key, self.clock() - start, value=value)
+            return response
+
+        driver.execute = recorded_execute
+
+    def record(self, command, key, latency, value=None, error=None):
+        self.count += 1
+        line = {"seq": self.count, "command": command, "key": key, "latency": round(latency, 6)}
+        if error:
+            line["error"] = error
+        else:
+            line["value"] = _redact(key, encode_value(value))
+        self._write(line)
+
+    def mark(self, name):
+        """Marcar el inicio de una etapa (p. ej. MARK_ENTRIES) en la grabación"""
+        self._write({"mark": name, "seq": self.count})
+
+    def _write(self, line):
+        if self._file.closed:
+            return
+        self._file.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def load_recording(filepath, since=None):
+    """Comandos grabados (dicts) desde la última marca since; todos si la marca no está"""
+    commands = []
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if since is not None and record.get("mark") == since:
+                commands = []
+            elif "command" in record:
+                commands.append(record)
+    return commands
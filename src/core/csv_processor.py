@@ -1,15 +1,33 @@
 import csv
 import pandas as pd
-from datetime import datetime
 import re
 from concurrent.futures import ThreadPoolExecutor
 import multiprocessing
+import os
+
+from src.core.csv_validator import CSVValidator, SEVERITY_ERROR, SEVERITY_WARNING
+from src.core.day_intervals import DayIntervals, time_to_minutes
+from src.core.mmap_reader import DEFAULT_RANGE_BYTES, MmapCSVReader
+from src.core.parse_cache import parse_cache
+from src.core.profiler import profiled
+from src.core import row_manifest
+from src.core.work_calendar import work_calendar
+
+
+class ProcessingCancelled(Exception):
+    """Excepción lanzada cuando se cancela el procesamiento del CSV"""
+    pass
+
 
 class CSVProcessor:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.csv_filepath = None
+        self.cache = cache if cache is not None else parse_cache  # Cache compartido de resultados
         self.chunk_size = 1000  # Procesar en chunks de 1000 filas
         self.max_workers = min(4, multiprocessing.cpu_count())  # Máximo 4 threads
+        self.max_reported_issues = 50  # Máximo de errores a mostrar en el mensaje de validación
+        self.mmap_min_bytes = 256 * 1024 * 1024  # Archivos desde 256 MB usan el lector mmap por rangos
+        self.mmap_range_bytes = DEFAULT_RANGE_BYTES
     
     def military_to_standard_time(self, military_time):
         """Convertir hora militar (1600) a formato estándar (4:00pm)"""
@@ -28,6 +46,7 @@ class CSVProcessor:
         except:
             return military_time  # Retornar original si hay error
     
+    @profiled("csv.parse_ext_entries")
     def parse_ext_entries(self, ext_string, mapeo_cuentas):
         """Parsear entradas EXT del formato: PROD:PI:1600:1800;PROD:PI:1600:1800"""
         entries = []
@@ -74,6 +93,7 @@ class CSVProcessor:
         """Establecer archivo CSV a procesar"""
         self.csv_filepath = filepath
     
+    @profiled("csv.process_csv")
     def process_csv(self, horarios, mapeo_cuentas):
         """Procesar CSV y generar entradas de tiempo"""
         if not self.csv_filepath:
@@ -112,7 +132,80 @@ class CSVProcessor:
         except Exception as e:
             raise Exception(f"Error al procesar CSV: {e}")
     
-    def process_csv_with_pandas(self, horarios, mapeo_cuentas, progress_callback=None):
+    @profiled("csv.load_time_entries")
+    def load_time_entries(self, horarios, mapeo_cuentas, progress_callback=None, should_cancel=None):
+        """Obtener entradas de tiempo desde el cache o procesando el CSV con pandas"""
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        key = self.cache.make_key('time_entries', self.csv_filepath, mapeo_cuentas, horarios)
+        found, time_entries = self.cache.get(key)
+        if found:
+            if progress_callback:
+                progress_callback(f"Usando resultado en cache: {len(time_entries)} días procesados")
+            return time_entries
+        
+        if os.path.getsize(self.csv_filepath) >= self.mmap_min_bytes:
+            time_entries = self.process_csv_mmap(horarios, mapeo_cuentas, progress_callback, should_cancel)
+        else:
+            time_entries = self.process_csv_with_pandas(horarios, mapeo_cuentas, progress_callback, should_cancel)
+        self.cache.put(key, time_entries)
+        return time_entries
+    
+    @profiled("csv.diff_against_manifest")
+    def diff_against_manifest(self, horarios, mapeo_cuentas, account=None):
+        """Comparar cada fila (día) con el manifiesto de la última ejecución enviada (a esa cuenta)"""
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        row_hashes = [row_manifest.row_hash(fields) for fields in row_manifest.read_rows(self.csv_filepath)]
+        config = row_manifest.config_version(mapeo_cuentas, horarios)
+        return row_manifest.diff_rows(row_hashes, row_manifest.load_manifest(self.csv_filepath, account), config)
+    
+    @profiled("csv.load_changed_entries")
+    def load_changed_entries(self, horarios, mapeo_cuentas, account=None):
+        """Parsear solo los días agregados o modificados; los demás quedan como listas vacías
+        
+        Retorna (change_set, time_entries) con una posición por fila del CSV.
+        account separa el manifiesto de cada cuenta que envía el mismo CSV.
+        """
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        rows = row_manifest.read_rows(self.csv_filepath)
+        config = row_manifest.config_version(mapeo_cuentas, horarios)
+        change_set = row_manifest.diff_rows(
+            [row_manifest.row_hash(fields) for fields in rows], row_manifest.load_manifest(self.csv_filepath, account),
+            config
+        )
+        
+        time_entries = [[] for _ in rows]
+        for day in change_set.changed_days:
+            fields = rows[day - 1]
+            cuenta = fields[0]
+            proyecto = fields[1] if len(fields) > 1 else ""
+            ext_data = fields[2] if len(fields) > 2 and fields[2] else None
+            time_entries[day - 1] = self.build_daily_entries(cuenta, proyecto, ext_data, horarios, mapeo_cuentas)
+        return change_set, time_entries
+    
+    def record_submitted_days(self, change_set, days, account=None):
+        """Guardar en el manifiesto (de la cuenta) los días (1..N) ya enviados con los hashes del change_set"""
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        day_hashes = {}
+        previous = row_manifest.load_manifest(self.csv_filepath, account)
+        if previous is not None and previous.get("config") == change_set.config:
+            day_hashes = {int(day): value for day, value in previous.get("days", {}).items()}
+        for day in days:
+            day_hashes[day] = change_set.row_hashes[day - 1]
+        # Los días que ya no existen en el CSV salen del manifiesto
+        total = len(change_set.row_hashes)
+        day_hashes = {day: value for day, value in day_hashes.items() if day <= total}
+        row_manifest.save_manifest(self.csv_filepath, day_hashes, change_set.config, account)
+    
+    @profiled("csv.process_csv_with_pandas")
+    def process_csv_with_pandas(self, horarios, mapeo_cuentas, progress_callback=None, should_cancel=None):
         """Procesar CSV usando pandas para mejor rendimiento con chunks y threading"""
         if not self.csv_filepath:
             raise ValueError("No se ha establecido un archivo CSV")
@@ -137,11 +230,13 @@ class CSVProcessor:
                 futures = []
                 
                 for chunk in chunk_reader:
+                    self._check_cancelled(should_cancel, futures)
                     future = executor.submit(self._process_chunk, chunk, horarios, mapeo_cuentas)
                     futures.append(future)
                 
                 # Recopilar resultados
                 for future in futures:
+                    self._check_cancelled(should_cancel, futures)
                     chunk_entries = future.result()
                     all_time_entries.extend(chunk_entries)
                     processed_chunks += 1
@@ -155,9 +250,48 @@ class CSVProcessor:
             
             return all_time_entries
             
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Error al procesar CSV con pandas: {e}")
     
+    @profiled("csv.process_csv_mmap")
+    def process_csv_mmap(self, horarios, mapeo_cuentas, progress_callback=None, should_cancel=None, processes=True):
+        """Procesar CSV muy grandes con mmap: rangos de bytes alineados a líneas parseados en procesos"""
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        reader = MmapCSVReader(self.csv_filepath, range_bytes=self.mmap_range_bytes, max_workers=self.max_workers)
+        total_ranges = len(reader.ranges())
+        if progress_callback:
+            size_mb = os.path.getsize(self.csv_filepath) / (1024 * 1024)
+            progress_callback(f"Procesando {size_mb:.1f} MB en {total_ranges} rangos...")
+        
+        all_time_entries = []
+        try:
+            for processed, range_entries in enumerate(reader.iter_range_entries(horarios, mapeo_cuentas, processes), 1):
+                self._check_cancelled(should_cancel, [])
+                all_time_entries.extend(range_entries)
+                if progress_callback:
+                    progress = (processed / total_ranges) * 100
+                    progress_callback(f"Procesando rangos: {processed}/{total_ranges} ({progress:.1f}%)")
+        except ProcessingCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error al procesar CSV con mmap: {e}")
+        
+        if progress_callback:
+            progress_callback(f"Procesamiento completado: {len(all_time_entries)} días procesados")
+        return all_time_entries
+    
+    def _check_cancelled(self, should_cancel, futures):
+        """Cancelar chunks pendientes si se solicitó la cancelación"""
+        if should_cancel and should_cancel():
+            for future in futures:
+                future.cancel()
+            raise ProcessingCancelled("Procesamiento cancelado por el usuario")
+    
+    @profiled("csv.process_chunk")
     def _process_chunk(self, chunk, horarios, mapeo_cuentas):
         """Procesar un chunk del CSV"""
         # Limpiar datos
@@ -167,75 +301,85 @@ class CSVProcessor:
         chunk_entries = []
         
         for _, row in chunk.iterrows():
-            cuenta = row['Cuenta']
-            proyecto = row['Projecto']
-            
             # Verificar si hay columna EXT
             ext_data = None
             if len(row) > 2 and pd.notna(row.iloc[2]):
                 ext_data = str(row.iloc[2]).strip()
             
-            daily_entries = []
+            chunk_entries.append(
+                self.build_daily_entries(row['Cuenta'], row['Projecto'], ext_data, horarios, mapeo_cuentas)
+            )
+        
+        return chunk_entries
+    
+    def build_daily_entries(self, cuenta, proyecto, ext_data, horarios, mapeo_cuentas):
+        """Construir las entradas de un día a partir de una fila ya limpia (Cuenta, Projecto, Extras)"""
+        daily_entries = []
+        
+        # Si cuenta y proyecto son "ND", solo procesar entradas EXT
+        if cuenta.upper() == 'ND' and proyecto.upper() == 'ND':
+            # No crear entradas normales, solo procesar EXT
+            if ext_data and ext_data.startswith('EXT/'):
+                ext_entries = self.parse_ext_entries(ext_data, mapeo_cuentas)
+                daily_entries.extend(ext_entries)
+        else:
+            # Procesar entradas normales (usando cache para mapeo)
+            company = mapeo_cuentas.get(cuenta, {})
+            project_name = company.get("name", "Desconocido")
             
-            # Si cuenta y proyecto son "ND", solo procesar entradas EXT
-            if cuenta.upper() == 'ND' and proyecto.upper() == 'ND':
-                # No crear entradas normales, solo procesar EXT
+            # Si es día de descanso, no crear entradas
+            if project_name in ["Vacation", "No work","Desconocido"]:
+                daily_entries = []
+            else:
+                account_name = company.get("projects", {}).get(proyecto, "Desconocido")
+                
+                # Crear entradas diarias normales
+                daily_entries = [
+                    {**h, "project": project_name, "account": account_name} 
+                    for h in horarios
+                ]
+                
+                # Agregar entradas EXT si existen
                 if ext_data and ext_data.startswith('EXT/'):
                     ext_entries = self.parse_ext_entries(ext_data, mapeo_cuentas)
                     daily_entries.extend(ext_entries)
-            else:
-                # Procesar entradas normales (usando cache para mapeo)
-                company = mapeo_cuentas.get(cuenta, {})
-                project_name = company.get("name", "Desconocido")
-                
-                # Si es día de descanso, no crear entradas
-                if project_name in ["Vacation", "No work","Desconocido"]:
-                    daily_entries = []
-                else:
-                    account_name = company.get("projects", {}).get(proyecto, "Desconocido")
-                    
-                    # Crear entradas diarias normales
-                    daily_entries = [
-                        {**h, "project": project_name, "account": account_name} 
-                        for h in horarios
-                    ]
-                    
-                    # Agregar entradas EXT si existen
-                    if ext_data and ext_data.startswith('EXT/'):
-                        ext_entries = self.parse_ext_entries(ext_data, mapeo_cuentas)
-                        daily_entries.extend(ext_entries)
-            
-            chunk_entries.append(daily_entries)
         
-        return chunk_entries
+        return daily_entries
     
-    def calculate_hours_summary(self, time_entries):
-        """Calcular resumen de horas trabajadas incluyendo horas semanales y extras"""
-        from datetime import datetime, timedelta
-        import calendar
+    @profiled("csv.export_parquet")
+    def export_parquet(self, horarios, mapeo_cuentas, root_dir, employee, year=None, month=None):
+        """Escribir las entradas normalizadas del CSV en Parquet (partición empleado/mes); requiere pyarrow"""
+        from src.core.timesheet_store import TimesheetStore
         
+        month_calendar = work_calendar.month(year, month)
+        time_entries = self.load_time_entries(horarios, mapeo_cuentas)
+        store = TimesheetStore(root_dir)
+        return store.write_month(time_entries, employee, month_calendar.year, month_calendar.month)
+    
+    @profiled("csv.calculate_hours_summary")
+    def calculate_hours_summary(self, time_entries, year=None, month=None):
+        """Calcular resumen de horas trabajadas incluyendo horas semanales y extras
+        
+        year/month indican el mes del CSV (por defecto el actual).
+        """
         total_hours = 0
         total_work_days = 0  # Solo días con trabajo real
         hours_by_project = {}
         hours_by_week = {}
         hours_by_day = []
         
-        # Obtener fecha actual para cálculos
-        current_date = datetime.now()
-        month = current_date.month
-        year = current_date.year
-    
+        # Metadatos del mes precalculados (semana ISO, festivos)
+        month_calendar = work_calendar.month(year, month)
         
         for day_index, daily_entries in enumerate(time_entries):
-            daily_hours = 0
             daily_work_hours = 0  # Solo horas de trabajo, sin vacaciones
+            day_info = month_calendar.for_index(day_index)
             # Solo procesar días válidos del mes
-            if day_index + 1 <= calendar.monthrange(year, month)[1]:
-                day_date = datetime(year, month, day_index + 1)
-                
-                for entry in daily_entries:
-                    # Calcular horas para esta entrada
-                    hours = self._calculate_entry_hours(entry)
+            if day_info is not None:
+                # Minutos por entrada sin contar dos veces los tramos superpuestos
+                minutes = DayIntervals(daily_entries).exclusive_minutes()
+                for entry, entry_minutes in zip(daily_entries, minutes):
+                    hours = entry_minutes / 60
                     project = entry.get('project', 'Desconocido')
                     
                     # Agrupar por proyecto (todos los proyectos)
@@ -243,8 +387,6 @@ class CSVProcessor:
                         hours_by_project[project] = 0
                     hours_by_project[project] += hours
                     
-                    daily_hours += hours
-                    
                     # Solo contar como horas trabajadas si no es vacación o no trabajo
                     if project not in ['Vacation', 'No work', 'Holiday', 'Weekend', 'ND', 'Desconocido']:
                         daily_work_hours += hours
@@ -258,10 +400,7 @@ class CSVProcessor:
                 
                 # Calcular semana solo para días con trabajo real
                 if daily_work_hours > 0:
-                    week_number = day_date.isocalendar()[1]
-                    week_start = day_date - timedelta(days=day_date.weekday())
-                    week_end = week_start + timedelta(days=6)
-                    week_key = f"Semana {week_number} ({week_start.strftime('%d/%m')}-{week_end.strftime('%d/%m')})"
+                    week_key = day_info.week_label
                     
                     if week_key not in hours_by_week:
                         hours_by_week[week_key] = {'hours': 0, 'days': 0}
@@ -283,6 +422,7 @@ class CSVProcessor:
         regular_hours = total_hours - overtime_daily
         
         return {
+            'month': month_calendar.key,
             'total_hours': total_hours,
             'total_days': total_work_days,
             'average_hours_per_day': total_hours / total_work_days if total_work_days > 0 else 0,
@@ -298,58 +438,56 @@ class CSVProcessor:
     
     def _calculate_entry_hours(self, entry):
         """Calcular horas de una entrada específica"""
-        try:
-            start_time = entry.get('start_time', '')
-            end_time = entry.get('end_time', '')
-            
-            # Convertir formato de hora (ej: "7:00am" -> datetime)
-            fmt = "%I:%M%p"
-            start = datetime.strptime(start_time, fmt)
-            end = datetime.strptime(end_time, fmt)
-            
-            # Calcular diferencia en horas
-            diff = end - start
-            hours = diff.seconds / 3600
-            
-            return hours
-            
-        except Exception:
+        start = time_to_minutes(entry.get('start_time', ''))
+        end = time_to_minutes(entry.get('end_time', ''))
+        if start is None or end is None or end <= start:
             return 0  # Retornar 0 si hay error en el formato
+        return (end - start) / 60
     
-    def validate_csv_format(self):
-        """Validar que el archivo CSV tenga el formato correcto"""
+    @profiled("csv.validate_csv_format")
+    def validate_csv_format(self, mapeo_cuentas=None, days_in_month=None, horarios=None):
+        """Validar que el archivo CSV tenga el formato correcto (resultado en cache)
+        
+        Si se indica mapeo_cuentas también se validan cuentas y proyectos, y con
+        horarios que las entradas EXT no se superpongan con la jornada normal.
+        """
         if not self.csv_filepath:
             return False, "No se ha establecido un archivo CSV"
         
         try:
-            df = pd.read_csv(self.csv_filepath)
-            
-            # Verificar columnas mínimas requeridas
-            if len(df.columns) < 2:
-                return False, "El CSV debe tener al menos 2 columnas (Cuenta, Projecto)"
-            
-            # Renombrar columnas para consistencia
-            df.columns = ['Cuenta', 'Projecto'] + [f'Extra_{i}' for i in range(len(df.columns)-2)]
-            
-            # Verificar que no esté vacío
-            if df.empty:
-                return False, "El archivo CSV está vacío"
-            
-            # Validar formato de entradas EXT si existen
-            validation_errors = []
-            for index, row in df.iterrows():
-                if len(row) > 2 and pd.notna(row.iloc[2]):
-                    ext_data = str(row.iloc[2]).strip()
-                    if ext_data and not self._validate_ext_format(ext_data):
-                        validation_errors.append(f"Fila {index+2}: Formato EXT inválido: {ext_data}")
-            
-            if validation_errors:
-                return False, "\n".join(validation_errors)
-            
-            return True, "Formato válido (soporta entradas EXT)"
-            
+            key = self.cache.make_key(f'validation:{days_in_month}', self.csv_filepath, mapeo_cuentas, horarios)
+        except OSError as e:
+            return False, f"Error al validar CSV: {e}"
+        return self.cache.get_or_compute(key, lambda: self._validate_csv_format(mapeo_cuentas, days_in_month, horarios))
+    
+    def _validate_csv_format(self, mapeo_cuentas, days_in_month, horarios):
+        """Resumir la validación en (válido, mensaje) construyendo solo los errores a mostrar"""
+        validator = CSVValidator(mapeo_cuentas, days_in_month, max_issues=self.max_reported_issues, horarios=horarios)
+        try:
+            issues = validator.validate_file(self.csv_filepath)
         except Exception as e:
             return False, f"Error al validar CSV: {e}"
+        
+        errors = validator.counts[SEVERITY_ERROR]
+        warnings = validator.counts[SEVERITY_WARNING]
+        if errors:
+            messages = [issue["message"] for issue in issues if issue["severity"] == SEVERITY_ERROR]
+            if errors > len(messages):
+                messages.append(f"... y {errors - len(messages)} errores más")
+            return False, "\n".join(messages)
+        
+        if warnings:
+            return True, f"Formato válido (soporta entradas EXT) con {warnings} advertencias"
+        return True, "Formato válido (soporta entradas EXT)"
+    
+    def validate_csv(self, mapeo_cuentas=None, days_in_month=None, horarios=None):
+        """Validar el CSV completo y retornar la lista estructurada de problemas (en cache)"""
+        if not self.csv_filepath:
+            raise ValueError("No se ha establecido un archivo CSV")
+        
+        key = self.cache.make_key(f'issues:{days_in_month}', self.csv_filepath, mapeo_cuentas, horarios)
+        validator = CSVValidator(mapeo_cuentas, days_in_month, horarios=horarios)
+        return self.cache.get_or_compute(key, lambda: validator.validate_file(self.csv_filepath))
     
     def _validate_ext_format(self, ext_string):
         """Validar formato de entrada EXT"""
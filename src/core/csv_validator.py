@@ -0,0 +1,256 @@
+import calendar
+import re
+from datetime import datetime
+from itertools import islice, repeat
+
+import pandas as pd
+
+from src.core.day_intervals import time_to_minutes
+
+REST_PROJECT_NAMES = ["Vacation", "No work"]
+
+# Segmento EXT: CUENTA:PROYECTO:HHMM:HHMM (horas 0000-2359)
+_HHMM = r"\s*(?:[01]\d|2[0-3])[0-5]\d\s*"
+_EXT_SEGMENT = rf"\s*[^:;]+:[^:;]*:{_HHMM}:{_HHMM}(?::[^;]*)?"
+EXT_PATTERN = rf"EXT/{_EXT_SEGMENT}(?:;{_EXT_SEGMENT})*"
+# Captura de cada segmento de una entrada EXT ya validada
+EXT_SEGMENT_CAPTURE = (
+    r"(?:EXT/|;)\s*(?P<cuenta>[^:;]*?)\s*:\s*(?P<proyecto>[^:;]*?)\s*:"
+    r"\s*(?P<start_h>\d\d)(?P<start_m>\d\d)\s*:\s*(?P<end_h>\d\d)(?P<end_m>\d\d)"
+)
+_EXT_SEGMENT_RE = re.compile(EXT_SEGMENT_CAPTURE)
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+
+class CSVValidator:
+    """Valida el CSV completo en una sola pasada con operaciones vectorizadas de pandas
+
+    Cada problema se reporta como un diccionario con fila (numeración del archivo,
+    el encabezado es la fila 1), columna, código, severidad y mensaje. Con
+    max_issues solo se construyen los primeros problemas de cada severidad;
+    counts siempre tiene el total real por severidad.
+    """
+
+    def __init__(self, mapeo_cuentas=None, days_in_month=None, max_issues=None, horarios=None):
+        self.mapeo_cuentas = mapeo_cuentas
+        self.days_in_month = days_in_month
+        self.max_issues = max_issues
+        self.horarios = horarios
+        self.counts = {SEVERITY_ERROR: 0, SEVERITY_WARNING: 0}
+
+    @staticmethod
+    def current_month_days():
+        """Cantidad de días del mes actual"""
+        now = datetime.now()
+        return calendar.monthrange(now.year, now.month)[1]
+
+    def read_csv(self, filepath):
+        """Leer el CSV como categorías de texto (sin conversión de tipos ni NaN)"""
+        return pd.read_csv(filepath, dtype="category", keep_default_na=False)
+
+    def validate_file(self, filepath):
+        """Validar un archivo CSV; retorna la lista de problemas encontrados"""
+        self.counts = {SEVERITY_ERROR: 0, SEVERITY_WARNING: 0}
+        try:
+            df = self.read_csv(filepath)
+        except pd.errors.EmptyDataError:
+            return [self._issue(1, None, "archivo_vacio", "El archivo CSV está vacío")]
+        return self.validate_dataframe(df)
+
+    def validate_dataframe(self, df):
+        """Validar un DataFrame leído del CSV"""
+        self.counts = {SEVERITY_ERROR: 0, SEVERITY_WARNING: 0}
+        # Verificar columnas mínimas requeridas
+        if len(df.columns) < 2:
+            return [self._issue(1, None, "columnas_insuficientes",
+                                "El CSV debe tener al menos 2 columnas (Cuenta, Projecto)")]
+        if df.empty:
+            return [self._issue(1, None, "archivo_vacio", "El archivo CSV está vacío")]
+
+        cuenta = self._text_column(df, 0)
+        proyecto = self._text_column(df, 1)
+        if len(df.columns) > 2:
+            extras = self._text_column(df, 2)
+        else:
+            extras = pd.Series("", index=df.index)
+
+        issues = []
+        issues.extend(self._check_month_length(df.index))
+
+        has_ext = extras != ""
+        ext_valid = extras[has_ext].str.fullmatch(EXT_PATTERN)
+        invalid_ext = extras[has_ext][~ext_valid]
+        issues.extend(self._issues(
+            "Extras", "ext_invalido", invalid_ext.index,
+            "Fila {row}: Formato EXT inválido: {ext}", ext=invalid_ext
+        ))
+
+        is_nd = (cuenta.str.upper() == "ND") & (proyecto.str.upper() == "ND")
+        issues.extend(self._issues(
+            "Extras", "nd_sin_ext", df.index[is_nd & ~has_ext],
+            "Fila {row}: ND,ND sin entradas EXT (no se registrará nada)", SEVERITY_WARNING
+        ))
+
+        ext_segments = self._explode_ext(extras[ext_valid[ext_valid].index])
+        has_schedule = ~is_nd
+        if self.mapeo_cuentas is not None:
+            issues.extend(self._check_accounts(cuenta[~is_nd], proyecto[~is_nd], "Cuenta"))
+            issues.extend(self._check_accounts(ext_segments["cuenta"], ext_segments["proyecto"], "Extras"))
+            # Solo los días de trabajo con cuenta conocida reciben la jornada normal
+            work_codes = [
+                code for code, info in self.mapeo_cuentas.items() if info.get("name") not in REST_PROJECT_NAMES
+            ]
+            has_schedule &= cuenta.isin(work_codes)
+        issues.extend(self._check_intervals(ext_segments))
+        issues.extend(self._check_schedule_overlap(ext_segments, df.index[has_schedule]))
+
+        issues.sort(key=lambda issue: (issue["row"], issue["code"]))
+        if self.max_issues is not None:
+            issues = (
+                [issue for issue in issues if issue["severity"] == SEVERITY_ERROR][:self.max_issues]
+                + [issue for issue in issues if issue["severity"] == SEVERITY_WARNING][:self.max_issues]
+            )
+            issues.sort(key=lambda issue: (issue["row"], issue["code"]))
+        return issues
+
+    def _check_month_length(self, index):
+        """Filas que exceden los días del mes"""
+        days = self.days_in_month or self.current_month_days()
+        beyond = index[index >= days]
+        return self._issues(
+            None, "fila_fuera_del_mes", beyond,
+            "Fila {row}: el mes solo tiene {days} días (fila del día {day})",
+            days=repeat(days), day=beyond + 1
+        )
+
+    def _check_accounts(self, cuenta, proyecto, column):
+        """Cuentas desconocidas y proyectos faltantes según el mapeo"""
+        if cuenta.empty:
+            return []
+
+        mapping = self.mapeo_cuentas
+        known = cuenta.isin(list(mapping.keys()))
+        rest_codes = [code for code, info in mapping.items() if info.get("name") in REST_PROJECT_NAMES]
+        is_work = known & ~cuenta.isin(rest_codes)
+
+        valid_pairs = [(code, project) for code, info in mapping.items() for project in info.get("projects", {})]
+        empty_pairs = [
+            (code, project)
+            for code, info in mapping.items()
+            for project, account in info.get("projects", {}).items()
+            if not account
+        ]
+        pairs = pd.MultiIndex.from_arrays([cuenta, proyecto])
+        missing_project = is_work & ~pairs.isin(valid_pairs)
+        empty_account = is_work & pairs.isin(empty_pairs)
+
+        issues = self._issues(
+            column, "cuenta_desconocida", cuenta.index[~known],
+            "Fila {row}: Cuenta desconocida '{cuenta}'", cuenta=cuenta[~known]
+        )
+        issues.extend(self._issues(
+            column, "proyecto_desconocido", cuenta.index[missing_project],
+            "Fila {row}: Proyecto '{proyecto}' no encontrado para cuenta '{cuenta}'",
+            cuenta=cuenta[missing_project], proyecto=proyecto[missing_project]
+        ))
+        issues.extend(self._issues(
+            column, "cuenta_sin_nombre", cuenta.index[empty_account],
+            "Fila {row}: '{cuenta}:{proyecto}' no tiene nombre de cuenta en Replicon", SEVERITY_WARNING,
+            cuenta=cuenta[empty_account], proyecto=proyecto[empty_account]
+        ))
+        return issues
+
+    def _check_schedule_overlap(self, segments, schedule_rows):
+        """Segmentos EXT que se superponen con la jornada normal (horarios) del día"""
+        if not self.horarios or segments.empty:
+            return []
+
+        segments = segments[segments.index.isin(schedule_rows)]
+        overlapping = pd.Series(False, index=segments.index)
+        for horario in self.horarios:
+            start = time_to_minutes(horario.get("start_time", ""))
+            end = time_to_minutes(horario.get("end_time", ""))
+            if start is None or end is None:
+                continue
+            overlapping |= (segments["start"] < end) & (segments["end"] > start)
+        rows = overlapping[overlapping].index.unique()
+        return self._issues(
+            "Extras", "ext_superpone_horario", rows,
+            "Fila {row}: entrada EXT superpuesta con el horario normal ({schedule})", SEVERITY_WARNING,
+            schedule=repeat(self._schedule_label())
+        )
+
+    def _schedule_label(self):
+        return ", ".join(f"{horario.get('start_time')}-{horario.get('end_time')}" for horario in self.horarios)
+
+    def _explode_ext(self, extras):
+        """Separar las entradas EXT válidas en un segmento por fila (índice = fila original)"""
+        columns = ["cuenta", "proyecto", "start", "end"]
+        if extras.empty:
+            return pd.DataFrame(columns=columns, dtype=object)
+
+        # Cada valor distinto se parsea una sola vez y se replica por código de categoría
+        extras = extras.astype("category")
+        records = [
+            (code, match["cuenta"], match["proyecto"],
+             int(match["start_h"]) * 60 + int(match["start_m"]), int(match["end_h"]) * 60 + int(match["end_m"]))
+            for code, text in enumerate(extras.cat.categories.astype(str).tolist())
+            for match in _EXT_SEGMENT_RE.finditer(text)
+        ]
+        by_code = pd.DataFrame.from_records(records, columns=["code"] + columns)
+        rows = pd.DataFrame({"row": extras.index, "code": extras.cat.codes.to_numpy()})
+        segments = rows.merge(by_code, on="code", sort=False)
+        return segments.set_index("row")[columns].rename_axis(None)
+
+    def _check_intervals(self, segments):
+        """Intervalos EXT invertidos o superpuestos dentro de la misma fila"""
+        if segments.empty:
+            return []
+
+        inverted = segments.index[segments["start"] >= segments["end"]].unique()
+        issues = self._issues(
+            "Extras", "intervalo_invalido", inverted,
+            "Fila {row}: intervalo EXT con hora de fin no posterior al inicio"
+        )
+
+        ordered = segments.reset_index().rename(columns={"index": "row"}).sort_values(["row", "start"], kind="stable")
+        previous_end = ordered.groupby("row", sort=False)["end"].cummax().shift()
+        same_row = ordered["row"].eq(ordered["row"].shift())
+        overlapping = ordered.loc[same_row & (ordered["start"] < previous_end), "row"].unique()
+        issues.extend(self._issues("Extras", "ext_superpuesto", overlapping, "Fila {row}: entradas EXT superpuestas"))
+        return issues
+
+    @staticmethod
+    def _text_column(df, position):
+        """Columna de texto sin espacios como categoría; el strip se aplica una vez por valor distinto"""
+        column = df.iloc[:, position]
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(str).astype("category")
+        stripped = column.cat.categories.astype(str).str.strip()
+        if stripped.is_unique:
+            return column.cat.rename_categories(stripped)
+        return column.astype(str).str.strip().astype("category")
+
+    def _issues(self, column, code, index, template, severity=SEVERITY_ERROR, **values):
+        """Construir los problemas de las filas en index; template se formatea con la fila y values"""
+        self.counts[severity] += len(index)
+        limit = len(index) if self.max_issues is None else self.max_issues
+        rows = [int(row) + 2 for row in index[:limit]]
+        names = list(values)
+        columns = [list(islice(values[name], limit)) for name in names]
+        return [
+            {
+                "row": row,
+                "column": column,
+                "code": code,
+                "severity": severity,
+                "message": template.format(row=row, **dict(zip(names, items))),
+            }
+            for row, *items in zip(rows, *columns)
+        ]
+
+    def _issue(self, row, column, code, message, severity=SEVERITY_ERROR):
+        self.counts[severity] += 1
+        return {"row": int(row), "column": column, "code": code, "severity": severity, "message": message}
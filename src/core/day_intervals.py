@@ -0,0 +1,125 @@
+import re
+from functools import lru_cache
+
+_TIME_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*([ap]m)\s*$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def time_to_minutes(value):
+    """Convertir "7:00am" o "1600" a minutos desde medianoche; None si el formato es inválido"""
+    text = str(value).strip()
+    match = _TIME_PATTERN.match(text)
+    if match:
+        hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3).lower()
+        if not 1 <= hour <= 12 or minute > 59:
+            return None
+        hour = hour % 12 + (12 if period == "pm" else 0)
+        return hour * 60 + minute
+    if len(text) == 4 and text.isdigit():
+        hour, minute = int(text[:2]), int(text[2:])
+        if hour < 24 and minute < 60:
+            return hour * 60 + minute
+    return None
+
+
+def format_minutes(minutes):
+    """Formatear minutos desde medianoche como HH:MM"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class DayIntervals:
+    """Intervalos de un día como arreglos de minutos ordenados por inicio
+
+    starts/ends/order están alineados: order[i] es el índice de la entrada
+    original. Las entradas sin horario válido o con fin no posterior al
+    inicio quedan en invalid y no cuentan minutos.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.invalid = []
+        intervals = []
+        for index, entry in enumerate(entries):
+            start = time_to_minutes(entry.get("start_time", ""))
+            end = time_to_minutes(entry.get("end_time", ""))
+            if start is None or end is None or end <= start:
+                self.invalid.append(index)
+                continue
+            intervals.append((start, end, index))
+        intervals.sort()
+        self.starts = [interval[0] for interval in intervals]
+        self.ends = [interval[1] for interval in intervals]
+        self.order = [interval[2] for interval in intervals]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self):
+        """Pares (i, j) de entradas superpuestas; los intervalos contiguos no se superponen"""
+        pairs = []
+        active = []  # Índices ordenados de intervalos que siguen abiertos
+        for position, start in enumerate(self.starts):
+            active = [other for other in active if self.ends[other] > start]
+            pairs.extend((self.order[other], self.order[position]) for other in active)
+            active.append(position)
+        return pairs
+
+    def merged(self):
+        """Intervalos (inicio, fin) unidos, incluyendo los contiguos"""
+        merged = []
+        for start, end in zip(self.starts, self.ends):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1][1] = end
+            else:
+                merged.append([start, end])
+        return [tuple(interval) for interval in merged]
+
+    def gaps(self):
+        """Huecos (inicio, fin) entre los intervalos unidos"""
+        merged = self.merged()
+        return [(merged[i][1], merged[i + 1][0]) for i in range(len(merged) - 1)]
+
+    def exclusive_minutes(self):
+        """Minutos de cada entrada sin doble conteo (lo superpuesto cuenta para la que empieza antes)
+
+        Retorna una lista alineada con entries.
+        """
+        minutes = [0] * len(self.entries)
+        covered_until = None
+        for start, end, index in zip(self.starts, self.ends, self.order):
+            if covered_until is not None and start < covered_until:
+                start = covered_until
+            if end > start:
+                minutes[index] = end - start
+            covered_until = end if covered_until is None else max(covered_until, end)
+        return minutes
+
+    def worked_minutes(self):
+        """Minutos reales trabajados (unión de los intervalos)"""
+        return sum(end - start for start, end in self.merged())
+
+
+def build_day_index(time_entries, exclude_projects=()):
+    """Construir DayIntervals por día ignorando los proyectos indicados"""
+    return [
+        DayIntervals([entry for entry in daily_entries if entry.get("project") not in exclude_projects])
+        for daily_entries in time_entries
+    ]
+
+
+def find_overlaps(time_entries, exclude_projects=()):
+    """Superposiciones por día como problemas estructurados (día 1..N)"""
+    issues = []
+    for day_index, day in enumerate(build_day_index(time_entries, exclude_projects)):
+        for first, second in day.overlaps():
+            a, b = day.entries[first], day.entries[second]
+            issues.append({
+                "day": day_index + 1,
+                "entries": (a, b),
+                "message": (
+                    f"Día {day_index + 1}: {a['start_time']}-{a['end_time']} ({a.get('project')}) se superpone con "
+                    f"{b['start_time']}-{b['end_time']} ({b.get('project')})"
+                ),
+            })
+    return issues
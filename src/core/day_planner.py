@@ -0,0 +1,174 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Cómo se registra cada día del plan
+METHOD_ENTRY = "entry"  # Punch por punch (add_time_entry o los scripts JS)
+METHOD_COPY_DAY = "copy_day"  # Acción "copiar día anterior" de la hoja
+METHOD_FILL_WEEK = "fill_week"  # Lo llena la acción "llenar semana" de un día anterior
+METHOD_SKIP = "skip"
+METHOD_LABELS = {
+    METHOD_ENTRY: "Punch por punch",
+    METHOD_COPY_DAY: "Copiar día anterior",
+    METHOD_FILL_WEEK: "Llenar semana",
+    METHOD_SKIP: "Saltar",
+}
+
+# Acciones de la hoja que el planificador puede aprovechar
+ACTION_COPY_DAY = "copy_day"
+ACTION_FILL_WEEK = "fill_week"
+
+# Con menos días destino "llenar semana" no ahorra frente a copiar
+MIN_FILL_WEEK_DAYS = 2
+
+
+def day_signature(work_entries):
+    """Huella de las entradas de un día: dos días con la misma huella son idénticos"""
+    return tuple(
+        (entry["start_time"], entry["end_time"], entry["project"], entry["account"])
+        for entry in work_entries
+    )
+
+
+def run_lengths(signatures):
+    """Codificar por tramos los días consecutivos idénticos: [(primer día, largo, huella)]
+
+    signatures es una lista de (día, huella) en orden; un hueco entre días corta el tramo.
+    """
+    runs = []
+    for day, signature in signatures:
+        if runs and runs[-1][2] == signature and runs[-1][0] + runs[-1][1] == day:
+            start, length, _ = runs[-1]
+            runs[-1] = (start, length + 1, signature)
+        else:
+            runs.append((day, 1, signature))
+    return runs
+
+
+@dataclass
+class DayStep:
+    """Un día del plan y la forma de registrarlo"""
+    day: int
+    method: str
+    entries: int = 0  # Entradas de trabajo del día (cada una es un punch de entrada y uno de salida)
+    source_day: Optional[int] = None  # Día del que se copia (copy_day y fill_week)
+    fill_days: tuple = ()  # Días que llena este día con "llenar semana" tras registrarse
+    reason: str = ""  # Motivo del salto
+    signature: tuple = field(default=(), repr=False, compare=False)
+
+    @property
+    def typed_entries(self):
+        """Entradas que se escriben punch por punch"""
+        return self.entries if self.method == METHOD_ENTRY else 0
+
+
+@dataclass
+class DayPlan:
+    """Plan de registro del mes: qué días se escriben, cuáles se copian y cuáles se saltan"""
+    steps: list
+    actions: frozenset = frozenset()  # Acciones de la hoja disponibles al planificar
+    runs: list = field(default_factory=list)  # Tramos de días idénticos (run_lengths)
+
+    def __post_init__(self):
+        self._by_day = {step.day: step for step in self.steps}
+
+    def step(self, day):
+        return self._by_day.get(day)
+
+    @property
+    def total_entries(self):
+        return sum(step.entries for step in self.steps if step.method != METHOD_SKIP)
+
+    @property
+    def typed_entries(self):
+        return sum(step.typed_entries for step in self.steps)
+
+    @property
+    def saved_entries(self):
+        return self.total_entries - self.typed_entries
+
+    def count(self, method):
+        return sum(1 for step in self.steps if step.method == method)
+
+    def summary(self):
+        """Resumen de una línea con el ahorro esperado"""
+        total = self.total_entries
+        longest = max((length for _, length, signature in self.runs if signature), default=0)
+        text = (f"Plan: {self.count(METHOD_ENTRY)} días punch por punch, "
+                f"{self.count(METHOD_COPY_DAY)} copiando el día anterior, "
+                f"{self.count(METHOD_FILL_WEEK)} con llenar semana, {self.count(METHOD_SKIP)} saltados")
+        if total:
+            text += (f"; se escriben {self.typed_entries} de {total} entradas "
+                     f"(ahorro {self.saved_entries}, {100 * self.saved_entries / total:.0f}%)")
+        if longest > 1:
+            text += f"; tramo más largo de días iguales: {longest}"
+        if not self.actions:
+            text += "; la hoja no ofrece copiar día ni llenar semana"
+        return text
+
+
+def plan_days(time_entries, month_calendar, non_work_projects, only_days=None, actions=frozenset()):
+    """Planificar el registro agrupando los días consecutivos idénticos
+
+    El primer día de cada tramo se escribe punch por punch; los siguientes se
+    copian del día anterior o los llena "llenar semana" si la hoja ofrece esas
+    acciones. Los días con EXT o entradas únicas forman tramos de un día y se
+    escriben punch por punch.
+    """
+    actions = frozenset(actions)
+    steps = []
+    signatures = []
+    for day_number, daily_entries in enumerate(time_entries, 1):
+        if only_days is not None and day_number not in only_days:
+            continue
+        work_entries = [entry for entry in daily_entries if entry["project"] not in non_work_projects]
+        day_info = month_calendar.day(day_number)
+        if day_info is None:
+            steps.append(DayStep(day_number, METHOD_SKIP, len(work_entries), reason="fuera del mes"))
+        elif day_info.is_holiday:
+            steps.append(DayStep(day_number, METHOD_SKIP, len(work_entries),
+                                 reason=f"festivo: {day_info.holiday_name}"))
+        elif not work_entries:
+            steps.append(DayStep(day_number, METHOD_SKIP, reason="sin trabajo"))
+        else:
+            signature = day_signature(work_entries)
+            steps.append(DayStep(day_number, METHOD_ENTRY, len(work_entries), signature=signature))
+            signatures.append((day_number, signature))
+
+    plan_steps = {step.day: step for step in steps}
+    filled = set()
+    for step in steps:
+        if step.method == METHOD_SKIP or step.day in filled:
+            continue
+        previous = plan_steps.get(step.day - 1)
+        if (ACTION_COPY_DAY in actions and previous is not None and previous.method != METHOD_SKIP
+                and previous.signature == step.signature):
+            step.method = METHOD_COPY_DAY
+            step.source_day = step.day - 1
+        if ACTION_FILL_WEEK in actions:
+            targets = _fill_week_targets(step, plan_steps, month_calendar)
+            if len(targets) >= MIN_FILL_WEEK_DAYS:
+                step.fill_days = tuple(targets)
+                for target in targets:
+                    plan_steps[target].method = METHOD_FILL_WEEK
+                    plan_steps[target].source_day = step.day
+                filled.update(targets)
+
+    return DayPlan(steps, actions, run_lengths(signatures))
+
+
+def _fill_week_targets(step, plan_steps, month_calendar):
+    """Días laborables que quedan en la semana de step si todos repiten sus entradas"""
+    day_info = month_calendar.day(step.day)
+    targets = []
+    for day_number in range(step.day + 1, step.day + 7 - day_info.weekday):
+        target_info = month_calendar.day(day_number)
+        if target_info is None:
+            break
+        if not target_info.is_workday:
+            continue
+        target = plan_steps.get(day_number)
+        # Llenar semana escribe todos los laborables restantes: todos deben querer lo mismo
+        if target is None or target.method == METHOD_SKIP or target.signature != step.signature:
+            return []
+        targets.append(day_number)
+    return targets
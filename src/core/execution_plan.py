@@ -0,0 +1,222 @@
+import json
+import os
+import statistics
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from src.core.day_planner import METHOD_COPY_DAY, METHOD_ENTRY, METHOD_LABELS, METHOD_SKIP, plan_days
+from src.core.punch_script import ENTRY_STRATEGY_JS, ENTRY_STRATEGY_JS_DAY, ENTRY_STRATEGY_WEBDRIVER
+
+PLAN_VERSION = 1
+
+# Costos por entrada cuando aún no hay ejecuciones anteriores (medidos contra el mock)
+DEFAULT_COSTS = {
+    ENTRY_STRATEGY_WEBDRIVER: {"commands_per_entry": 35.0, "seconds_per_entry": 9.0},
+    ENTRY_STRATEGY_JS: {"commands_per_entry": 4.0, "seconds_per_entry": 5.0},
+    ENTRY_STRATEGY_JS_DAY: {"commands_per_entry": 2.0, "seconds_per_entry": 4.5},
+}
+DEFAULT_SETUP_SECONDS = 25.0  # Navegador, login y selección del mes
+COPY_DAY_COMMANDS = 8.0  # Por acción de copia: clic y espera de los punches
+COPY_DAY_SECONDS = 2.0
+
+WEEKDAY_NAMES = ("lun", "mar", "mié", "jue", "vie", "sáb", "dom")
+
+
+class RunHistory:
+    """Tiempos de las últimas ejecuciones (JSON) para estimar la duración de las siguientes"""
+
+    def __init__(self, filepath, max_runs=20):
+        self.filepath = filepath
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.filepath or not os.path.exists(self.filepath):
+            return []
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                return json.load(f).get("runs", [])
+        except (OSError, ValueError):
+            return []
+
+    def record(self, run):
+        """Agregar una ejecución terminada, conservando las últimas max_runs"""
+        if not self.filepath:
+            return
+        with self._lock:
+            runs = (self.load() + [run])[-self.max_runs:]
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+            tmp_path = f"{self.filepath}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"runs": runs}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.filepath)
+
+    def last_actions(self):
+        """Acciones de copia que ofreció la hoja en la última ejecución"""
+        runs = self.load()
+        return frozenset(runs[-1].get("actions", [])) if runs else frozenset()
+
+    def estimate(self, strategy):
+        """Comandos y segundos por entrada escrita según las ejecuciones de la estrategia"""
+        costs = dict(DEFAULT_COSTS.get(strategy, DEFAULT_COSTS[ENTRY_STRATEGY_WEBDRIVER]))
+        costs["setup_seconds"] = DEFAULT_SETUP_SECONDS
+        runs = [run for run in self.load() if run.get("strategy") == strategy and run.get("typed_entries")]
+        if runs:
+            costs["commands_per_entry"] = statistics.median(run["commands"] / run["typed_entries"] for run in runs)
+            costs["seconds_per_entry"] = statistics.median(
+                run["entries_seconds"] / run["typed_entries"] for run in runs
+            )
+            costs["setup_seconds"] = statistics.median(run.get("setup_seconds", DEFAULT_SETUP_SECONDS) for run in runs)
+        costs["based_on_runs"] = len(runs)
+        return costs
+
+
+@dataclass
+class PlannedDay:
+    """Un día del plan con las entradas que se registran"""
+    day: int
+    date: str = ""  # AAAA-MM-DD; vacío si el día no existe en el mes
+    method: str = METHOD_ENTRY
+    reason: str = ""
+    source_day: Optional[int] = None
+    fill_days: list = field(default_factory=list)
+    entries: list = field(default_factory=list)  # [{start_time, end_time, project, account}]
+
+    def describe(self):
+        weekday = ""
+        if self.date:
+            day_date = datetime.strptime(self.date, "%Y-%m-%d")
+            weekday = f" ({WEEKDAY_NAMES[day_date.weekday()]} {day_date.strftime('%d/%m')})"
+        label = f"Día {self.day}{weekday}: "
+        if self.method == METHOD_SKIP:
+            return label + f"saltar ({self.reason})"
+        text = label + f"{METHOD_LABELS[self.method].lower()}, {len(self.entries)} entradas"
+        if self.source_day:
+            text += f" desde el día {self.source_day}"
+        if self.fill_days:
+            text += f"; luego llenar semana: días {', '.join(map(str, self.fill_days))}"
+        return text
+
+
+@dataclass
+class ExecutionPlan:
+    """Plan de ejecución compilado antes de abrir el navegador (serializable a JSON)
+
+    Cualquier backend de envío puede registrar el plan con time_entries() y only_days().
+    """
+    month: str
+    strategy: str
+    total_days: int
+    days: list
+    actions: list = field(default_factory=list)
+    estimate: dict = field(default_factory=dict)
+    csv_file: str = ""
+    incremental: bool = False
+    created_at: str = ""
+    version: int = PLAN_VERSION
+
+    def active_days(self):
+        return [day for day in self.days if day.method != METHOD_SKIP]
+
+    @property
+    def total_entries(self):
+        return sum(len(day.entries) for day in self.active_days())
+
+    @property
+    def typed_entries(self):
+        return sum(len(day.entries) for day in self.active_days() if day.method == METHOD_ENTRY)
+
+    def only_days(self):
+        """Días que el plan registra (todos los no saltados)"""
+        return {day.day for day in self.active_days()}
+
+    def time_entries(self):
+        """Entradas por día (lista de total_days listas) como las retorna CSVProcessor"""
+        entries = [[] for _ in range(self.total_days)]
+        for day in self.days:
+            if 1 <= day.day <= self.total_days:
+                entries[day.day - 1] = [dict(entry) for entry in day.entries]
+        return entries
+
+    def summary(self):
+        """Resumen de una línea: entradas, comandos esperados y duración estimada"""
+        estimate = self.estimate
+        skipped = len(self.days) - len(self.active_days())
+        seconds = estimate.get("total_seconds", 0.0)
+        minutes, secs = divmod(int(round(seconds)), 60)
+        basis = (f"según {estimate['based_on_runs']} ejecuciones anteriores" if estimate.get("based_on_runs")
+                 else "con costos por defecto")
+        return (f"Plan ({self.strategy}): {len(self.active_days())} días, {skipped} saltados, "
+                f"{self.total_entries} entradas ({self.typed_entries} punch por punch); "
+                f"~{estimate.get('total_commands', 0):.0f} comandos de WebDriver "
+                f"({estimate.get('commands_per_entry', 0):.1f} por entrada), ~{minutes}m {secs:02d}s {basis}")
+
+    def describe(self):
+        """Líneas legibles del plan: resumen y un renglón por día"""
+        return [self.summary()] + [day.describe() for day in self.days]
+
+    def to_dict(self):
+        return asdict(self)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def save(self, filepath):
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"Versión de plan no soportada: {data.get('version')}")
+        days = [PlannedDay(**day) for day in data["days"]]
+        return cls(**{**data, "days": days})
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_execution_plan(time_entries, month_calendar, strategy, non_work_projects, only_days=None,
+                         actions=frozenset(), history=None, csv_file="", incremental=False):
+    """Compilar las entradas del CSV en un plan con días, entradas y estimación de costo"""
+    day_plan = plan_days(time_entries, month_calendar, non_work_projects, only_days, actions)
+    days = []
+    for step in day_plan.steps:
+        day_info = month_calendar.day(step.day)
+        work_entries = [
+            {key: entry[key] for key in ("start_time", "end_time", "project", "account")}
+            for entry in time_entries[step.day - 1]
+            if entry["project"] not in non_work_projects
+        ]
+        days.append(PlannedDay(
+            day=step.day,
+            date=day_info.date.isoformat() if day_info else "",
+            method=step.method,
+            reason=step.reason,
+            source_day=step.source_day,
+            fill_days=list(step.fill_days),
+            entries=work_entries,
+        ))
+
+    costs = history.estimate(strategy) if history else RunHistory(None).estimate(strategy)
+    # Una acción por día copiado y una por cada "llenar semana"
+    copy_actions = day_plan.count(METHOD_COPY_DAY) + sum(1 for step in day_plan.steps if step.fill_days)
+    typed = day_plan.typed_entries
+    costs["total_commands"] = typed * costs["commands_per_entry"] + copy_actions * COPY_DAY_COMMANDS
+    costs["total_seconds"] = (costs["setup_seconds"] + typed * costs["seconds_per_entry"]
+                              + copy_actions * COPY_DAY_SECONDS)
+    return ExecutionPlan(
+        month=month_calendar.key,
+        strategy=strategy,
+        total_days=len(time_entries),
+        days=days,
+        actions=sorted(actions),
+        estimate=costs,
+        csv_file=csv_file or "",
+        incremental=incremental,
+        created_at=datetime.now().isoformat(timespec="seconds"),
+    )
@@ -0,0 +1,362 @@
+import base64
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Estados de un trabajo
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+JOB_STATUS_LABELS = {
+    JOB_PENDING: "En cola",
+    JOB_RUNNING: "En ejecución",
+    JOB_DONE: "Completado",
+    JOB_FAILED: "Fallido",
+    JOB_CANCELLED: "Cancelado",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    csv_file TEXT NOT NULL,
+    month TEXT,
+    incremental INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_run_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    progress TEXT NOT NULL DEFAULT '',
+    last_error TEXT NOT NULL DEFAULT '',
+    owner_pid INTEGER,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, next_run_at);
+"""
+
+# Columnas agregadas después de la primera versión de la tabla (bases ya creadas)
+_ADDED_COLUMNS = {
+    "owner_pid": "INTEGER",
+    "heartbeat_at": "REAL",
+}
+
+# Un trabajo en ejecución cuyo proceso no actualiza su latido en este tiempo se considera abandonado
+JOB_STALE_SECONDS = 120.0
+
+
+def _encode(value):
+    """Codificación simple en base64, igual que las credenciales guardadas"""
+    return base64.b64encode(value.encode()).decode()
+
+
+def _decode(value):
+    return base64.b64decode(value).decode()
+
+
+def pid_alive(pid):
+    """El proceso pid sigue en ejecución (en Windows sin os.kill, que lo terminaría)"""
+    if not pid:
+        return False
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class Job:
+    """Trabajo de envío de un CSV para una cuenta de Replicon"""
+    id: int
+    email: str
+    password: str
+    csv_file: str
+    month: Optional[str]
+    incremental: bool
+    status: str
+    attempts: int
+    max_attempts: int
+    next_run_at: float
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    progress: str
+    last_error: str
+    owner_pid: Optional[int] = None  # Proceso que lo está ejecutando
+    heartbeat_at: Optional[float] = None
+
+    @property
+    def status_label(self):
+        return JOB_STATUS_LABELS.get(self.status, self.status)
+
+    @property
+    def resuming(self):
+        """Ya se inició antes: solo se envían los días que faltan (según el manifiesto)"""
+        return self.started_at is not None
+
+
+class JobQueue:
+    """Cola local de trabajos en SQLite; el estado persiste entre reinicios
+
+    Se puede usar desde varios hilos y procesos (la interfaz y la línea de
+    comandos comparten el mismo archivo).
+    """
+
+    def __init__(self, db_path, clock=time.time):
+        self.db_path = db_path
+        self.clock = clock
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: las transacciones se abren explícitamente con BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _row_to_job(self, row):
+        if row is None:
+            return None
+        data = dict(row)
+        data["password"] = _decode(data["password"])
+        data["incremental"] = bool(data["incremental"])
+        return Job(**data)
+
+    def enqueue(self, email, password, csv_file, month=None, incremental=False, max_attempts=3):
+        """Agregar un trabajo a la cola; retorna su id"""
+        now = self.clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (email, password, csv_file, month, incremental, status, max_attempts, "
+                "next_run_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (email.strip(), _encode(password), os.path.abspath(csv_file), month, int(incremental),
+                 JOB_PENDING, max_attempts, now, now)
+            )
+            return cursor.lastrowid
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def list_jobs(self, statuses=None):
+        """Trabajos (opcionalmente filtrados por estado) en orden de creación"""
+        query = "SELECT * FROM jobs"
+        params = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params = tuple(statuses)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def counts(self):
+        """Número de trabajos por estado"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def claim_next(self, account_interval=0.0, busy_accounts=()):
+        """Tomar el siguiente trabajo listo respetando el límite por cuenta; None si no hay
+
+        No se toma un trabajo si su cuenta ya tiene uno en ejecución o si el último
+        inicio de esa cuenta fue hace menos de account_interval segundos.
+        """
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                running = {row[0] for row in self._conn.execute(
+                    "SELECT email FROM jobs WHERE status = ?", (JOB_RUNNING,)
+                )}
+                last_started = dict(self._conn.execute(
+                    "SELECT email, MAX(started_at) FROM jobs WHERE started_at IS NOT NULL GROUP BY email"
+                ).fetchall())
+                candidates = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? AND next_run_at <= ? ORDER BY next_run_at, id",
+                    (JOB_PENDING, now)
+                ).fetchall()
+
+                for row in candidates:
+                    email = row["email"]
+                    if email in running or email in busy_accounts:
+                        continue
+                    if email in last_started and now - last_started[email] < account_interval:
+                        continue
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, "
+                        "progress = '', owner_pid = ?, heartbeat_at = ? WHERE id = ?",
+                        (JOB_RUNNING, now, os.getpid(), now, row["id"])
+                    )
+                    self._conn.execute("COMMIT")
+                    # started_at anterior: indica si el trabajo se está reanudando
+                    job = self._row_to_job(row)
+                    job.status = JOB_RUNNING
+                    job.attempts += 1
+                    job.owner_pid = os.getpid()
+                    job.heartbeat_at = now
+                    return job
+                self._conn.execute("COMMIT")
+                return None
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def update_progress(self, job_id, message):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE id = ?", (message, self.clock(), job_id)
+            )
+
+    def heartbeat(self, job_ids):
+        """Marcar como vivos los trabajos que este proceso está ejecutando"""
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND owner_pid = ? "
+                f"AND id IN ({', '.join('?' for _ in job_ids)})",
+                (self.clock(), JOB_RUNNING, os.getpid(), *job_ids)
+            )
+
+    def complete(self, job_id, message=""):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, progress = ?, last_error = '' WHERE id = ?",
+                (JOB_DONE, self.clock(), message, job_id)
+            )
+
+    def fail(self, job_id, error, backoff=60.0, retry=True):
+        """Registrar un fallo; se reintenta con espera exponencial hasta max_attempts
+
+        Con retry=False queda fallido de inmediato (solo se reintenta a mano).
+        Retorna True si el trabajo quedó programado para reintento.
+        """
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts, status FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None or row["status"] == JOB_CANCELLED:
+                return False
+            if retry and row["attempts"] < row["max_attempts"]:
+                delay = backoff * (2 ** (row["attempts"] - 1))
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, next_run_at = ?, last_error = ? WHERE id = ?",
+                    (JOB_PENDING, now + delay, str(error), job_id)
+                )
+                return True
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, last_error = ? WHERE id = ?",
+                (JOB_FAILED, now, str(error), job_id)
+            )
+            return False
+
+    def cancel(self, job_id):
+        """Cancelar un trabajo en cola (los que están en ejecución terminan su intento)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                (JOB_CANCELLED, self.clock(), job_id, JOB_PENDING, JOB_FAILED)
+            )
+            return cursor.rowcount > 0
+
+    def retry(self, job_id):
+        """Volver a poner en cola un trabajo fallido o cancelado"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, next_run_at = ?, finished_at = NULL "
+                "WHERE id = ? AND status IN (?, ?)",
+                (JOB_PENDING, self.clock(), job_id, JOB_FAILED, JOB_CANCELLED)
+            )
+            return cursor.rowcount > 0
+
+    def release(self, job_id):
+        """Devolver a la cola un trabajo interrumpido a propósito, sin contar el intento"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), next_run_at = ?, "
+                "progress = 'Interrumpido' WHERE id = ? AND status = ?",
+                (JOB_PENDING, self.clock(), job_id, JOB_RUNNING)
+            )
+
+    def recover(self, stale_after=JOB_STALE_SECONDS):
+        """Devolver a la cola los trabajos en ejecución abandonados; retorna cuántos
+
+        Solo se recuperan los de un proceso que ya terminó o que no actualiza su
+        latido hace más de stale_after segundos: la interfaz y la línea de
+        comandos comparten la base y los trabajos de otro proceso vivo siguen
+        siendo suyos.
+        """
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, owner_pid, heartbeat_at FROM jobs WHERE status = ?", (JOB_RUNNING,)
+                ).fetchall()
+                abandoned = [
+                    row["id"] for row in rows
+                    if not pid_alive(row["owner_pid"])
+                    or row["heartbeat_at"] is None or now - row["heartbeat_at"] > stale_after
+                ]
+                for job_id in abandoned:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, next_run_at = ?, owner_pid = NULL, "
+                        "progress = 'Reanudado tras reinicio' WHERE id = ? AND status = ?",
+                        (JOB_PENDING, now, job_id, JOB_RUNNING)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(abandoned)
+
+    def next_ready_in(self):
+        """Segundos hasta el próximo trabajo en cola (0 si ya hay uno listo, None si no hay)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_run_at) FROM jobs WHERE status = ?", (JOB_PENDING,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - self.clock())
@@ -0,0 +1,141 @@
+import threading
+import time
+
+from src.core.automation_runner import AutomationRunner
+from src.core.selenium_handler import PartialDayError
+
+# Cada cuánto se renueva el latido de los trabajos en ejecución (JobQueue.recover usa JOB_STALE_SECONDS)
+HEARTBEAT_INTERVAL = 15.0
+
+
+class JobScheduler:
+    """Ejecuta los trabajos de la cola en paralelo con un límite global de navegadores
+
+    Cada cuenta tiene como máximo un trabajo en ejecución y un intervalo mínimo
+    entre inicios. Un trabajo fallido se reintenta con espera exponencial y,
+    como ya se inició, solo envía los días que no quedaron en el manifiesto; si
+    falló a mitad de un día (PartialDayError) no se reintenta solo.
+    """
+
+    def __init__(self, queue, horarios, mapeo_cuentas, max_browsers=2, account_interval=60.0,
+                 retry_backoff=60.0, poll_interval=1.0, headless=True, on_event=None, runner_factory=None):
+        self.queue = queue
+        self.horarios = horarios
+        self.mapeo_cuentas = mapeo_cuentas
+        self.max_browsers = max(1, max_browsers)
+        self.account_interval = account_interval
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self.headless = headless
+        self.on_event = on_event  # on_event(job_id, ProgressEvent)
+        self.runner_factory = runner_factory or AutomationRunner
+        self._active = {}  # job_id -> (job, runner)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def active_jobs(self):
+        with self._lock:
+            return [job for job, _ in self._active.values()]
+
+    def start(self, until_empty=False):
+        """Iniciar el despachador en segundo plano (reanuda los trabajos interrumpidos)"""
+        if self.running:
+            return
+        self.queue.recover()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, args=(until_empty,), daemon=True)
+        self._thread.start()
+
+    def stop(self, close_browsers=True):
+        """Dejar de tomar trabajos; opcionalmente cerrar los navegadores en uso"""
+        self._stop.set()
+        self._wake.set()
+        if close_browsers:
+            with self._lock:
+                runners = [runner for _, runner in self._active.values()]
+            for runner in runners:
+                runner.close_browser()
+
+    def wait(self, timeout=None):
+        """Esperar a que termine el despachador (y los trabajos en curso)"""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self):
+        """Avisar que hay trabajos nuevos en la cola"""
+        self._wake.set()
+
+    def _dispatch_loop(self, until_empty):
+        workers = []
+        last_heartbeat = 0.0
+        while not self._stop.is_set():
+            self._start_ready_jobs(workers)
+            workers = [worker for worker in workers if worker.is_alive()]
+            if time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                with self._lock:
+                    job_ids = list(self._active)
+                self.queue.heartbeat(job_ids)
+                last_heartbeat = time.monotonic()
+
+            next_ready = self.queue.next_ready_in()
+            if until_empty and next_ready is None and not workers:
+                break
+            # Con 0 hay trabajos listos pero bloqueados (límite de navegadores o de cuenta)
+            timeout = min(next_ready, self.poll_interval) if next_ready else self.poll_interval
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+        for worker in workers:
+            worker.join()
+
+    def _start_ready_jobs(self, workers):
+        while True:
+            with self._lock:
+                if len(self._active) >= self.max_browsers:
+                    return
+                busy_accounts = {job.email for job, _ in self._active.values()}
+            job = self.queue.claim_next(self.account_interval, busy_accounts)
+            if job is None:
+                return
+            runner = self.runner_factory(
+                job.email, job.password, job.csv_file, self.horarios, self.mapeo_cuentas,
+                headless=self.headless,
+                on_event=lambda event, job_id=job.id: self._on_runner_event(job_id, event),
+                month=job.month,
+                incremental=job.incremental or job.resuming
+            )
+            with self._lock:
+                self._active[job.id] = (job, runner)
+            worker = threading.Thread(target=self._run_job, args=(job, runner), daemon=True)
+            workers.append(worker)
+            worker.start()
+
+    def _run_job(self, job, runner):
+        try:
+            runner.run()
+            self.queue.complete(job.id, "Proceso completado exitosamente")
+        except PartialDayError as e:
+            # Repetir el día completo duplicaría los punches ya guardados: se revisa a mano
+            self.queue.fail(job.id, e, retry=False)
+        except Exception as e:
+            if self._stop.is_set():
+                # Se detuvo la cola: se reanuda en la próxima ejecución
+                self.queue.release(job.id)
+            else:
+                self.queue.fail(job.id, e, self.retry_backoff)
+        finally:
+            with self._lock:
+                self._active.pop(job.id, None)
+            self._wake.set()
+
+    def _on_runner_event(self, job_id, event):
+        if event.message:
+            self.queue.update_progress(job_id, event.message)
+        if self.on_event:
+            self.on_event(job_id, event)
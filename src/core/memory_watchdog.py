@@ -0,0 +1,176 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MB = 1024 * 1024
+
+
+def process_tree_rss(pid):
+    """RSS en bytes de un proceso y sus descendientes (chromedriver y Chrome); None si no se puede medir"""
+    if not pid:
+        return None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    if os.path.isdir("/proc"):
+        return _proc_tree_rss(pid)
+    return None
+
+
+def _proc_tree_rss(pid):
+    """Igual que process_tree_rss leyendo /proc (Linux, sin psutil)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # El nombre puede tener espacios: los campos siguen al último ')'
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, pending, found = 0, [pid], False
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm", "r") as f:
+                total += int(f.read().split()[1]) * page_size
+            found = True
+        except (OSError, IndexError, ValueError):
+            pass
+        pending.extend(children.get(current, []))
+    return total if found else None
+
+
+def js_heap_used(driver):
+    """Bytes usados por el heap de JavaScript de la pestaña actual (CDP); None si no está disponible"""
+    try:
+        return driver.execute_cdp_cmd("Runtime.getHeapUsage", {}).get("usedSize")
+    except (WebDriverException, AttributeError):
+        return None
+
+
+@dataclass
+class MemorySample:
+    """Memoria y ritmo al terminar un día"""
+    day: int
+    elapsed: float  # Segundos desde el inicio de las entradas
+    rss_mb: Optional[float]
+    heap_mb: Optional[float]
+    entries: int  # Entradas registradas ese día
+    day_seconds: float
+
+    @property
+    def seconds_per_entry(self):
+        return self.day_seconds / self.entries if self.entries else None
+
+    def describe(self):
+        parts = [f"Día {self.day}:"]
+        parts.append(f"RSS {self.rss_mb:.0f} MB" if self.rss_mb is not None else "RSS n/d")
+        parts.append(f"heap JS {self.heap_mb:.0f} MB" if self.heap_mb is not None else "heap JS n/d")
+        if self.seconds_per_entry is not None:
+            parts.append(f"{self.seconds_per_entry:.1f} s/entrada")
+        return " ".join(parts)
+
+
+class MemoryWatchdog:
+    """Mide la memoria del navegador en cada límite de día y decide cuándo reciclarlo
+
+    Se recicla al superar rss_limit_mb (chromedriver + Chrome) o heap_limit_mb
+    (heap de JavaScript), o cada recycle_every_days días registrados (0 = nunca).
+    """
+
+    def __init__(self, rss_limit_mb=1500, heap_limit_mb=512, recycle_every_days=0, clock=time.monotonic):
+        self.rss_limit_mb = rss_limit_mb
+        self.heap_limit_mb = heap_limit_mb
+        self.recycle_every_days = recycle_every_days
+        self.clock = clock
+        self.samples = []
+        self.recycles = []  # (día, motivo)
+        self._start = clock()
+        self._day_start = self._start
+        self._days_since_recycle = 0
+
+    def start_day(self):
+        self._day_start = self.clock()
+
+    def sample(self, driver, day, entries, pid=None):
+        """Tomar la muestra del día terminado"""
+        now = self.clock()
+        rss = process_tree_rss(pid)
+        heap = js_heap_used(driver)
+        sample = MemorySample(
+            day=day,
+            elapsed=now - self._start,
+            rss_mb=rss / MB if rss is not None else None,
+            heap_mb=heap / MB if heap is not None else None,
+            entries=entries,
+            day_seconds=now - self._day_start,
+        )
+        self.samples.append(sample)
+        if entries:
+            self._days_since_recycle += 1
+        return sample
+
+    def recycle_reason(self):
+        """Motivo para reciclar el navegador tras la última muestra; vacío si no hace falta"""
+        if not self.samples:
+            return ""
+        last = self.samples[-1]
+        if self.rss_limit_mb and last.rss_mb is not None and last.rss_mb > self.rss_limit_mb:
+            return f"RSS {last.rss_mb:.0f} MB > {self.rss_limit_mb} MB"
+        if self.heap_limit_mb and last.heap_mb is not None and last.heap_mb > self.heap_limit_mb:
+            return f"heap JS {last.heap_mb:.0f} MB > {self.heap_limit_mb} MB"
+        if self.recycle_every_days and self._days_since_recycle >= self.recycle_every_days:
+            return f"cada {self.recycle_every_days} días"
+        return ""
+
+    def record_recycle(self, day, reason):
+        self.recycles.append((day, reason))
+        self._days_since_recycle = 0
+
+    def summary(self):
+        """Pico de memoria, reciclajes y ritmo antes y después del primer reciclaje"""
+        if not self.samples:
+            return ""
+        rss = [sample.rss_mb for sample in self.samples if sample.rss_mb is not None]
+        heap = [sample.heap_mb for sample in self.samples if sample.heap_mb is not None]
+        parts = []
+        if rss:
+            parts.append(f"pico RSS {max(rss):.0f} MB")
+        if heap:
+            parts.append(f"pico heap JS {max(heap):.0f} MB")
+        parts.append(f"{len(self.recycles)} reciclajes")
+        if self.recycles:
+            first_day = self.recycles[0][0]
+            before = self._rate([sample for sample in self.samples if sample.day <= first_day])
+            after = self._rate([sample for sample in self.samples if sample.day > first_day])
+            if before and after:
+                parts.append(f"{before:.1f} s/entrada antes y {after:.1f} después del primero")
+        return ", ".join(parts)
+
+    @staticmethod
+    def _rate(samples):
+        entries = sum(sample.entries for sample in samples)
+        return sum(sample.day_seconds for sample in samples) / entries if entries else None
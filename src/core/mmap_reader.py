@@ -0,0 +1,103 @@
+import csv
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_RANGE_BYTES = 64 * 1024 * 1024  # Rango por proceso
+DEFAULT_BLOCK_BYTES = 4 * 1024 * 1024  # Bloque decodificado a la vez dentro de un rango
+
+
+def split_ranges(filepath, range_bytes=DEFAULT_RANGE_BYTES):
+    """Dividir el archivo (sin el encabezado) en rangos de bytes [inicio, fin) alineados a saltos de línea"""
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return []
+
+    ranges = []
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b"\n")
+        if header_end < 0:
+            return []
+        start = header_end + 1
+        while start < size:
+            end = min(start + range_bytes, size)
+            if end < size:
+                # Extender el rango hasta el final de la línea en curso
+                newline = mm.find(b"\n", end - 1)
+                end = size if newline < 0 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_rows(mm, start, end, encoding="utf-8", block_bytes=DEFAULT_BLOCK_BYTES):
+    """Filas (lista de campos) del rango; solo se decodifica un bloque a la vez"""
+    position = start
+    while position < end:
+        block_end = min(position + block_bytes, end)
+        if block_end < end:
+            newline = mm.find(b"\n", block_end - 1, end)
+            block_end = end if newline < 0 else newline + 1
+        text = mm[position:block_end].decode(encoding)
+        position = block_end
+
+        for line in text.split("\n"):
+            line = line.rstrip("\r")
+            if not line.strip():
+                continue
+            if '"' in line:
+                yield next(csv.reader([line]))
+            else:
+                yield line.split(",")
+
+
+def parse_range(filepath, start, end, horarios, mapeo_cuentas, encoding="utf-8"):
+    """Parsear un rango del CSV a entradas diarias (se ejecuta en un proceso aparte)"""
+    # Importación diferida: csv_processor importa este módulo
+    from src.core.csv_processor import CSVProcessor
+
+    processor = CSVProcessor()
+    entries = []
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for fields in iter_rows(mm, start, end, encoding):
+            cuenta = fields[0].strip()
+            proyecto = fields[1].strip() if len(fields) > 1 else ""
+            ext_data = fields[2].strip() if len(fields) > 2 else None
+            entries.append(processor.build_daily_entries(cuenta, proyecto, ext_data, horarios, mapeo_cuentas))
+    return entries
+
+
+class MmapCSVReader:
+    """Lector de CSV muy grandes: mmap + rangos alineados a líneas parseados en paralelo"""
+
+    def __init__(self, filepath, range_bytes=DEFAULT_RANGE_BYTES, max_workers=None, encoding="utf-8"):
+        self.filepath = filepath
+        self.range_bytes = range_bytes
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.encoding = encoding
+
+    def ranges(self):
+        return split_ranges(self.filepath, self.range_bytes)
+
+    def iter_range_entries(self, horarios, mapeo_cuentas, processes=True):
+        """Entradas diarias por rango, en el orden del archivo
+
+        Con un solo rango (o processes=False) se parsea en el proceso actual.
+        """
+        ranges = self.ranges()
+        if not processes or len(ranges) <= 1 or self.max_workers <= 1:
+            for start, end in ranges:
+                yield parse_range(self.filepath, start, end, horarios, mapeo_cuentas, self.encoding)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(parse_range, self.filepath, start, end, horarios, mapeo_cuentas, self.encoding)
+                for start, end in ranges
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,150 @@
+import json
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+class SaveRejected(Exception):
+    """El servidor respondió con error al guardar un punch
+
+    Se reintenta (se vuelve a hacer clic) solo si la petición falló en la red o
+    con un error del servidor (5xx); un 4xx se repetiría igual.
+    """
+
+    def __init__(self, status, message):
+        self.status = status
+        self.retryable = status == 0 or status >= 500
+        super().__init__(f"Replicon rechazó el punch (HTTP {status}): {message}")
+
+
+@dataclass
+class SaveResponse:
+    """Petición de guardado terminada, leída de los eventos Network.* de CDP"""
+    request_id: str
+    url: str
+    status: Optional[int] = None
+    failed: str = ""  # errorText de Network.loadingFailed
+    elapsed: float = 0.0  # Segundos entre el envío y la respuesta
+
+    @property
+    def ok(self):
+        return not self.failed and self.status is not None and self.status < 400
+
+
+def enable_performance_log(options):
+    """Activar en ChromeOptions el log de rendimiento solo con eventos de red"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+class NetworkMonitor:
+    """Sigue las peticiones de guardado (XHR) a partir del log de rendimiento de Chrome
+
+    Cada llamada a get_log entrega los eventos nuevos; se guardan las respuestas
+    terminadas cuya URL coincide con url_pattern hasta que se consumen.
+    """
+
+    def __init__(self, driver, url_pattern=None, poll_interval=0.05, clock=time.monotonic, sleep=time.sleep,
+                 observers=()):
+        self.driver = driver
+        self.url_pattern = re.compile(url_pattern) if url_pattern else None  # None: solo observadores
+        self.observers = list(observers)  # observer(method, params) para cada evento de red
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._pending = {}  # requestId -> SaveResponse en curso
+        self._started = {}  # requestId -> timestamp CDP del envío
+        self._completed = deque()
+        self._sent = False  # Se envió alguna petición de guardado desde la última marca
+        self.saves_seen = 0
+
+    def drain(self):
+        """Leer los eventos nuevos del log; retorna cuántas respuestas de guardado terminaron"""
+        finished = 0
+        for record in self.driver.get_log("performance"):
+            try:
+                message = json.loads(record["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method", "")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            for observer in self.observers:
+                observer(method, params)
+
+            if method == "Network.requestWillBeSent":
+                url = params.get("request", {}).get("url", "")
+                if self.url_pattern and self.url_pattern.search(url):
+                    self._pending[request_id] = SaveResponse(request_id, url)
+                    self._started[request_id] = params.get("timestamp", 0.0)
+                    self._sent = True
+            elif request_id not in self._pending:
+                continue
+            elif method == "Network.responseReceived":
+                response = self._pending[request_id]
+                response.status = params.get("response", {}).get("status")
+                response.elapsed = max(0.0, params.get("timestamp", 0.0) - self._started.get(request_id, 0.0))
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                response = self._pending.pop(request_id)
+                self._started.pop(request_id, None)
+                if method == "Network.loadingFailed":
+                    response.failed = params.get("errorText") or "error de red"
+                self._completed.append(response)
+                self.saves_seen += 1
+                finished += 1
+        return finished
+
+    def mark(self):
+        """Descartar guardados anteriores: las esperas siguientes solo ven peticiones nuevas"""
+        self.drain()
+        self._completed.clear()
+        self._sent = False
+
+    def take_completed(self):
+        """Respuestas terminadas desde la última marca (y las consume)"""
+        self.drain()
+        completed = list(self._completed)
+        self._completed.clear()
+        return completed
+
+    def wait_for_save(self, timeout, unseen_timeout=None):
+        """Esperar la respuesta del próximo guardado; lanza SaveRejected si el servidor lo rechaza
+
+        Retorna None si en unseen_timeout segundos (por defecto timeout) no se
+        envió ninguna petición que coincida con url_pattern: el patrón puede no
+        corresponder al endpoint real y quien llama confirma de otra forma.
+        """
+        start = self.clock()
+        deadline = start + timeout
+        unseen_deadline = start + (unseen_timeout if unseen_timeout is not None else timeout)
+        while True:
+            self.drain()
+            if self._completed:
+                response = self._completed.popleft()
+                self.raise_for_status(response)
+                return response
+            now = self.clock()
+            if not self._sent and now >= unseen_deadline:
+                return None
+            if now >= deadline:
+                raise TimeoutException(f"No se recibió respuesta del guardado en {timeout}s")
+            self.sleep(self.poll_interval)
+
+    def raise_for_status(self, response):
+        if response.ok:
+            return
+        if response.failed:
+            raise SaveRejected(0, response.failed)
+        raise SaveRejected(response.status, self.response_body(response.request_id))
+
+    def response_body(self, request_id, limit=300):
+        """Cuerpo de la respuesta (mensaje de error del servidor), si Chrome aún lo tiene"""
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return "sin detalle"
+        return (body.get("body") or "sin detalle").strip()[:limit]
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+
+from selenium.webdriver.common.by import By
+
+from src.core.punch_script import JS_HELPERS
+
+# Lee con el diálogo de edición abierto las opciones del multiLevelSelector: todos los
+# proyectos y las cuentas de los proyectos pedidos. Retorna {projects: [...], accounts:
+# {proyecto: [...]}} donde cada opción es {text, id, attr, value} (atributo data-*id/uri).
+OPTION_TREE_SCRIPT = JS_HELPERS + r"""
+var wanted = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+
+function optionInfo(link) {
+  var info = {text: link.textContent.trim(), id: link.id || "", attr: "", value: ""};
+  for (var i = 0; i < link.attributes.length; i++) {
+    var attr = link.attributes[i];
+    if (/^data-.*(id|uri)$/i.test(attr.name) && attr.value) { info.attr = attr.name; info.value = attr.value; break; }
+  }
+  return info;
+}
+
+// Igual que OptionIndex.match: texto exacto, si no el único que empieza con el nombre
+// y si no el único que lo contiene (nombres cortos del mapeo como "GOL")
+function matchingLink(selector, text) {
+  var links = Array.prototype.filter.call(document.querySelectorAll(selector), visible);
+  var labels = links.map(function (link) { return link.textContent.trim(); });
+  var tests = [
+    function (label) { return label === text; },
+    function (label) { return label.indexOf(text) === 0; },
+    function (label) { return label.indexOf(text) >= 0; }
+  ];
+  for (var t = 0; t < tests.length; t++) {
+    var found = links.filter(function (link, i) { return tests[t](labels[i]); });
+    if (found.length) { return found.length === 1 ? found[0] : null; }
+  }
+  return null;
+}
+
+function visibleLinks(selector) {
+  var links = Array.prototype.filter.call(document.querySelectorAll(selector), visible);
+  return links.length ? links : null;
+}
+
+(async function () {
+  try {
+    var popup = await waitFor(dialog, "el diálogo de edición");
+    var dropdown = await waitFor(function () { return popup.querySelector("a.multiLevelSelector"); },
+                                 "el selector de proyecto");
+    dropdown.click();
+    var projects = await waitFor(function () { return visibleLinks(".multiLevelSelectorList a"); },
+                                 "la lista de proyectos");
+    var result = {projects: projects.map(optionInfo), accounts: {}};
+
+    var previous = null;
+    for (var i = 0; i < wanted.length; i++) {
+      var link = wanted[i] ? matchingLink(".multiLevelSelectorList a", wanted[i]) : null;
+      if (!link) { continue; }
+      link.click();
+      // La lista de cuentas se vuelve a construir para cada proyecto
+      var accounts = await waitFor(function () {
+        var links = visibleLinks(".listArea a");
+        return links && links[0] !== previous ? links : null;
+      }, "las cuentas de " + wanted[i]);
+      previous = accounts[0];
+      result.accounts[wanted[i]] = accounts.map(optionInfo);
+      if (i < wanted.length - 1) {
+        dropdown.click();
+        await waitFor(function () { return visibleLinks(".multiLevelSelectorList a"); }, "la lista de proyectos");
+      }
+    }
+    done({ok: true, tree: result});
+  } catch (e) {
+    done({ok: false, error: String((e && e.message) || e)});
+  }
+})();
+"""
+
+
+def xpath_literal(value):
+    """Literal de XPath para un texto que puede tener comillas simples y dobles"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+@dataclass(frozen=True)
+class Option:
+    """Opción del selector con el identificador más estable disponible"""
+    text: str
+    element_id: str = ""
+    attr: str = ""  # Atributo data-* con id o URI de la opción
+    value: str = ""
+
+    @classmethod
+    def from_script(cls, data):
+        return cls(data.get("text", ""), data.get("id", ""), data.get("attr", ""), data.get("value", ""))
+
+    @property
+    def css(self):
+        """Selector CSS directo; vacío si la opción solo se identifica por su texto"""
+        if self.attr:
+            value = self.value.replace("\\", "\\\\").replace('"', '\\"')
+            return f'a[{self.attr}="{value}"]'
+        if self.element_id:
+            return f'a[id="{self.element_id}"]'
+        return ""
+
+    def locator(self, scope_xpath="//"):
+        """(By, selector) para encontrar la opción sin ambigüedad"""
+        if self.css:
+            return By.CSS_SELECTOR, self.css
+        # Texto exacto: evita que "PROD" coincida con "PRODUCCION"
+        return By.XPATH, f"{scope_xpath}a[normalize-space(.)={xpath_literal(self.text)}]"
+
+
+def match_option(options, name):
+    """Opción para un nombre del mapeo: texto exacto, si no la única que empieza con el nombre
+    y si no la única que lo contiene; None si no hay o es ambigua (se usa la búsqueda por texto)"""
+    if not name:
+        return None
+    if name in options:
+        return options[name]
+    for matches in (lambda text: text.startswith(name), lambda text: name in text):
+        found = [option for text, option in options.items() if matches(text)]
+        if found:
+            return found[0] if len(found) == 1 else None
+    return None
+
+
+class OptionIndex:
+    """Índice proyecto → cuentas del multiLevelSelector, leído una vez por sesión"""
+
+    def __init__(self, projects, accounts):
+        self.projects = projects  # {texto: Option}
+        self.accounts = accounts  # {proyecto: {texto: Option}}
+
+    @classmethod
+    def from_script(cls, tree):
+        projects = {}
+        for data in tree.get("projects", []):
+            option = Option.from_script(data)
+            projects.setdefault(option.text, option)
+        accounts = {
+            project: {option.text: option for option in map(Option.from_script, options)}
+            for project, options in tree.get("accounts", {}).items()
+        }
+        return cls(projects, accounts)
+
+    def project_option(self, project):
+        return match_option(self.projects, project)
+
+    def account_option(self, project, account):
+        # Las cuentas se guardan con el nombre del proyecto tal como viene del mapeo
+        return match_option(self.accounts.get(project, {}), account)
+
+    def project_locator(self, project):
+        option = self.project_option(project)
+        return option.locator("//*[contains(@class,'multiLevelSelectorList')]//") if option else None
+
+    def account_locator(self, project, account):
+        option = self.account_option(project, account)
+        return option.locator("//*[contains(@class,'listArea')]//") if option else None
+
+    def validate(self, time_entries, days=None, exclude_projects=()):
+        """Advertencias "Día N: ..." de las entradas que el índice no resuelve
+
+        Esas entradas no se descartan: se seleccionan con la búsqueda por texto.
+        """
+        warnings = []
+        for day_number, daily_entries in enumerate(time_entries, 1):
+            if days is not None and day_number not in days:
+                continue
+            for entry in daily_entries:
+                project, account = entry["project"], entry["account"]
+                if project in exclude_projects:
+                    continue
+                if self.project_option(project) is None:
+                    warnings.append(f"Día {day_number}: el proyecto '{project}' no está en el índice")
+                elif account and project in self.accounts and self.account_option(project, account) is None:
+                    warnings.append(f"Día {day_number}: la cuenta '{account}' no está en el índice del proyecto '{project}'")
+        return warnings
@@ -0,0 +1,72 @@
+from collections import Counter
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+# Un elemento que aparece obsoleto estas veces seguidas se vuelve a buscar siempre
+# (la página reconstruye ese nodo en cada punch y verificarlo solo agrega un comando)
+DEFAULT_VOLATILE_AFTER = 2
+
+
+class PageObjectCache:
+    """Referencias a los elementos del diálogo de edición reutilizadas durante un día
+
+    Antes de reutilizar una referencia se verifica con un solo comando
+    (is_displayed), que además detecta si quedó obsoleta; solo las referencias
+    invalidadas se vuelven a buscar.
+    """
+
+    def __init__(self, volatile_after=DEFAULT_VOLATILE_AFTER):
+        self.volatile_after = volatile_after
+        self._elements = {}
+        self._stale_streak = Counter()
+        self.volatile = set()  # Claves que no vale la pena guardar este día
+        self.hits = 0  # Búsquedas ahorradas
+        self.misses = 0
+        self.stale = 0
+
+    def get(self, key, resolve):
+        """Elemento guardado si sigue vigente; si no, resolve() y se guarda el nuevo"""
+        element = self._elements.pop(key, None)
+        if element is not None:
+            try:
+                valid = element.is_displayed()
+            except StaleElementReferenceException:
+                valid = False
+            except WebDriverException:
+                valid = False
+            if valid:
+                self.hits += 1
+                self._stale_streak[key] = 0
+                self._elements[key] = element
+                return element
+            self.stale += 1
+            self._stale_streak[key] += 1
+            if self._stale_streak[key] >= self.volatile_after:
+                self.volatile.add(key)
+
+        self.misses += 1
+        element = resolve()
+        if key not in self.volatile:
+            self._elements[key] = element
+        return element
+
+    def invalidate(self, key=None):
+        """Descartar una referencia (o todas, p. ej. tras cerrar diálogos para recuperar la página)"""
+        if key is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(key, None)
+
+    def reset(self):
+        """Empezar un día nuevo: sin referencias ni claves volátiles (los contadores se conservan)"""
+        self._elements.clear()
+        self._stale_streak.clear()
+        self.volatile.clear()
+
+    def summary(self):
+        """Resumen de una línea; vacío si no se usó"""
+        lookups = self.hits + self.misses
+        if not lookups:
+            return ""
+        return (f"{self.hits} de {lookups} búsquedas de elementos ahorradas, "
+                f"{self.stale} referencias obsoletas vueltas a buscar")
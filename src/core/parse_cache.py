@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# Hijo del logger de la aplicación: sus mensajes van al archivo de log de la interfaz
+logger = logging.getLogger("replicon_automator.parse_cache")
+
+
+class ParseCache:
+    """Cache de resultados de parseo del CSV compartido entre validación, reporte y automatización"""
+
+    def __init__(self, max_items=8, cache_dir=None, disk_min_bytes=None):
+        self.max_items = max_items
+        # Cache en disco opcional (solo para archivos grandes)
+        self.cache_dir = cache_dir
+        self.disk_min_bytes = disk_min_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure_disk(self, cache_dir, disk_min_bytes=0):
+        """Habilitar el cache en disco para archivos de al menos disk_min_bytes"""
+        self.cache_dir = cache_dir
+        self.disk_min_bytes = disk_min_bytes
+
+    @staticmethod
+    def file_signature(filepath):
+        """Obtener la firma del archivo: ruta absoluta, fecha de modificación y tamaño"""
+        stat = os.stat(filepath)
+        return (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def data_version(data):
+        """Obtener una versión corta (hash) de un mapeo o lista de horarios"""
+        if data is None:
+            return None
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    def make_key(self, kind, filepath, mapeo_cuentas=None, horarios=None):
+        """Construir la clave del cache para un tipo de resultado"""
+        return (kind,) + self.file_signature(filepath) + (
+            self.data_version(mapeo_cuentas),
+            self.data_version(horarios),
+        )
+
+    def get(self, key):
+        """Obtener un resultado del cache (memoria y luego disco)"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return True, self._memory[key]
+
+        found, value = self._load_from_disk(key)
+        with self._lock:
+            if found:
+                self.hits += 1
+                self._store_in_memory(key, value)
+            else:
+                self.misses += 1
+        return found, value
+
+    def put(self, key, value):
+        """Guardar un resultado en el cache"""
+        with self._lock:
+            self._store_in_memory(key, value)
+        self._save_to_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Obtener un resultado del cache o calcularlo y guardarlo"""
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """Limpiar el cache en memoria"""
+        with self._lock:
+            self._memory.clear()
+
+    def _store_in_memory(self, key, value):
+        """Guardar en memoria descartando los resultados más antiguos"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        """Ruta del archivo de cache en disco para una clave"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def _uses_disk(self, key):
+        """Verificar si la clave debe guardarse en disco según el tamaño del archivo"""
+        if not self.cache_dir:
+            return False
+        file_size = key[3]
+        return file_size >= (self.disk_min_bytes or 0)
+
+    def _load_from_disk(self, key):
+        """Cargar un resultado desde el cache en disco"""
+        if not self._uses_disk(key):
+            return False, None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                stored_key, value = pickle.load(f)
+            if stored_key != key:
+                return False, None
+            return True, value
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return False, None
+
+    def _save_to_disk(self, key, value):
+        """Guardar un resultado en el cache en disco (escritura atómica)"""
+        if not self._uses_disk(key):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("No se pudo guardar el cache en disco: %s", e)
+
+
+# Instancia compartida por todos los CSVProcessor de la aplicación
+parse_cache = ParseCache()
@@ -0,0 +1,169 @@
+import functools
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """Span vacío usado cuando el perfilado está desactivado"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Mide la duración de un bloque de código y la registra en el perfilador"""
+
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        self.profiler.record(self.name, self.start, end - self.start, args)
+        return False
+
+
+class Profiler:
+    """Registro liviano de tiempos (spans) por etapa y método
+
+    Cuando está desactivado, span() y los métodos decorados con profiled()
+    solo hacen una comprobación de un atributo.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self):
+        """Activar el registro de spans (descarta los anteriores)"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self):
+        """Desactivar el registro de spans"""
+        self.enabled = False
+
+    def reset(self):
+        """Descartar los spans registrados"""
+        with self._lock:
+            self.spans = []
+            self._origin = time.perf_counter()
+
+    def span(self, name, **args):
+        """Context manager que mide un bloque de código"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def record(self, name, start, duration, args=None):
+        """Registrar un span ya medido"""
+        with self._lock:
+            self.spans.append((name, start - self._origin, duration, threading.get_ident(), args))
+
+    def summary(self):
+        """Resumen por nombre: cantidad, total, promedio y máximo (ordenado por total)"""
+        stats = {}
+        with self._lock:
+            spans = list(self.spans)
+        for name, _, duration, _, _ in spans:
+            item = stats.setdefault(name, {"name": name, "count": 0, "total": 0.0, "max": 0.0})
+            item["count"] += 1
+            item["total"] += duration
+            item["max"] = max(item["max"], duration)
+        rows = sorted(stats.values(), key=lambda item: item["total"], reverse=True)
+        for item in rows:
+            item["mean"] = item["total"] / item["count"]
+        return rows
+
+    def format_summary(self):
+        """Tabla de texto con el resumen de tiempos"""
+        rows = self.summary()
+        if not rows:
+            return "Sin datos de perfilado"
+        width = max(len("Span"), max(len(row["name"]) for row in rows))
+        lines = [
+            f"{'Span':<{width}}  {'Veces':>7}  {'Total (s)':>10}  {'Prom. (ms)':>10}  {'Máx. (ms)':>10}",
+            "-" * (width + 45),
+        ]
+        for row in rows:
+            lines.append(
+                f"{row['name']:<{width}}  {row['count']:>7}  {row['total']:>10.3f}  "
+                f"{row['mean'] * 1000:>10.1f}  {row['max'] * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Spans en formato Chrome Trace (chrome://tracing o Perfetto)"""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+        for name, start, duration, tid, args in spans:
+            event = {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round(start * 1_000_000, 3),
+                "dur": round(duration * 1_000_000, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, directory, prefix="perfil"):
+        """Guardar el trace JSON y la tabla resumen; retorna las rutas creadas"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        trace_path = os.path.join(directory, f"{prefix}_{timestamp}.json")
+        summary_path = os.path.join(directory, f"{prefix}_{timestamp}.txt")
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(self.format_summary() + "\n")
+        return trace_path, summary_path
+
+
+# Instancia compartida por toda la aplicación
+profiler = Profiler()
+
+
+def profiled(name=None):
+    """Decorador que registra un span por cada llamada al método o función"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Span(profiler, span_name, None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
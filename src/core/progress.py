@@ -0,0 +1,157 @@
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+# Etapas de la automatización
+STAGE_CSV = "csv"
+STAGE_BROWSER = "browser"
+STAGE_LOGIN = "login"
+STAGE_MONTH = "month"
+STAGE_ENTRIES = "entries"
+STAGE_DONE = "done"
+STAGE_ERROR = "error"
+
+STAGE_LABELS = {
+    STAGE_CSV: "Procesar CSV",
+    STAGE_BROWSER: "Iniciar navegador",
+    STAGE_LOGIN: "Iniciar sesión",
+    STAGE_MONTH: "Seleccionar mes",
+    STAGE_ENTRIES: "Registrar entradas",
+    STAGE_DONE: "Completado",
+    STAGE_ERROR: "Error",
+}
+
+
+@dataclass
+class ProgressEvent:
+    """Evento de progreso emitido por la automatización"""
+    stage: str
+    message: str = ""
+    level: str = "info"  # info | error
+    day: int = 0
+    total_days: int = 0
+    entry_index: int = 0
+    total_entries: int = 0  # Entradas del día actual
+    entries_done: int = 0
+    entries_total: int = 0  # Entradas de todo el mes
+    elapsed: float = 0.0  # Segundos desde el inicio
+    throughput: float = 0.0  # Entradas por minuto
+    eta: Optional[float] = None  # Segundos restantes estimados
+    stage_timings: dict = field(default_factory=dict)
+
+    @property
+    def percent(self):
+        """Porcentaje de entradas procesadas"""
+        if not self.entries_total:
+            return 0.0
+        return min(100.0, self.entries_done * 100.0 / self.entries_total)
+
+    def to_dict(self):
+        """Convertir el evento a diccionario"""
+        return asdict(self)
+
+    def to_json(self):
+        """Convertir el evento a una línea JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+class ProgressTracker:
+    """Calcula tiempos, ritmo y ETA y emite eventos de progreso con frecuencia limitada"""
+
+    def __init__(self, on_event=None, min_interval=0.25, clock=time.monotonic):
+        self.on_event = on_event
+        self.min_interval = min_interval  # Segundos mínimos entre eventos no forzados
+        self.clock = clock
+        self.start_time = clock()
+        self.stage = None
+        self.stage_start = self.start_time
+        self.stage_timings = {}
+        self.entries_start = None
+        self.last_emit = None
+        self.state = {
+            "day": 0,
+            "total_days": 0,
+            "entry_index": 0,
+            "total_entries": 0,
+            "entries_done": 0,
+            "entries_total": 0,
+        }
+
+    def set_totals(self, total_days, entries_total):
+        """Definir el total de días y entradas a procesar"""
+        self.state["total_days"] = total_days
+        self.state["entries_total"] = entries_total
+
+    def start_stage(self, stage, message=""):
+        """Iniciar una nueva etapa registrando la duración de la anterior"""
+        self._close_stage()
+        self.stage = stage
+        self.stage_start = self.clock()
+        if stage == STAGE_ENTRIES:
+            self.entries_start = self.stage_start
+        self._emit(message, force=True)
+
+    def update(self, message="", day=None, entry_index=None, total_entries=None,
+               completed=0, force=False, level="info"):
+        """Actualizar el progreso; completed suma entradas terminadas (o saltadas)"""
+        if day is not None:
+            self.state["day"] = day
+        if entry_index is not None:
+            self.state["entry_index"] = entry_index
+        if total_entries is not None:
+            self.state["total_entries"] = total_entries
+        self.state["entries_done"] += completed
+        self._emit(message, force=force or level == "error", level=level)
+
+    def finish(self, message=""):
+        """Marcar el proceso como completado"""
+        self._close_stage()
+        self.stage = STAGE_DONE
+        self._emit(message, force=True)
+
+    def fail(self, message):
+        """Marcar el proceso como fallido"""
+        self._close_stage()
+        self.stage = STAGE_ERROR
+        self._emit(message, force=True, level="error")
+
+    def _close_stage(self):
+        """Registrar la duración de la etapa actual"""
+        if self.stage and self.stage not in (STAGE_DONE, STAGE_ERROR):
+            duration = self.clock() - self.stage_start
+            self.stage_timings[self.stage] = self.stage_timings.get(self.stage, 0.0) + duration
+
+    def _rates(self, now):
+        """Calcular ritmo (entradas/minuto) y segundos restantes"""
+        done = self.state["entries_done"]
+        if self.entries_start is None or done == 0:
+            return 0.0, None
+        entries_elapsed = now - self.entries_start
+        if entries_elapsed <= 0:
+            return 0.0, None
+        per_second = done / entries_elapsed
+        remaining = max(0, self.state["entries_total"] - done)
+        return per_second * 60, remaining / per_second
+
+    def _emit(self, message, force=False, level="info"):
+        """Emitir un evento si corresponde según la frecuencia mínima"""
+        if not self.on_event:
+            return
+        now = self.clock()
+        if not force and self.last_emit is not None and now - self.last_emit < self.min_interval:
+            return
+        self.last_emit = now
+
+        throughput, eta = self._rates(now)
+        event = ProgressEvent(
+            stage=self.stage,
+            message=message,
+            level=level,
+            elapsed=now - self.start_time,
+            throughput=throughput,
+            eta=eta,
+            stage_timings=dict(self.stage_timings),
+            **self.state
+        )
+        self.on_event(event)
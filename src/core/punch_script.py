@@ -0,0 +1,133 @@
+# Estrategias para registrar entradas en la hoja de Replicon
+ENTRY_STRATEGY_WEBDRIVER = "webdriver"  # Un comando de WebDriver por acción (clic, teclas, esperas)
+ENTRY_STRATEGY_JS = "js"  # Un script asíncrono por entrada (punch de entrada y salida)
+ENTRY_STRATEGY_JS_DAY = "js_day"  # Un script asíncrono con todas las entradas del día
+ENTRY_STRATEGIES = (ENTRY_STRATEGY_WEBDRIVER, ENTRY_STRATEGY_JS, ENTRY_STRATEGY_JS_DAY)
+
+# Funciones comunes de los scripts asíncronos (usan la variable timeoutMs de cada script)
+JS_HELPERS = r"""
+function visible(el) { return !!(el && el.getClientRects().length); }
+
+function byXPath(xpath) {
+  return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function waitFor(check, what) {
+  var deadline = Date.now() + timeoutMs;
+  return new Promise(function (resolve, reject) {
+    (function poll() {
+      var value = null;
+      try { value = check(); } catch (e) { value = null; }
+      if (value) { resolve(value); return; }
+      if (Date.now() > deadline) { reject(new Error("Tiempo agotado esperando " + what)); return; }
+      setTimeout(poll, 50);
+    })();
+  });
+}
+
+function dialog() {
+  var found = document.querySelector(".contextPopupNode.editPunchDialog");
+  return visible(found) ? found : null;
+}
+
+function linkWithText(links, text, exclude) {
+  // Primero la coincidencia exacta: un nombre puede ser subcadena de otro
+  var partial = null;
+  for (var i = 0; i < links.length; i++) {
+    if (links[i] === exclude || !visible(links[i])) { continue; }
+    var label = links[i].textContent.trim();
+    if (label === text) { return links[i]; }
+    if (!partial && label.indexOf(text) >= 0) { partial = links[i]; }
+  }
+  return partial;
+}
+
+"""
+
+# Registra las entradas recibidas (lista de {start_time, end_time, project, account}) con el
+# diálogo de edición ya abierto, usando los mismos selectores que add_time_entry. Si la entrada
+# trae project_selector/account_selector (del índice de opciones) se usan directamente. Se
+# ejecuta con execute_async_script: el último argumento es el callback que recibe
+# {ok, completed, step, error}.
+PUNCH_ENTRIES_SCRIPT = JS_HELPERS + r"""
+var entries = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var step = "inicio";
+
+function setTime(popup, value) {
+  var input = popup.querySelector("input.time");
+  input.focus();
+  input.value = value;
+  ["input", "change", "keyup", "blur"].forEach(function (type) {
+    input.dispatchEvent(new Event(type, {bubbles: true}));
+  });
+}
+
+async function save(popup) {
+  popup.querySelector("input[value='OK']").click();
+  var result = await waitFor(function () {
+    if (!dialog()) { return {saved: true}; }
+    var error = popup.querySelector(".error");
+    return error && error.textContent.trim() ? {error: error.textContent.trim()} : null;
+  }, "que se guarde el punch");
+  if (result.error) { throw new Error(result.error); }
+}
+
+async function addEntry(entry) {
+  step = "start_time";
+  var popup = await waitFor(dialog, "el diálogo de edición");
+  setTime(popup, entry.start_time);
+
+  step = "project";
+  var dropdown = await waitFor(function () { return popup.querySelector("a.multiLevelSelector"); },
+                               "el selector de proyecto");
+  dropdown.click();
+  var project = await waitFor(function () {
+    var indexed = entry.project_selector && document.querySelector(entry.project_selector);
+    return visible(indexed) ? indexed : linkWithText(document.querySelectorAll("a"), entry.project, dropdown);
+  }, "el proyecto " + entry.project);
+  project.click();
+
+  step = "account";
+  var account = await waitFor(function () {
+    var indexed = entry.account_selector && document.querySelector(entry.account_selector);
+    if (visible(indexed)) { return indexed; }
+    return linkWithText(document.querySelectorAll(".listArea a"), entry.account) ||
+           linkWithText(document.querySelectorAll("li a"), entry.account, dropdown);
+  }, "la cuenta " + entry.account);
+  account.click();
+
+  step = "loading_wait";
+  await waitFor(function () {
+    return !Array.prototype.some.call(document.querySelectorAll(".loading"), visible);
+  }, "el overlay loading");
+
+  step = "save_start";
+  await save(popup);
+
+  step = "checkout";
+  var checkout = await waitFor(function () {
+    return byXPath("//*[@class='componentPunchSegment combinedInput']//a[2][count(span)=1]");
+  }, "el punch de salida");
+  checkout.click();
+
+  step = "end_time";
+  popup = await waitFor(dialog, "el diálogo de salida");
+  setTime(popup, entry.end_time);
+
+  step = "save_end";
+  await save(popup);
+}
+
+(async function () {
+  var completed = 0;
+  try {
+    for (var i = 0; i < entries.length; i++) {
+      await addEntry(entries[i]);
+      completed++;
+    }
+    done({ok: true, completed: completed});
+  } catch (e) {
+    done({ok: false, completed: completed, step: step, error: String((e && e.message) || e)});
+  }
+})();
+"""
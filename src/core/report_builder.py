@@ -0,0 +1,115 @@
+TIME_OFF_PROJECTS = ['Vacation', 'No work', 'Holiday', 'Weekend', 'ND', 'Desconocido']
+
+
+class ReportBuilder:
+    """Clase para construir el reporte de horas por secciones"""
+
+    def build_report(self, summary, month_name):
+        """Construir el reporte completo como un solo texto"""
+        return "".join(self.iter_sections(summary, month_name))
+
+    def iter_sections(self, summary, month_name):
+        """Generar el reporte sección por sección para poder mostrarlo de forma incremental"""
+        yield self._header_section(summary, month_name)
+        yield self._weeks_section(summary)
+        yield from self._projects_sections(summary)
+        yield self._efficiency_section(summary)
+
+    def _header_section(self, summary, month_name):
+        """Sección de resumen general y análisis de horas"""
+        lines = [
+            "",
+            f"📊 REPORTE MENSUAL DE HORAS - {month_name.upper()}",
+            "═══════════════════════════════════════════",
+            "",
+            "📅 RESUMEN GENERAL:",
+            "─────────────────",
+            f"• Total de días: {summary['total_days']}",
+            f"• Total de horas: {summary['total_hours']:.2f}h",
+            f"• Promedio de horas por día: {summary['average_hours_per_day']:.2f}h",
+            "",
+            "⏰ ANÁLISIS DE HORAS:",
+            "──────────────────",
+            f"• Horas regulares: {summary['regular_hours']:.2f}h",
+            f"• Horas extra diarias: {summary['overtime_daily']:.2f}h",
+            f"• Horas extra semanales: {summary['overtime_weekly']:.2f}h",
+            f"• Estándar diario: {summary['standard_hours_per_day']}h",
+            f"• Estándar semanal: {summary['standard_hours_per_week']}h",
+            "",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _weeks_section(self, summary):
+        """Sección de horas por semana"""
+        lines = [
+            "📈 HORAS POR SEMANA DEL MES:",
+            "───────────────────────────",
+        ]
+
+        for week, week_data in summary['hours_by_week'].items():
+            week_hours = week_data['hours']
+            week_days = week_data['days']
+            avg_daily = week_hours / week_days if week_days > 0 else 0
+            overtime_week = max(0, week_hours - summary['standard_hours_per_week'])
+
+            line = f"• {week}: {week_hours:.2f}h ({week_days} días, promedio {avg_daily:.2f}h/día)"
+            if overtime_week > 0:
+                line += f" (Extra: {overtime_week:.2f}h)"
+            lines.append(line)
+
+        return "\n".join(lines) + "\n"
+
+    def _projects_sections(self, summary):
+        """Secciones de horas por proyecto y tiempo libre"""
+        # Separar proyectos de trabajo y tiempo libre
+        work_projects = {}
+        time_off_projects = {}
+
+        for project, hours in summary['hours_by_project'].items():
+            if project in TIME_OFF_PROJECTS:
+                time_off_projects[project] = hours
+            else:
+                work_projects[project] = hours
+
+        # Porcentajes basados solo en horas trabajadas
+        lines = [
+            "",
+            "🏢 HORAS DE TRABAJO POR PROYECTO:",
+            "───────────────────────────────",
+        ]
+        work_total = sum(work_projects.values())
+        for project, hours in work_projects.items():
+            percentage = (hours / work_total) * 100 if work_total > 0 else 0
+            lines.append(f"• {project}: {hours:.2f}h ({percentage:.1f}%)")
+        yield "\n".join(lines) + "\n"
+
+        # Mostrar tiempo libre por separado
+        if time_off_projects:
+            lines = [
+                "",
+                "🏖️ TIEMPO LIBRE / VACACIONES:",
+                "───────────────────────────",
+            ]
+            for project, hours in time_off_projects.items():
+                lines.append(f"• {project}: {hours:.2f}h")
+            yield "\n".join(lines) + "\n"
+
+    def _efficiency_section(self, summary):
+        """Sección de análisis de eficiencia"""
+        efficiency_score = (summary['regular_hours'] / summary['total_hours']) * 100 if summary['total_hours'] > 0 else 0
+        lines = [
+            "",
+            "📊 ANÁLISIS DE EFICIENCIA:",
+            "────────────────────────",
+            f"• Porcentaje de horas regulares: {efficiency_score:.1f}%",
+            f"• Porcentaje de horas extra: {100 - efficiency_score:.1f}%",
+        ]
+
+        if summary['overtime_daily'] > 10:
+            lines.append("⚠️ ALERTA: Alto nivel de horas extra detectado")
+        elif summary['overtime_daily'] > 0:
+            lines.append("⚡ Horas extra moderadas")
+        else:
+            lines.append("✅ Sin horas extra registradas")
+
+        return "\n".join(lines) + "\n"
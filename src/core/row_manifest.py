@@ -0,0 +1,126 @@
+import csv
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+from src.core.parse_cache import ParseCache
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+@dataclass
+class ChangeSet:
+    """Días (1..N) agregados, eliminados y modificados respecto al manifiesto"""
+    added: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    modified: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+    config_changed: bool = False  # Cambió el mapeo o los horarios: todos los días cuentan como modificados
+    row_hashes: List[str] = field(default_factory=list)  # Hashes actuales (índice 0 = día 1)
+    config: str = ""
+
+    @property
+    def changed_days(self):
+        """Días que hay que volver a parsear y enviar"""
+        return sorted(self.added + self.modified)
+
+    @property
+    def is_empty(self):
+        return not (self.added or self.removed or self.modified)
+
+    def describe(self):
+        parts = [f"{len(self.added)} agregados", f"{len(self.modified)} modificados",
+                 f"{len(self.removed)} eliminados", f"{len(self.unchanged)} sin cambios"]
+        return "Días: " + ", ".join(parts)
+
+
+def read_rows(filepath):
+    """Filas de datos del CSV (sin encabezado ni líneas vacías) con los campos ya recortados"""
+    with open(filepath, newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)  # Saltar encabezado
+        return [[value.strip() for value in row] for row in reader if row]
+
+
+def row_hash(fields):
+    """Hash corto del contenido normalizado de una fila"""
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def config_version(mapeo_cuentas, horarios):
+    """Versión del mapeo y los horarios: si cambian, cambian las entradas de todos los días"""
+    return f"{ParseCache.data_version(mapeo_cuentas)}:{ParseCache.data_version(horarios)}"
+
+
+def account_tag(account):
+    """Sufijo corto y estable de la cuenta para el nombre del manifiesto"""
+    return hashlib.blake2b(account.strip().lower().encode("utf-8"), digest_size=4).hexdigest()
+
+
+def manifest_path(filepath, account=None):
+    """Manifiesto junto al CSV; con account, uno por cuenta (<csv>.<tag>.manifest.json)"""
+    if account:
+        return f"{filepath}.{account_tag(account)}{MANIFEST_SUFFIX}"
+    return filepath + MANIFEST_SUFFIX
+
+
+def _read_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def load_manifest(filepath, account=None):
+    """Leer el manifiesto del CSV (de la cuenta si se indica); None si no existe, es ilegible o es de otra cuenta
+
+    El manifiesto anterior sin cuenta no se usa para una cuenta: no registra
+    quién envió esos días.
+    """
+    data = _read_manifest(manifest_path(filepath, account))
+    if data is None:
+        return None
+    if data.get("account") != (account_tag(account) if account else None):
+        return None
+    return data
+
+
+def save_manifest(filepath, day_hashes, config, account=None):
+    """Guardar de forma atómica el manifiesto {día: hash} de los días enviados por la cuenta"""
+    path = manifest_path(filepath, account)
+    data = {
+        "version": MANIFEST_VERSION,
+        "account": account_tag(account) if account else None,
+        "config": config,
+        "days": {str(day): value for day, value in sorted(day_hashes.items())},
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def diff_rows(row_hashes, manifest, config):
+    """Comparar los hashes actuales (índice 0 = día 1) con el manifiesto"""
+    change_set = ChangeSet(row_hashes=list(row_hashes), config=config)
+    previous = {}
+    if manifest is not None:
+        previous = {int(day): value for day, value in manifest.get("days", {}).items()}
+        change_set.config_changed = manifest.get("config") != config
+
+    for day, value in enumerate(row_hashes, 1):
+        if day not in previous:
+            change_set.added.append(day)
+        elif change_set.config_changed or previous[day] != value:
+            change_set.modified.append(day)
+        else:
+            change_set.unchanged.append(day)
+    change_set.removed = sorted(day for day in previous if day > len(row_hashes))
+    return change_set
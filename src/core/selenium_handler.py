@@ -4,25 +4,263 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from time import sleep
+import logging
 import sys
 import os
 
 # Agregar el directorio padre al path para importar config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config.config import Config
+from src.core.profiler import profiler, profiled
+from src.core.step_retry import RetryPolicy, RetryStats, StepRetrier
+from src.core.network_monitor import NetworkMonitor, SaveRejected, enable_performance_log
+from src.core.url_blocker import (BLOCK_MODE_BLOCK, BLOCK_MODE_OFF, BLOCK_MODES, TrafficStats,
+                                  apply_block_list, load_block_list)
+from src.core.punch_script import (ENTRY_STRATEGIES, ENTRY_STRATEGY_JS, ENTRY_STRATEGY_JS_DAY,
+                                   PUNCH_ENTRIES_SCRIPT)
+from src.core.day_planner import (ACTION_COPY_DAY, ACTION_FILL_WEEK, METHOD_COPY_DAY, METHOD_FILL_WEEK,
+                                   plan_days)
+from src.core.page_cache import PageObjectCache
+from src.core.memory_watchdog import MemoryWatchdog
+from src.core.command_recorder import CommandRecorder
+from src.core.option_index import OPTION_TREE_SCRIPT, OptionIndex
+from src.core.work_calendar import work_calendar
+
+# Hijo del logger de la aplicación: sus mensajes van al archivo de log de la interfaz
+logger = logging.getLogger("replicon_automator.selenium")
+
+# Proyectos que no generan registros en Replicon
+NON_WORK_PROJECTS = ["Vacation", "No work", "Weekend", "ND"]
+
+# Cierra los contextPopupNode visibles (menos el diálogo de edición si keep_dialog) con su botón Cancelar o Escape;
+# retorna cuántos cerró y cuántos de ellos eran diálogos de edición
+DISMISS_POPUPS_SCRIPT = """
+var keepDialog = arguments[0], closed = 0, editDialogs = 0;
+document.querySelectorAll('.contextPopupNode').forEach(function (popup) {
+  if (!popup.getClientRects().length) return;
+  var isEditDialog = popup.classList.contains('editPunchDialog');
+  if (keepDialog && isEditDialog) return;
+  if (isEditDialog) editDialogs++;
+  var cancel = popup.querySelector("input[value='Cancelar'], input[value='Cancel'], .cancelButton");
+  if (cancel) {
+    cancel.click();
+  } else {
+    popup.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true}));
+  }
+  closed++;
+});
+return {closed: closed, editDialogs: editDialogs};
+"""
+
+
+# Texto de los punches de un día (arguments[0] = índice li de la celda) para saber si cambió
+DAY_SEGMENTS_SCRIPT = """
+var found = document.evaluate(
+  "//li[" + arguments[0] + "]//*[contains(@class,'componentPunchSegment')]",
+  document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var texts = [];
+for (var i = 0; i < found.snapshotLength; i++) {
+  texts.push(found.snapshotItem(i).textContent.trim());
+}
+return texts.join("|");
+"""
+
+
+class EditDialogCancelled(Exception):
+    """Se canceló un diálogo de edición abierto: su punch no se guardó (no se reintenta)"""
+
+
+class PartialDayError(Exception):
+    """Falló un día después de enviar parte de sus punches: repetirlo completo los duplicaría"""
+
+    def __init__(self, day, message):
+        super().__init__(f"{message}. El día {day} pudo quedar a medias en Replicon: "
+                         "revíselo antes de volver a ejecutar")
+        self.day = day
+
+# Campos de Network.getAllCookies que se pueden volver a cargar con Network.setCookies
+SESSION_COOKIE_FIELDS = ("name", "value", "domain", "path", "expires", "httpOnly", "secure", "sameSite")
+
+# Espera máxima de cada paso dentro del script de entradas (igual que wait_and_find_multiple)
+JS_STEP_TIMEOUT_MS = 10000
+JS_SECONDS_PER_ENTRY = 60  # Límite de execute_async_script por entrada del lote
+
+MAX_INDEX_WARNINGS = 10  # Advertencias del índice de opciones que se muestran
+
+# Sin ninguna petición que coincida con SAVE_XHR_PATTERN en este tiempo se confirma por el cierre del diálogo
+SAVE_UNSEEN_TIMEOUT = 3
+# Guardados seguidos sin petición que coincida tras los que se deja de confirmar por red
+SAVE_UNMATCHED_LIMIT = 3
 
 class SeleniumHandler:
-    def __init__(self):
+    def __init__(self, entry_strategy=None, record_file=None):
         self.driver = None
         self.config = Config()
+        self.entry_strategy = entry_strategy or self.config.ENTRY_STRATEGY
+        if self.entry_strategy not in ENTRY_STRATEGIES:
+            raise ValueError(f"Estrategia de entrada inválida '{self.entry_strategy}' "
+                             f"(opciones: {', '.join(ENTRY_STRATEGIES)})")
+        self.command_count = 0  # Comandos enviados a chromedriver (idas y vueltas HTTP)
+        # Grabación de los comandos con su latencia, para reproducirlos sin Replicon
+        record_file = record_file or self.config.RECORD_COMMANDS
+        self.recorder = CommandRecorder(record_file) if record_file else None
+        self._script_timeout = None
+        self.network = None  # NetworkMonitor con los eventos de red de CDP (si está activo)
+        self._save_confirmed = False
+        self._save_clicked = False  # Ya se hizo clic en OK para el punch en curso
+        self._save_rejected = False  # El servidor rechazó ese clic (SaveRejected reintentable)
+        self._segments_before = None  # Punches del día antes del clic
+        self.day_cell = None  # Índice li del día en curso
+        self.day_submitted = False  # Ya se envió algo a Replicon en el día en curso
+        self.progress = None  # ProgressTracker del lote en curso (advertencias para la interfaz y la CLI)
+        self._save_unmatched = 0  # Guardados seguidos sin petición que coincida con SAVE_XHR_PATTERN
+        self.block_mode = self.config.BLOCK_URLS_MODE
+        if self.block_mode not in BLOCK_MODES:
+            raise ValueError(f"BLOCK_URLS_MODE inválido '{self.block_mode}' (opciones: {', '.join(BLOCK_MODES)})")
+        self.block_list = []
+        self.traffic = None  # TrafficStats de la ejecución (modos block y measure)
+        self.option_index = None  # OptionIndex de proyectos y cuentas leído una vez por sesión
+        self.page_cache = PageObjectCache()  # Elementos del diálogo reutilizados dentro de un día
+        # Memoria del navegador por día y reciclaje en los límites de día
+        self.watchdog = MemoryWatchdog(
+            rss_limit_mb=self.config.WATCHDOG_RSS_MB,
+            heap_limit_mb=self.config.WATCHDOG_HEAP_MB,
+            recycle_every_days=self.config.RECYCLE_EVERY_DAYS
+        ) if self.config.WATCHDOG else None
+        self.relogin = None  # Callable que inicia sesión y abre la hoja si no se puede restaurar la sesión
+        self._headless = False
+        # Reintentos por paso dentro de add_time_entry
+        self.retry_stats = RetryStats()
+        self.retrier = StepRetrier(
+            RetryPolicy(
+                max_attempts=self.config.STEP_RETRY_ATTEMPTS,
+                base_delay=self.config.STEP_RETRY_BASE_DELAY,
+                max_delay=self.config.STEP_RETRY_MAX_DELAY
+            ),
+            self.retry_stats
+        )
     
-    def setup_driver(self):
-        """Configurar el navegador"""
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service)
+    @profiled("selenium.setup_driver")
+    def setup_driver(self, headless=False):
+        """Configurar el navegador (oculto si headless es True)"""
+        self._headless = headless
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+        if self.config.CDP_NETWORK or self.block_mode != BLOCK_MODE_OFF:
+            enable_performance_log(options)
+        with profiler.span("selenium.driver_install"):
+            service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=options)
+        self._count_commands(self.driver)
+        if self.recorder:
+            self.recorder.wrap(self.driver)
+        
+        observers = []
+        if self.block_mode != BLOCK_MODE_OFF:
+            self.block_list = load_block_list(self.config.BLOCKED_URLS_FILE, self.config.LOGIN_URL)
+            if self.traffic is None:  # Al reciclar el navegador se conservan los totales
+                self.traffic = TrafficStats(self.block_list, self.block_mode)
+            observers.append(self.traffic.observe)
+        if self.config.CDP_NETWORK or observers:
+            save_pattern = self.config.SAVE_XHR_PATTERN if self.config.CDP_NETWORK else None
+            self.network = NetworkMonitor(self.driver, save_pattern, observers=observers)
+        self.apply_block_list()
         return self.driver
     
+    @property
+    def confirms_saves(self):
+        """Los guardados se confirman con la respuesta del XHR (CDP_NETWORK)"""
+        return self.network is not None and self.network.url_pattern is not None
+    
+    def apply_block_list(self):
+        """Bloquear analítica y recursos pesados en la pestaña actual"""
+        if self.block_mode == BLOCK_MODE_BLOCK and self.block_list:
+            with profiler.span("selenium.block_urls"):
+                apply_block_list(self.driver, self.block_list)
+    
+    def traffic_summary(self):
+        """Peticiones y bytes de la ejecución (y lo ahorrado por la lista de bloqueo)"""
+        if not self.traffic:
+            return ""
+        if self.network and self.driver:
+            self.network.drain()
+        return self.traffic.summary()
+    
+    def _count_commands(self, driver):
+        """Contar cada comando de WebDriver (los WebElement también pasan por driver.execute)"""
+        execute = driver.execute
+        
+        def counted_execute(driver_command, params=None):
+            self.command_count += 1
+            return execute(driver_command, params)
+        
+        driver.execute = counted_execute
+    
+    @profiled("selenium.close_driver")
+    def close_driver(self):
+        """Cerrar el navegador si está abierto"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
+    
+    def driver_pid(self):
+        """PID de chromedriver (Chrome y sus procesos cuelgan de él); None si no se conoce"""
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return getattr(process, "pid", None)
+    
+    def capture_session(self):
+        """Cookies de todos los dominios (Okta y Replicon) y la URL de la hoja actual"""
+        cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        return {"cookies": cookies, "url": self.driver.current_url}
+    
+    @profiled("selenium.restore_session")
+    def restore_session(self, session, ready_cell):
+        """Cargar las cookies en el navegador nuevo y volver a la hoja sin iniciar sesión
+        
+        ready_cell es el índice li[...] de un día de la hoja que debe aparecer.
+        """
+        # Network.setCookies no acepta los campos de solo lectura; las de sesión van sin expiración
+        cookies = [
+            {key: value for key, value in cookie.items()
+             if key in SESSION_COOKIE_FIELDS and not (key == "expires" and cookie.get("session"))}
+            for cookie in session["cookies"]
+        ]
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        self.driver.get(session["url"])
+        self.wait_and_find_multiple([
+            (By.XPATH, f"//li[{ready_cell}]/ul/li/a"),
+            (By.XPATH, f"//li[{ready_cell}]//a[contains(@class,'timeEntryCell')]"),
+            (By.XPATH, f"//li[{ready_cell}]//*[contains(@class,'clickable')]")
+        ])
+    
+    @profiled("selenium.recycle_browser")
+    def recycle_browser(self, ready_cell):
+        """Cerrar Chrome y abrir uno nuevo en la misma hoja (la memoria acumulada se libera)
+        
+        Si la sesión no se puede restaurar con las cookies se usa self.relogin.
+        """
+        session = self.capture_session()
+        if self.network:
+            self.network.drain()
+        self.close_driver()
+        self.setup_driver(headless=self._headless)
+        self.page_cache.reset()
+        try:
+            self.restore_session(session, ready_cell)
+        except Exception as e:
+            if self.relogin is None:
+                raise Exception(f"No se pudo restaurar la sesión tras reciclar el navegador: {e}")
+            self.relogin()
+            return False
+        return True
+    
+    @profiled("selenium.wait_and_find")
     def wait_and_find(self, by, locator, timeout=None, scroll_into_view=False):
         """Esperar y encontrar elemento con scroll opcional"""
         if timeout is None:
@@ -68,6 +306,7 @@ class SeleniumHandler:
         except Exception as e:
             return None
     
+    @profiled("selenium.login")
     def login(self, email, password):
         """Función para iniciar sesión en Okta - exacta del código Tkinter"""
         self.driver.get(self.config.LOGIN_URL)
@@ -81,6 +320,7 @@ class SeleniumHandler:
         self.wait_and_find(By.XPATH, "//*[@id='main-content']/section/section/section/div/section/div/a[@aria-label='launch app Replicon']",30).click()
         self.switch_to_replicon()
     
+    @profiled("selenium.switch_to_replicon")
     def switch_to_replicon(self):
         """Función para cambiar a la ventana de Replicon - exacta del código Tkinter"""
         WebDriverWait(self.driver, 30).until(lambda d: len(d.window_handles) > 1)
@@ -100,148 +340,565 @@ class SeleniumHandler:
         
         if replicon_window:
             self.driver.switch_to.window(replicon_window)
+            # Network.setBlockedURLs aplica por pestaña
+            self.apply_block_list()
         else:
             raise Exception("No se encontró la ventana de Replicon.")
     
+    @profiled("selenium.select_month")
     def select_month(self):
-        """Seleccionar mes actual en Replicon"""
+        """Seleccionar mes actual en Replicon (el runner rechaza otros meses antes de abrir el navegador)"""
         self.wait_and_find(By.CLASS_NAME, "userWelcomeText")
         self.wait_and_find(
             By.XPATH, 
             "/html/body/div[1]/div[3]/div[3]/div/div[2]/div[1]/overview-page/div[2]/div/div[1]/div[3]/timesheet-card/div/article/current-timesheet-card-item/div//ul/li"
         ).click()
     
+    @profiled("selenium.add_time_entry")
     def add_time_entry(self, entry):
-        """Agregar entrada de tiempo con estrategias mejoradas"""
+        """Agregar entrada de tiempo reintentando solo el paso que falle"""
         start_time = entry["start_time"]
         end_time = entry["end_time"]
         project = entry["project"]
         account = entry["account"]
         
         try:
-            # Configurar hora de inicio - usar múltiples selectores
-            time_input = self.wait_and_find_multiple([
-                (By.XPATH, "//table[@class='fieldTable fieldTableNarrow']//input[@class='time']"),
-                (By.XPATH, "//input[@class='time']"),
-                (By.CSS_SELECTOR, "input.time")
-            ])
-            time_input.clear()
-            time_input.send_keys(start_time)
+            # Entrada: hora de inicio, proyecto y cuenta en el diálogo abierto
+            self.run_step("start_time", lambda: self._fill_time(start_time), keep_dialog=True)
+            with profiler.span("selenium.dropdown_selection"):
+                self.run_step("project", lambda: self._select_project(project), keep_dialog=True)
+                self.run_step("account", lambda: self._select_account(project, account), keep_dialog=True)
             
-            # Seleccionar proyecto - múltiples selectores para el dropdown
-            project_dropdown = self.wait_and_find_multiple([
-                (By.XPATH, "//table[@class='fieldTable fieldTableNarrow']//a[@class='divDropdown multiLevelSelector divDropdownSelectionNeeded']"),
-                (By.XPATH, "//a[@class='divDropdown multiLevelSelector divDropdownSelectionNeeded']"),
-                (By.CSS_SELECTOR, "a.divDropdown.multiLevelSelector.divDropdownSelectionNeeded")
-            ])
-            project_dropdown.click()
+            # Esperar que se cargue la selección
+            with profiler.span("selenium.loading_wait"):
+                self.run_step("loading_wait", lambda: self._wait_loading(5), keep_dialog=True)
             
-            # Esperar y seleccionar proyecto específico
-            project_link = self.wait_and_find_multiple([
+            # Guardar entrada y esperar la confirmación del servidor
+            self._begin_save()
+            self.run_step("save_start", self._save_punch, keep_dialog=True)
+            
+            # Salida: abrir el punch de salida, hora de fin y guardar
+            self.run_step("checkout", self._open_checkout)
+            self.run_step("end_time", lambda: self._fill_time(end_time), keep_dialog=True)
+            self._begin_save()
+            self.run_step("save_end", self._save_punch, keep_dialog=True)
+            
+        except Exception as e:
+            raise Exception(f"Error al agregar entrada de tiempo: {e}")
+    
+    @profiled("selenium.add_entries_js")
+    def add_entries_js(self, entries):
+        """Registrar entradas con un solo script asíncrono en lugar de un comando por acción
+        
+        Retorna el número de entradas registradas; si una falla lanza excepción
+        indicando la entrada y el paso.
+        """
+        self.day_submitted = True  # El script guarda cada entrada al terminarla
+        script_timeout = JS_SECONDS_PER_ENTRY * max(1, len(entries))
+        if script_timeout != self._script_timeout:
+            self.driver.set_script_timeout(script_timeout)
+            self._script_timeout = script_timeout
+        
+        payload = [
+            {key: entry[key] for key in ("start_time", "end_time", "project", "account")}
+            for entry in entries
+        ]
+        if self.option_index:
+            for item in payload:
+                project = self.option_index.project_option(item["project"])
+                account = self.option_index.account_option(item["project"], item["account"])
+                item["project_selector"] = project.css if project else ""
+                item["account_selector"] = account.css if account else ""
+        if self.confirms_saves:
+            self.network.mark()
+        result = self.driver.execute_async_script(PUNCH_ENTRIES_SCRIPT, payload, JS_STEP_TIMEOUT_MS)
+        if self.confirms_saves:
+            # Un rechazo del servidor explica mejor el fallo que el paso donde se detuvo el script
+            for response in self.network.take_completed():
+                self.network.raise_for_status(response)
+        if not result or not result.get("ok"):
+            result = result or {}
+            completed = result.get("completed", 0)
+            raise Exception(
+                f"Error al agregar entrada {completed + 1} (paso '{result.get('step')}'): {result.get('error')}"
+            )
+        return result["completed"]
+    
+    def run_step(self, step, action, keep_dialog=False):
+        """Ejecutar un paso de add_time_entry con reintentos y recuperación de la página
+        
+        keep_dialog indica que el paso necesita el diálogo de edición abierto.
+        """
+        return self.retrier.run(
+            step, action, recover=lambda exc: self.recover_page_state(keep_dialog)
+        )
+    
+    @profiled("selenium.recover_page_state")
+    def recover_page_state(self, keep_dialog=False):
+        """Cerrar diálogos contextPopupNode sobrantes y esperar el overlay de carga
+        
+        Si hubo que cancelar un diálogo de edición lanza EditDialogCancelled:
+        lo que tenía no se guardó y reintentar el paso lo daría por registrado.
+        """
+        result = self.driver.execute_script(DISMISS_POPUPS_SCRIPT, keep_dialog) or {}
+        self.page_cache.invalidate()
+        if result.get("editDialogs"):
+            raise EditDialogCancelled("Se canceló un diálogo de edición abierto: el punch no se guardó")
+        try:
+            self._wait_loading(2)
+        except TimeoutException:
+            pass
+        return result.get("closed", 0)
+    
+    def _fill_time(self, value):
+        time_input = self.page_cache.get("time_input", lambda: self.wait_and_find_multiple([
+            (By.XPATH, "//table[@class='fieldTable fieldTableNarrow']//input[@class='time']"),
+            (By.XPATH, "//input[@class='time']"),
+            (By.CSS_SELECTOR, "input.time")
+        ]))
+        time_input.clear()
+        time_input.send_keys(value)
+    
+    def _select_project(self, project):
+        # Tras un intento parcial el dropdown ya no tiene la clase divDropdownSelectionNeeded
+        project_dropdown = self.page_cache.get("project_dropdown", lambda: self.wait_and_find_multiple([
+            (By.XPATH, "//table[@class='fieldTable fieldTableNarrow']//a[@class='divDropdown multiLevelSelector divDropdownSelectionNeeded']"),
+            (By.XPATH, "//a[@class='divDropdown multiLevelSelector divDropdownSelectionNeeded']"),
+            (By.CSS_SELECTOR, "a.divDropdown.multiLevelSelector.divDropdownSelectionNeeded"),
+            (By.CSS_SELECTOR, "a.divDropdown.multiLevelSelector")
+        ]))
+        project_dropdown.click()
+        
+        # Esperar y seleccionar proyecto específico (primero el localizador del índice)
+        project_link = self.wait_and_find_multiple(self._indexed_locators(
+            self.option_index and self.option_index.project_locator(project),
+            [
                 (By.XPATH, f"//a[contains(text(),'{project}')]"),
                 (By.XPATH, f"//li//a[text()='{project}']"),
                 (By.XPATH, f"//*[contains(text(),'{project}')]//ancestor::a")
-            ])
-            project_link.click()
-            
-            # Seleccionar cuenta/subproyecto
-            account_link = self.wait_and_find_multiple([
+            ]
+        ))
+        project_link.click()
+    
+    def _select_account(self, project, account):
+        account_link = self.wait_and_find_multiple(self._indexed_locators(
+            self.option_index and self.option_index.account_locator(project, account),
+            [
                 (By.XPATH, f"//*[@class='listArea overthrow']//a[contains(text(),'{account}')]"),
                 (By.XPATH, f"//a[contains(text(),'{account}')]"),
                 (By.XPATH, f"//li//a[text()='{account}']")
-            ])
-            account_link.click()
-            
-            # Esperar que se cargue la selección
-            WebDriverWait(self.driver, 5).until(
-                EC.invisibility_of_element_located((By.CLASS_NAME, "loading"))
+            ]
+        ))
+        account_link.click()
+    
+    @staticmethod
+    def _indexed_locators(indexed, fallbacks):
+        """Localizador del índice de opciones (si existe) antes de las búsquedas amplias"""
+        return ([indexed] if indexed else []) + fallbacks
+    
+    def _wait_loading(self, timeout):
+        WebDriverWait(self.driver, timeout).until(
+            EC.invisibility_of_element_located((By.CLASS_NAME, "loading"))
+        )
+    
+    def _click_save(self):
+        save_button = self.page_cache.get("save_button", lambda: self.wait_and_find_multiple([
+            (By.XPATH, "//*[@class='contextPopupNode editPunchDialog']//input[@value='OK']"),
+            (By.XPATH, "//input[@value='OK']"),
+            (By.XPATH, "//div[contains(@class,'editPunchDialog')]//input[1]")
+        ]))
+        if self.confirms_saves:
+            self.network.mark()
+        self._segments_before = self._day_segments()
+        self._save_clicked = True
+        self._save_rejected = False
+        self.day_submitted = True
+        save_button.click()
+    
+    def _begin_save(self):
+        """Reiniciar el estado de guardado antes del clic en OK de un punch"""
+        self._save_confirmed = False
+        self._save_clicked = False
+        self._save_rejected = False
+        self._segments_before = None
+    
+    def _day_segments(self):
+        """Texto de los punches del día en curso; None si no se conoce el día"""
+        if self.day_cell is None:
+            return None
+        return self.driver.execute_script(DAY_SEGMENTS_SCRIPT, self.day_cell)
+    
+    def _saved_since_click(self):
+        """Los punches del día cambiaron desde el último clic en OK (el guardado llegó)"""
+        if self._segments_before is None:
+            return False
+        return self._day_segments() != self._segments_before
+    
+    def _save_punch(self):
+        """Clic en OK y esperar el guardado como un solo paso
+        
+        Se reintenta la unidad completa con el diálogo abierto. Sin confirmación
+        del servidor un timeout no dice si el punch se guardó, así que solo se
+        vuelve a hacer clic si el servidor rechazó el guardado anterior o si los
+        punches del día no cambiaron desde ese clic; si ya cambiaron solo se
+        espera el cierre del diálogo.
+        """
+        if not self._save_confirmed and self._save_clicked and not self._save_rejected:
+            self._save_confirmed = self._saved_since_click()
+        if not self._save_confirmed:
+            self._click_save()
+        with profiler.span("selenium.popup_wait"):
+            self._wait_saved()
+    
+    def _wait_saved(self):
+        """Confirmar el guardado con la respuesta del servidor (CDP) o, sin CDP, con el cierre del diálogo
+        
+        Un rechazo del servidor lanza SaveRejected de inmediato en lugar de esperar el timeout.
+        """
+        if self.confirms_saves and not self._save_confirmed:
+            with profiler.span("selenium.save_response"):
+                try:
+                    response = self.network.wait_for_save(10, unseen_timeout=SAVE_UNSEEN_TIMEOUT)
+                except SaveRejected:
+                    self._save_rejected = True
+                    raise
+            if response is None:
+                self._save_not_observed()
+            else:
+                self._save_unmatched = 0
+                self._save_confirmed = True
+        self._wait_popup_closed()
+    
+    def _save_not_observed(self):
+        """Ninguna petición coincidió con SAVE_XHR_PATTERN: se confirma por el cierre del diálogo"""
+        self._save_unmatched += 1
+        self._warn(f"Ninguna petición coincidió con SAVE_XHR_PATTERN ({self.config.SAVE_XHR_PATTERN}) "
+                   "al guardar; se confirma con el cierre del diálogo")
+        if self._save_unmatched >= SAVE_UNMATCHED_LIMIT:
+            self._warn(f"SAVE_XHR_PATTERN no coincidió en {self._save_unmatched} guardados seguidos: "
+                       "se deja de confirmar por red en esta sesión")
+            self.network.url_pattern = None
+    
+    def _warn(self, message):
+        """Advertencia en el avance (la interfaz también la escribe en el archivo de log); sin avance, al log"""
+        if self.progress:
+            self.progress.update(message, force=True, level="warning")
+        else:
+            logger.warning(message)
+    
+    def _wait_popup_closed(self):
+        WebDriverWait(self.driver, 10).until(
+            EC.invisibility_of_element_located((By.CLASS_NAME, "contextPopupNode"))
+        )
+    
+    def _open_checkout(self):
+        # No se guarda en la caché: cada punch de entrada crea un segmento nuevo
+        checkout_button = self.wait_and_find_multiple([
+            (By.XPATH, "//*[@class='componentPunchSegment combinedInput']//a[2][count(span)=1]"),
+            (By.XPATH, "//a[contains(@class,'punchOut')]"),
+            (By.XPATH, "//div[contains(@class,'combinedInput')]//a[2]")
+        ])
+        checkout_button.click()
+    
+    @profiled("selenium.wait_and_find_multiple")
+    def wait_and_find_multiple(self, selectors, timeout=10):
+        """Intentar múltiples selectores hasta que uno funcione
+        
+        Todos comparten el mismo plazo: en cada sondeo se prueban en orden y se
+        retorna el primero que esté listo para hacer clic.
+        """
+        try:
+            return WebDriverWait(self.driver, timeout).until(
+                EC.any_of(*(EC.element_to_be_clickable((by, locator)) for by, locator in selectors))
             )
-            
-            # Guardar entrada - múltiples selectores para el botón OK
-            save_button = self.wait_and_find_multiple([
-                (By.XPATH, "//*[@class='contextPopupNode editPunchDialog']//input[@value='OK']"),
-                (By.XPATH, "//input[@value='OK']"),
-                (By.XPATH, "//div[contains(@class,'editPunchDialog')]//input[1]")
-            ])
-            save_button.click()
-            
-            # Esperar que se guarde la entrada de inicio
-            WebDriverWait(self.driver, 10).until(
-                EC.invisibility_of_element_located((By.CLASS_NAME, "contextPopupNode"))
+        except TimeoutException:
+            # Si ningún selector funciona, lanzar excepción con todos los intentos
+            selectors_str = ", ".join([f"{by}='{locator}'" for by, locator in selectors])
+            raise TimeoutException(
+                f"No se pudo encontrar elemento con ninguno de estos selectores en {timeout}s: {selectors_str}"
             )
+    
+    def detect_day_actions(self, month_calendar):
+        """Acciones de copia que ofrece la hoja (copiar día anterior, llenar semana)"""
+        if not self.config.DAY_COPY:
+            return frozenset()
+        day_info = month_calendar.day(2) or month_calendar.day(1)
+        candidates = {ACTION_COPY_DAY: self.config.COPY_DAY_XPATH, ACTION_FILL_WEEK: self.config.FILL_WEEK_XPATH}
+        return frozenset(
+            action for action, xpath in candidates.items()
+            if xpath and self.driver.find_elements(By.XPATH, xpath.format(cell=day_info.cell_index))
+        )
+    
+    def plan_days(self, time_entries_data, month_calendar, only_days=None):
+        """Plan de registro con las acciones de copia disponibles en la hoja"""
+        return plan_days(time_entries_data, month_calendar, NON_WORK_PROJECTS, only_days,
+                         self.detect_day_actions(month_calendar))
+    
+    @profiled("selenium.batch_entries_same_day")
+    def batch_entries_same_day(self, time_entries_data, progress=None, month_calendar=None,
+                               only_days=None, on_day_done=None, plan=None):
+        """Procesar entradas por día con mejor manejo de errores
+        
+        progress es un ProgressTracker opcional que recibe el avance por día y entrada.
+        month_calendar es el MonthCalendar del mes del CSV (por defecto el actual).
+        only_days limita el proceso a esos días (1..N); on_day_done(día) se llama
+        por cada día terminado (incluidos los saltados). plan es el DayPlan a seguir
+        (por defecto se calcula con las acciones de copia de la hoja).
+        
+        Si un día falla después de enviar alguno de sus punches se lanza
+        PartialDayError: ese día no queda en el manifiesto y no debe repetirse a ciegas.
+        """
+        total_days = len(time_entries_data)
+        month_calendar = month_calendar or work_calendar.month()
+        self.progress = progress
+        
+        if self.config.OPTION_INDEX and self.option_index is None:
+            self.prepare_option_index(time_entries_data, month_calendar, only_days, progress)
+        if plan is None:
+            plan = self.plan_days(time_entries_data, month_calendar, only_days)
+        
+        last_day = max(only_days) if only_days else total_days
+        registered = {}  # día -> huella de lo registrado en esta ejecución
+        filled = set()  # Días ya llenados con "llenar semana"
+        for day_index, daily_entries in enumerate(time_entries_data):
+            day_number = day_index + 1
+            if only_days is not None and day_number not in only_days:
+                continue
             
-            # Configurar hora de fin - buscar el botón de salida
-            checkout_button = self.wait_and_find_multiple([
-                (By.XPATH, "//*[@class='componentPunchSegment combinedInput']//a[2][count(span)=1]"),
-                (By.XPATH, "//a[contains(@class,'punchOut')]"),
-                (By.XPATH, "//div[contains(@class,'combinedInput')]//a[2]")
-            ])
-            checkout_button.click()
-            
-            # Configurar hora de fin
-            end_time_input = self.wait_and_find_multiple([
-                (By.XPATH, "//table[@class='fieldTable fieldTableNarrow']//input[@class='time']"),
-                (By.XPATH, "//input[@class='time']"),
-                (By.CSS_SELECTOR, "input.time")
-            ])
-            end_time_input.clear()
-            end_time_input.send_keys(end_time)
-            
-            # Guardar salida
-            save_end_button = self.wait_and_find_multiple([
-                (By.XPATH, "//*[@class='contextPopupNode editPunchDialog']//input[@value='OK']"),
-                (By.XPATH, "//input[@value='OK']"),
-                (By.XPATH, "//div[contains(@class,'editPunchDialog')]//input[1]")
-            ])
-            save_end_button.click()
-            
-            # Esperar que se complete la entrada
-            WebDriverWait(self.driver, 10).until(
-                EC.invisibility_of_element_located((By.CLASS_NAME, "contextPopupNode"))
+            self.day_submitted = False
+            try:
+                self._batch_day(day_number, daily_entries, month_calendar, total_days, progress,
+                                plan, registered, filled, last_day)
+            except Exception as e:
+                if self.day_submitted and not isinstance(e, PartialDayError):
+                    raise PartialDayError(day_number, str(e)) from e
+                raise
+            if on_day_done:
+                on_day_done(day_number)
+            # Vaciar el log de rendimiento de Chrome en cada día para que no crezca toda la ejecución
+            if self.network:
+                self.network.drain()
+    
+    def _batch_day(self, day_number, daily_entries, month_calendar, total_days, progress,
+                   plan, registered, filled, last_day):
+        """Registrar (o copiar) un día del lote y reciclar el navegador si hace falta"""
+        step = plan.step(day_number)
+        if day_number in filled:
+            registered[day_number] = step.signature
+            if progress:
+                progress.update(f"Día {day_number} llenado con llenar semana (día {step.source_day})",
+                                day=day_number, completed=step.entries, force=True)
+        else:
+            # Se copia solo si el día anterior quedó registrado en esta ejecución con lo mismo
+            copy_from = None
+            if (step is not None and step.method in (METHOD_COPY_DAY, METHOD_FILL_WEEK)
+                    and ACTION_COPY_DAY in plan.actions
+                    and registered.get(day_number - 1) == step.signature):
+                copy_from = day_number - 1
+            if self.watchdog:
+                self.watchdog.start_day()
+            if self._process_day(day_number, daily_entries, month_calendar, total_days, progress,
+                                 copy_from=copy_from):
+                registered[day_number] = step.signature if step else ()
+                if step is not None and step.fill_days:
+                    filled.update(self._fill_week(step, month_calendar, progress))
+                if self.watchdog:
+                    self._watch_memory(day_number, daily_entries, month_calendar, last_day, progress)
+    
+    def _watch_memory(self, day_number, daily_entries, month_calendar, last_day, progress=None):
+        """Registrar la memoria del día terminado y reciclar el navegador si hace falta"""
+        entries = len([entry for entry in daily_entries if entry["project"] not in NON_WORK_PROJECTS])
+        sample = self.watchdog.sample(self.driver, day_number, entries, self.driver_pid())
+        if progress:
+            progress.update(sample.describe(), day=day_number, force=True)
+        reason = self.watchdog.recycle_reason()
+        if not reason or day_number >= last_day:
+            return
+        if not self.config.WATCHDOG_RECYCLE:
+            if progress:
+                progress.update(f"Memoria alta tras el día {day_number} ({reason}); "
+                                "reciclaje desactivado (WATCHDOG_RECYCLE=0)", day=day_number)
+            return
+        next_day = month_calendar.for_index(day_number)  # Día siguiente (índice base 0)
+        if next_day is None:
+            return
+        if progress:
+            progress.update(f"Reciclando el navegador tras el día {day_number} ({reason})",
+                            day=day_number, force=True)
+        with profiler.span("selenium.recycle", day=day_number):
+            restored = self.recycle_browser(next_day.cell_index)
+        self.watchdog.record_recycle(day_number, reason)
+        if progress and not restored:
+            progress.update("No se pudo restaurar la sesión: se volvió a iniciar sesión", force=True)
+    
+    @profiled("selenium.copy_previous_day")
+    def copy_previous_day(self, day_info, entries):
+        """Copiar al día las entradas del día anterior con la acción de la hoja"""
+        self._run_day_action(self.config.COPY_DAY_XPATH, day_info, [day_info], entries)
+    
+    def _fill_week(self, step, month_calendar, progress=None):
+        """Llenar los días restantes de la semana; retorna los días llenados
+        
+        Si algún día destino aparece como vacaciones en la página o ya tiene
+        punches no se llena nada y esos días se registran uno por uno.
+        """
+        targets = [month_calendar.day(day) for day in step.fill_days]
+        if any(self.is_vacation_or_holiday(target.cell_index) for target in targets):
+            return set()
+        # Llenar semana escribiría encima de los punches que ya tenga un día destino
+        if not self._days_empty(targets):
+            return set()
+        if progress:
+            progress.update(f"Día {step.day}: llenando la semana ({len(targets)} días)", day=step.day)
+        with profiler.span("selenium.fill_week", day=step.day):
+            self._run_day_action(self.config.FILL_WEEK_XPATH, month_calendar.day(step.day), targets, step.entries)
+        return set(step.fill_days)
+    
+    def _days_empty(self, targets):
+        """Ningún día destino tiene punches en la hoja (p. ej. de una ejecución anterior a medias)"""
+        return not any(
+            self.driver.find_elements(By.XPATH, f"//li[{target.cell_index}]//*[contains(@class,'componentPunchSegment')]")
+            for target in targets
+        )
+    
+    def _run_day_action(self, xpath, day_info, targets, entries):
+        """Clic en una acción de copia del día y esperar los punches en cada día destino"""
+        # Un diálogo abierto del día anterior taparía la acción
+        self.driver.execute_script(DISMISS_POPUPS_SCRIPT, False)
+        button = self.wait_and_find(By.XPATH, xpath.format(cell=day_info.cell_index), timeout=10)
+        if self.confirms_saves:
+            self.network.mark()
+        self.day_submitted = True
+        button.click()
+        if self.confirms_saves and self.network.wait_for_save(10, unseen_timeout=SAVE_UNSEEN_TIMEOUT) is None:
+            self._save_not_observed()
+        WebDriverWait(self.driver, 10).until(lambda d: all(
+            len(d.find_elements(By.XPATH, f"//li[{target.cell_index}]//*[contains(@class,'componentPunchSegment')]"))
+            >= entries
+            for target in targets
+        ))
+    
+    @profiled("selenium.prepare_option_index")
+    def prepare_option_index(self, time_entries_data, month_calendar, only_days=None, progress=None):
+        """Leer una vez el árbol proyecto → cuentas y validar las entradas antes de registrar
+        
+        Si el árbol no se puede leer se sigue con las búsquedas por texto; los
+        proyectos o cuentas que el índice no resuelve se reportan como advertencia
+        y se seleccionan con la búsqueda por texto.
+        """
+        days = set(only_days) if only_days is not None else set(range(1, len(time_entries_data) + 1))
+        wanted = []
+        first_day = None
+        for day_number, daily_entries in enumerate(time_entries_data, 1):
+            work_entries = [entry for entry in daily_entries if entry["project"] not in NON_WORK_PROJECTS]
+            if day_number not in days or not work_entries:
+                continue
+            day_info = month_calendar.for_index(day_number - 1)
+            if day_info is None or day_info.is_holiday:
+                continue
+            first_day = first_day or day_info.cell_index
+            wanted.extend(entry["project"] for entry in work_entries)
+        if first_day is None:
+            return None
+        
+        try:
+            # El árbol solo es visible con el diálogo de edición de un día abierto
+            self.wait_and_find_multiple([
+                (By.XPATH, f"//li[{first_day}]/ul/li/a"),
+                (By.XPATH, f"//li[{first_day}]//a[contains(@class,'timeEntryCell')]")
+            ]).click()
+            self.driver.set_script_timeout(JS_SECONDS_PER_ENTRY)
+            self._script_timeout = JS_SECONDS_PER_ENTRY
+            result = self.driver.execute_async_script(
+                OPTION_TREE_SCRIPT, list(dict.fromkeys(wanted)), JS_STEP_TIMEOUT_MS
             )
-            
         except Exception as e:
-            raise Exception(f"Error al agregar entrada de tiempo: {e}")
-    
-    def wait_and_find_multiple(self, selectors, timeout=10):
-        """Intentar múltiples selectores hasta que uno funcione"""
-        for by, locator in selectors:
+            result = {"ok": False, "error": str(e)}
+        finally:
             try:
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.element_to_be_clickable((by, locator))
-                )
-                return element
-            except:
-                continue
+                self.driver.execute_script(DISMISS_POPUPS_SCRIPT, False)
+            except Exception:
+                pass
         
-        # Si ningún selector funciona, lanzar excepción con todos los intentos
-        selectors_str = ", ".join([f"{by}='{locator}'" for by, locator in selectors])
-        raise Exception(f"No se pudo encontrar elemento con ninguno de estos selectores: {selectors_str}")
+        if not result or not result.get("ok"):
+            if progress:
+                progress.update(f"No se pudo leer el índice de proyectos: {(result or {}).get('error')}; "
+                                "se usará la búsqueda por texto", level="warning", force=True)
+            return None
+        
+        self.option_index = OptionIndex.from_script(result["tree"])
+        warnings = self.option_index.validate(time_entries_data, days, exclude_projects=NON_WORK_PROJECTS)
+        if warnings and progress:
+            shown = warnings[:MAX_INDEX_WARNINGS]
+            more = len(warnings) - len(shown)
+            progress.update("Entradas fuera del índice de opciones (se usará la búsqueda por texto):\n"
+                            + "\n".join(shown) + (f"\n... y {more} más" if more else ""),
+                            level="warning", force=True)
+        if progress:
+            progress.update(f"Índice de opciones: {len(self.option_index.projects)} proyectos", force=True)
+        return self.option_index
     
-    def batch_entries_same_day(self, time_entries_data, progress_callback=None):
-        """Procesar entradas por día con mejor manejo de errores"""
-        total_days = len(time_entries_data)
+    def _process_day(self, day_number, daily_entries, month_calendar, total_days, progress, copy_from=None):
+        """Registrar las entradas de un día (o saltarlo si no corresponde)
         
-        for day_index, daily_entries in enumerate(time_entries_data):
-            try:
-                current_day = day_index + 2  # Los días empiezan desde li[2]
-                
-                # Verificar si es día de vacaciones o feriado
-                if self.is_vacation_or_holiday(current_day):
-                    if progress_callback:
-                        progress_callback(day_index + 1, total_days, f"Saltando día {current_day-1} (vacaciones/feriado)")
-                    continue
-                
-                # Verificar si hay entradas de trabajo para este día
-                work_entries = [entry for entry in daily_entries 
-                              if entry["project"] not in ["Vacation", "No work", "Weekend", "ND"]]
-                
-                if not work_entries:
-                    if progress_callback:
-                        progress_callback(day_index + 1, total_days, f"Saltando día {current_day-1} (sin trabajo)")
-                    continue
-                
-                # Hacer clic en el día
+        Con copy_from se copia el día indicado en lugar de escribir cada punch.
+        Retorna True si el día quedó registrado.
+        """
+        day_index = day_number - 1
+        
+        # Verificar si hay entradas de trabajo para este día
+        work_entries = [entry for entry in daily_entries 
+                      if entry["project"] not in NON_WORK_PROJECTS]
+        
+        day_info = month_calendar.for_index(day_index)
+        if day_info is None:
+            if progress:
+                progress.update(f"Saltando día {day_number} (fuera de {month_calendar.key})",
+                                day=day_number, completed=len(work_entries), force=True)
+            return False
+        current_day = day_info.cell_index  # Los días empiezan desde li[2]
+        self.day_cell = current_day
+        
+        try:
+            # Festivo según la tabla local: se salta sin consultar la página
+            if day_info.is_holiday:
+                if progress:
+                    progress.update(f"Saltando día {day_number} (festivo: {day_info.holiday_name})",
+                                    day=day_number, completed=len(work_entries), force=True)
+                return False
+            
+            # Verificar si es día de vacaciones o feriado
+            if self.is_vacation_or_holiday(current_day):
+                if progress:
+                    progress.update(f"Saltando día {day_number} (vacaciones/feriado)",
+                                    day=day_number, completed=len(work_entries), force=True)
+                return False
+            
+            if not work_entries:
+                if progress:
+                    progress.update(f"Saltando día {day_number} (sin trabajo)", day=day_number)
+                return False
+            
+            # Copiar sobre un día que ya tiene punches los duplicaría: se escribe punch por punch
+            if copy_from is not None and not self._days_empty([day_info]):
+                copy_from = None
+            
+            if copy_from is not None:
+                if progress:
+                    progress.update(f"Día {day_number}: copiando el día {copy_from}",
+                                    day=day_number, entry_index=1, total_entries=len(work_entries))
+                with profiler.span("selenium.copy_day", day=day_number):
+                    self.copy_previous_day(day_info, len(work_entries))
+                if progress:
+                    progress.update(completed=len(work_entries))
+                    progress.update(f"Día {day_number} completado", day=day_number, force=True)
+                return True
+            
+            # Las referencias del día anterior no se reutilizan
+            self.page_cache.reset()
+            
+            # Hacer clic en el día
+            with profiler.span("selenium.day_click", day=day_number):
                 day_element = self.wait_and_find_multiple([
                     (By.XPATH, f"//li[{current_day}]/ul/li/a"),
                     (By.XPATH, f"//li[{current_day}]//a[contains(@class,'timeEntryCell')]"),
@@ -254,37 +911,55 @@ class SeleniumHandler:
                     day_element
                 )
                 day_element.click()
-                
+            
+            # Todas las entradas del día en un solo script
+            if self.entry_strategy == ENTRY_STRATEGY_JS_DAY:
+                if progress:
+                    progress.update(f"Día {day_number}: Agregando {len(work_entries)} entradas",
+                                    day=day_number, entry_index=1, total_entries=len(work_entries))
+                try:
+                    completed = self.add_entries_js(work_entries)
+                except Exception as e:
+                    raise Exception(f"Error en día {day_number}: {e}")
+                if progress:
+                    progress.update(completed=completed)
+            else:
                 # Procesar cada entrada de trabajo
                 for entry_index, entry in enumerate(work_entries):
                     try:
-                        if progress_callback:
-                            progress_callback(
-                                day_index + 1, total_days, 
-                                f"Día {current_day-1}: Agregando entrada {entry_index + 1}/{len(work_entries)}"
+                        if progress:
+                            progress.update(
+                                f"Día {day_number}: Agregando entrada {entry_index + 1}/{len(work_entries)}",
+                                day=day_number, entry_index=entry_index + 1, total_entries=len(work_entries)
                             )
                         
-                        self.add_time_entry(entry)
-                        
-                        # Pequeña pausa entre entradas del mismo día
-                        WebDriverWait(self.driver, 3).until(
-                            lambda d: len(d.find_elements(By.CLASS_NAME, "contextPopupNode")) == 0
-                        )
+                        if self.entry_strategy == ENTRY_STRATEGY_JS:
+                            # El script ya espera a que se cierre el diálogo
+                            self.add_entries_js([entry])
+                        else:
+                            self.add_time_entry(entry)
+                            
+                            # Pequeña pausa entre entradas del mismo día
+                            with profiler.span("selenium.popup_wait"):
+                                WebDriverWait(self.driver, 3).until(
+                                    lambda d: len(d.find_elements(By.CLASS_NAME, "contextPopupNode")) == 0
+                                )
                         
+                        if progress:
+                            progress.update(completed=1)
+                    
                     except Exception as e:
-                        error_msg = f"Error en día {current_day-1}, entrada {entry_index + 1}: {e}"
-                        if progress_callback:
-                            progress_callback(day_index + 1, total_days, error_msg)
-                        raise Exception(error_msg)
+                        raise Exception(f"Error en día {day_number}, entrada {entry_index + 1}: {e}")
+
+            if progress:
+                progress.update(f"Día {day_number} completado", day=day_number, force=True)
+            return True
                 
-                if progress_callback:
-                    progress_callback(day_index + 1, total_days, f"Día {current_day-1} completado")
-                    
-            except Exception as e:
-                error_msg = f"Error al procesar día {current_day-1}: {e}"
-                if progress_callback:
-                    progress_callback(day_index + 1, total_days, error_msg)
-                raise Exception(error_msg)
+        except Exception as e:
+            error_msg = f"Error al procesar día {day_number} de {total_days}: {e}"
+            if progress:
+                progress.update(error_msg, day=day_number, level="error")
+            raise Exception(error_msg)
     
     def process_all_entries(self, time_entries_data, progress_callback=None):
         """Función para procesar todas las entradas - basada exactamente en start_process del código Tkinter"""
@@ -299,10 +974,12 @@ class SeleniumHandler:
                     continue
                 
                 sleep(1)
+                self.day_cell = i
                 self.wait_and_find(By.XPATH, f"//li[{i}]/ul/li/a", scroll_into_view=True).click()
                 self.add_time_entry(entry)
             sleep(2)
     
+    @profiled("selenium.is_vacation_or_holiday")
     def is_vacation_or_holiday(self, day_number):
         """Verificar si un día es vacación o feriado"""
         try:
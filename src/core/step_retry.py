@@ -0,0 +1,153 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidSessionIdException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+# Fallos transitorios de la página: se reintenta solo el paso que falló
+RETRYABLE_EXCEPTIONS = (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    TimeoutException,
+    JavascriptException,
+)
+
+# El navegador o la sesión ya no existen: reintentar no sirve
+FATAL_EXCEPTIONS = (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+)
+
+
+def is_retryable(exc):
+    """Clasificar una excepción de Selenium como reintentable o fatal"""
+    if isinstance(exc, FATAL_EXCEPTIONS):
+        return False
+    if isinstance(exc, RETRYABLE_EXCEPTIONS):
+        return True
+    # Otros WebDriverException (p. ej. "chrome not reachable") y errores propios son fatales,
+    # salvo los que se declaran reintentables (p. ej. SaveRejected por un 5xx)
+    return getattr(exc, "retryable", False) is True
+
+
+class StepFailed(Exception):
+    """Un paso agotó sus reintentos o falló con un error no reintentable"""
+
+    def __init__(self, step, attempts, cause):
+        self.step = step
+        self.attempts = attempts
+        self.cause = cause
+        super().__init__(f"Paso '{step}' falló tras {attempts} intento(s): {cause}")
+
+
+@dataclass
+class RetryPolicy:
+    """Número de intentos y espera exponencial con jitter entre reintentos"""
+    max_attempts: int = 3
+    base_delay: float = 0.5  # Segundos antes del primer reintento
+    max_delay: float = 4.0
+    jitter: float = 0.5  # Fracción aleatoria (+/-) aplicada a cada espera
+
+    def delay(self, attempt, rng=random):
+        """Espera antes del reintento número attempt (1 = primer reintento)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return max(0.0, delay * rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class RetryStats:
+    """Contadores de reintentos por paso (seguros entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+        self.retries = Counter()
+        self.recovered = Counter()  # Pasos que terminaron bien tras al menos un reintento
+        self.failures = Counter()
+        self.errors = defaultdict(Counter)  # paso -> {tipo de excepción: veces}
+
+    def record(self, step, attempts, success, errors=()):
+        with self._lock:
+            self.calls[step] += 1
+            self.retries[step] += attempts - 1
+            if success and attempts > 1:
+                self.recovered[step] += 1
+            if not success:
+                self.failures[step] += 1
+            for exc in errors:
+                self.errors[step][type(exc).__name__] += 1
+
+    @property
+    def total_retries(self):
+        return sum(self.retries.values())
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                step: {
+                    "calls": self.calls[step],
+                    "retries": self.retries[step],
+                    "recovered": self.recovered[step],
+                    "failures": self.failures[step],
+                    "errors": dict(self.errors[step]),
+                }
+                for step in sorted(self.calls)
+            }
+
+    def summary(self):
+        """Resumen de una línea; vacío si no hubo reintentos ni fallos"""
+        steps = [
+            f"{step}: {data['retries']} reintentos, {data['recovered']} recuperados"
+            + (f", {data['failures']} fallidos" if data["failures"] else "")
+            for step, data in self.as_dict().items()
+            if data["retries"] or data["failures"]
+        ]
+        return "; ".join(steps)
+
+
+class StepRetrier:
+    """Ejecuta pasos reintentando solo el que falló, con recuperación de la página entre intentos"""
+
+    def __init__(self, policy=None, stats=None, sleep=time.sleep, rng=random):
+        self.policy = policy or RetryPolicy()
+        self.stats = stats if stats is not None else RetryStats()
+        self.sleep = sleep
+        self.rng = rng
+
+    def run(self, step, action, recover=None):
+        """Ejecutar action(); recover(exc) se llama antes de cada reintento"""
+        errors = []
+        for attempt in range(1, self.policy.max_attempts + 1):
+            try:
+                result = action()
+            except Exception as exc:
+                errors.append(exc)
+                if not is_retryable(exc) or attempt == self.policy.max_attempts:
+                    self.stats.record(step, attempt, False, errors)
+                    raise StepFailed(step, attempt, exc) from exc
+                if recover:
+                    try:
+                        recover(exc)
+                    except WebDriverException:
+                        pass  # La recuperación es best effort; el reintento decide
+                    except Exception as recover_exc:
+                        # La recuperación detectó que reintentar daría un resultado falso
+                        self.stats.record(step, attempt, False, errors)
+                        raise StepFailed(step, attempt, recover_exc) from recover_exc
+                self.sleep(self.policy.delay(attempt, self.rng))
+                continue
+            self.stats.record(step, attempt, True, errors)
+            return result
@@ -0,0 +1,170 @@
+import re
+
+from src.core.day_intervals import time_to_minutes
+from src.core.work_calendar import parse_month, work_calendar
+
+# pyarrow es opcional: solo se necesita para exportar/leer el formato intermedio
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = pc = ds = None
+
+ENTRY_COLUMNS = ["date", "seq", "start", "end", "project", "account"]
+PARTITION_COLUMNS = ["employee", "month"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow no está instalado; instálelo con 'pip install pyarrow' para usar Parquet")
+
+
+def _schema():
+    return pa.schema([
+        ("date", pa.date32()),
+        ("seq", pa.int16()),  # Orden de la entrada dentro del día (el del CSV)
+        ("start", pa.time32("ms")),  # Parquet no tiene unidad de segundos para time32
+        ("end", pa.time32("ms")),
+        ("project", pa.string()),
+        ("account", pa.string()),
+        ("employee", pa.string()),
+        ("month", pa.string()),
+    ])
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([("employee", pa.string()), ("month", pa.string())]), flavor="hive")
+
+
+def employee_key(employee):
+    """Valor de partición seguro para el empleado (correo o identificador)"""
+    return re.sub(r"[^A-Za-z0-9@._-]", "_", str(employee).strip().lower())
+
+
+def _to_standard_time(minutes):
+    """Minutos desde medianoche a "7:00am" (formato de las entradas)"""
+    hour, minute = divmod(minutes, 60)
+    suffix = "am" if hour < 12 else "pm"
+    return f"{hour % 12 or 12}:{minute:02d}{suffix}"
+
+
+class TimesheetStore:
+    """Entradas normalizadas en Parquet, particionadas por empleado y mes (estilo Hive)
+
+    root/employee=<id>/month=AAAA-MM/*.parquet con columnas date, seq, start,
+    end, project y account; seq guarda el orden de la entrada dentro del día.
+    """
+
+    def __init__(self, root_dir):
+        _require_pyarrow()
+        self.root_dir = root_dir
+
+    def to_table(self, time_entries, employee, year, month):
+        """Convertir las entradas por día a una tabla columnar (una fila por entrada)"""
+        month_calendar = work_calendar.month(year, month)
+        columns = {name: [] for name in ENTRY_COLUMNS}
+        for day_index, daily_entries in enumerate(time_entries):
+            day_info = month_calendar.for_index(day_index)
+            if day_info is None:
+                continue
+            for seq, entry in enumerate(daily_entries):
+                start = time_to_minutes(entry.get("start_time", ""))
+                end = time_to_minutes(entry.get("end_time", ""))
+                if start is None or end is None:
+                    continue
+                columns["date"].append(day_info.date)
+                columns["seq"].append(seq)
+                columns["start"].append(start * 60000)
+                columns["end"].append(end * 60000)
+                columns["project"].append(entry.get("project"))
+                columns["account"].append(entry.get("account"))
+
+        rows = len(columns["date"])
+        columns["employee"] = [employee_key(employee)] * rows
+        columns["month"] = [month_calendar.key] * rows
+        return pa.table(columns, schema=_schema())
+
+    def write_month(self, time_entries, employee, year, month):
+        """Escribir (reemplazando) la partición del empleado y mes indicados"""
+        table = self.to_table(time_entries, employee, year, month)
+        ds.write_dataset(
+            table,
+            self.root_dir,
+            format="parquet",
+            partitioning=_partitioning(),
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet",
+        )
+        return table.num_rows
+
+    def dataset(self):
+        """Dataset perezoso sobre todas las particiones (no lee datos hasta escanear)
+
+        Con el esquema completo, los archivos escritos antes de la columna seq la leen como nula.
+        """
+        return ds.dataset(self.root_dir, schema=_schema(), format="parquet", partitioning=_partitioning())
+
+    def _filter(self, employee=None, months=None):
+        expression = None
+        if employee is not None:
+            expression = ds.field("employee") == employee_key(employee)
+        if months is not None:
+            keys = [month if isinstance(month, str) else f"{month[0]:04d}-{month[1]:02d}" for month in months]
+            month_filter = ds.field("month").isin(keys)
+            expression = month_filter if expression is None else expression & month_filter
+        return expression
+
+    def scanner(self, columns=None, employee=None, months=None):
+        """Scanner perezoso de las columnas y particiones pedidas (se consume por lotes)"""
+        return self.dataset().scanner(columns=columns, filter=self._filter(employee, months))
+
+    def scan(self, columns=None, employee=None, months=None):
+        """Leer solo las columnas y particiones pedidas como tabla de Arrow"""
+        return self.scanner(columns, employee, months).to_table()
+
+    def month_scanner(self, employee, year, month, columns=ENTRY_COLUMNS):
+        """Scanner de la partición de un empleado y mes, para consumidores perezosos"""
+        return self.scanner(columns=columns, employee=employee, months=[work_calendar.month(year, month).key])
+
+    def load_month(self, employee, year, month):
+        """Reconstruir las entradas por día de un mes, en el mismo orden que CSVProcessor
+
+        Se lee por lotes y cada día se ordena por seq (por start en archivos sin seq).
+        """
+        month_calendar = work_calendar.month(year, month)
+        days = [[] for _ in range(len(month_calendar))]
+        for batch in self.month_scanner(employee, year, month).to_batches():
+            data = batch.to_pydict()
+            for day_date, seq, start, end, project, account in zip(*(data[name] for name in ENTRY_COLUMNS)):
+                start_minutes = start.hour * 60 + start.minute
+                days[day_date.day - 1].append(((start_minutes if seq is None else seq), {
+                    "start_time": _to_standard_time(start_minutes),
+                    "end_time": _to_standard_time(end.hour * 60 + end.minute),
+                    "project": project,
+                    "account": account,
+                }))
+        return [[entry for _, entry in sorted(day, key=lambda item: item[0])] for day in days]
+
+    def hours_by_month(self, employee=None, months=None, by_project=True):
+        """Horas por mes (y proyecto) con un escaneo columnar; retorna {mes: {proyecto: horas}}"""
+        columns = ["month", "start", "end"] + (["project"] if by_project else [])
+        table = self.scan(columns=columns, employee=employee, months=months)
+        milliseconds = pc.subtract(
+            pc.cast(pc.cast(table["end"], pa.int32()), pa.int64()),
+            pc.cast(pc.cast(table["start"], pa.int32()), pa.int64())
+        )
+        table = table.append_column("milliseconds", milliseconds)
+        keys = ["month", "project"] if by_project else ["month"]
+        grouped = table.group_by(keys).aggregate([("milliseconds", "sum")]).to_pydict()
+
+        result = {}
+        for index, month in enumerate(grouped["month"]):
+            project = grouped["project"][index] if by_project else "total"
+            result.setdefault(month, {})[project] = grouped["milliseconds_sum"][index] / 3600000
+        return dict(sorted(result.items()))
+
+
+def month_range(start, end):
+    """Claves AAAA-MM de start a end inclusive"""
+    return [month_calendar.key for month_calendar in work_calendar.months(parse_month(start), parse_month(end))]
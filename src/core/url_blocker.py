@@ -0,0 +1,111 @@
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+BLOCK_MODE_OFF = "off"
+BLOCK_MODE_BLOCK = "block"  # Bloquear las URLs de la lista
+BLOCK_MODE_MEASURE = "measure"  # No bloquear: medir cuánto se ahorraría
+BLOCK_MODES = (BLOCK_MODE_OFF, BLOCK_MODE_BLOCK, BLOCK_MODE_MEASURE)
+
+# Analítica, rastreo, fuentes e imágenes que no se necesitan para registrar horas
+# (patrones de Network.setBlockedURLs: '*' es comodín)
+DEFAULT_BLOCKED_URLS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*segment.com/analytics*",
+    "*nr-data.net*",
+    "*newrelic.com*",
+    "*fullstory.com*",
+    "*pendo.io*",
+    "*mixpanel.com*",
+    "*walkme.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+]
+# Fuentes e imágenes por extensión, con o sin query string
+DEFAULT_BLOCKED_URLS += [
+    pattern
+    for extension in ("woff", "woff2", "ttf", "png", "jpg", "jpeg", "gif", "webp", "ico")
+    for pattern in (f"*.{extension}", f"*.{extension}?*")
+]
+
+
+def load_block_list(filepath, login_url=None):
+    """Lista por defecto más las adiciones del archivo: {"extra": [...], "tenants": {host: [...]}}
+
+    El tenant se identifica por el host de LOGIN_URL (p. ej. "empresa.okta.com").
+    """
+    patterns = list(DEFAULT_BLOCKED_URLS)
+    if filepath and os.path.exists(filepath):
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        patterns.extend(data.get("extra", []))
+        host = urlparse(login_url or "").hostname or ""
+        patterns.extend(data.get("tenants", {}).get(host, []))
+    # Sin duplicados, conservando el orden
+    return list(dict.fromkeys(patterns))
+
+
+def compile_patterns(patterns):
+    """Expresión regular equivalente a los comodines de Network.setBlockedURLs"""
+    if not patterns:
+        return None
+    return re.compile("|".join(
+        "^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$" for pattern in patterns
+    ))
+
+
+def apply_block_list(driver, patterns):
+    """Bloquear las URLs en la pestaña actual (hay que repetirlo al cambiar de ventana)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+class TrafficStats:
+    """Peticiones y bytes de la ejecución, a partir de los eventos Network.* de CDP
+
+    En modo block cuenta las peticiones bloqueadas; en modo measure las que
+    coinciden con la lista y los bytes que transfirieron (lo que se ahorraría).
+    """
+
+    def __init__(self, patterns, mode=BLOCK_MODE_BLOCK):
+        self.mode = mode
+        self.regex = compile_patterns(patterns)
+        self.requests = 0
+        self.bytes = 0
+        self.blocked_requests = 0
+        self.matched_requests = 0
+        self.matched_bytes = 0
+        self._matched_ids = set()
+
+    def observe(self, method, params):
+        """Procesar un evento de red (se llama desde NetworkMonitor.drain)"""
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            self.requests += 1
+            url = params.get("request", {}).get("url", "")
+            if self.regex and self.regex.match(url):
+                self.matched_requests += 1
+                self._matched_ids.add(request_id)
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength") or 0)
+            self.bytes += size
+            if request_id in self._matched_ids:
+                self.matched_bytes += size
+                self._matched_ids.discard(request_id)
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                self.blocked_requests += 1
+            self._matched_ids.discard(request_id)
+
+    def summary(self):
+        mb = self.bytes / (1024 * 1024)
+        if self.mode == BLOCK_MODE_MEASURE:
+            saved_mb = self.matched_bytes / (1024 * 1024)
+            return (f"Red (medición): {self.requests} peticiones, {mb:.2f} MB; la lista de bloqueo "
+                    f"ahorraría {self.matched_requests} peticiones y {saved_mb:.2f} MB")
+        return f"Red: {self.requests} peticiones, {mb:.2f} MB; {self.blocked_requests} bloqueadas"
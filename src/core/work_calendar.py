@@ -0,0 +1,166 @@
+import calendar
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+DEFAULT_HOLIDAYS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config", "festivos.json"
+)
+
+# "2026-10", "2026_10" o "2026.10" dentro del nombre del archivo
+FILENAME_MONTH_RE = re.compile(r"(?<!\d)(20\d{2})[-_.](0[1-9]|1[0-2])(?!\d)")
+
+# En la hoja de Replicon el día 1 está en li[2] (li[1] es el encabezado)
+REPLICON_FIRST_CELL = 2
+
+
+@dataclass(frozen=True)
+class DayInfo:
+    """Metadatos precalculados de un día del mes"""
+    date: date
+    day: int  # 1..N
+    weekday: int  # 0 = lunes
+    iso_year: int
+    iso_week: int
+    week_label: str  # "Semana N (dd/mm-dd/mm)", igual al usado en el reporte
+    is_weekend: bool
+    is_holiday: bool
+    holiday_name: str
+    cell_index: int  # Índice li[...] de la celda del día en Replicon
+
+    @property
+    def is_workday(self):
+        return not (self.is_weekend or self.is_holiday)
+
+
+class MonthCalendar:
+    """Días de un mes con búsqueda O(1) por número de día o índice de fila del CSV"""
+
+    def __init__(self, year, month, holidays=None):
+        self.year = year
+        self.month = month
+        holidays = holidays or {}
+        days_in_month = calendar.monthrange(year, month)[1]
+        self.days = tuple(self._build_day(date(year, month, day), holidays) for day in range(1, days_in_month + 1))
+
+    @staticmethod
+    def _build_day(day_date, holidays):
+        iso_year, iso_week, _ = day_date.isocalendar()
+        week_start = day_date - timedelta(days=day_date.weekday())
+        week_end = week_start + timedelta(days=6)
+        holiday_name = holidays.get(day_date, "")
+        return DayInfo(
+            date=day_date,
+            day=day_date.day,
+            weekday=day_date.weekday(),
+            iso_year=iso_year,
+            iso_week=iso_week,
+            week_label=f"Semana {iso_week} ({week_start.strftime('%d/%m')}-{week_end.strftime('%d/%m')})",
+            is_weekend=day_date.weekday() >= 5,
+            is_holiday=bool(holiday_name),
+            holiday_name=holiday_name,
+            cell_index=day_date.day + REPLICON_FIRST_CELL - 1,
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def __iter__(self):
+        return iter(self.days)
+
+    @property
+    def key(self):
+        return f"{self.year:04d}-{self.month:02d}"
+
+    def day(self, day_number):
+        """Día 1..N; None si no existe en el mes"""
+        if 1 <= day_number <= len(self.days):
+            return self.days[day_number - 1]
+        return None
+
+    def for_index(self, day_index):
+        """Día correspondiente a la fila day_index (0 = día 1) del CSV"""
+        return self.day(day_index + 1)
+
+    def holidays(self):
+        return [info for info in self.days if info.is_holiday]
+
+    def workdays(self):
+        return [info for info in self.days if info.is_workday]
+
+
+class WorkCalendar:
+    """Calendarios mensuales precalculados una sola vez por mes, con la tabla local de festivos"""
+
+    def __init__(self, holidays=None):
+        self.holidays = dict(holidays or {})
+        self._months = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filepath=DEFAULT_HOLIDAYS_FILE):
+        """Crear el calendario con los festivos de un JSON {"AAAA-MM-DD": "nombre"}"""
+        return cls(load_holidays(filepath))
+
+    def month(self, year=None, month=None):
+        """Calendario del mes indicado (por defecto el actual)"""
+        if year is None or month is None:
+            today = datetime.now()
+            year, month = today.year, today.month
+        key = (year, month)
+        found = self._months.get(key)
+        if found is None:
+            with self._lock:
+                found = self._months.get(key)
+                if found is None:
+                    found = MonthCalendar(year, month, self.holidays)
+                    self._months[key] = found
+        return found
+
+    def months(self, start, end):
+        """Calendarios de start a end inclusive; ambos como (año, mes) o "AAAA-MM" """
+        year, month = parse_month(start) if isinstance(start, str) else start
+        end_year, end_month = parse_month(end) if isinstance(end, str) else end
+        result = []
+        while (year, month) <= (end_year, end_month):
+            result.append(self.month(year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return result
+
+    def is_holiday(self, day_date):
+        return day_date in self.holidays
+
+
+def parse_month(value):
+    """Convertir "AAAA-MM" a (año, mes)"""
+    try:
+        year, month = (int(part) for part in str(value).strip().split("-"))
+    except ValueError:
+        raise ValueError(f"Mes inválido '{value}', se espera AAAA-MM")
+    if not 1 <= month <= 12:
+        raise ValueError(f"Mes inválido '{value}', se espera AAAA-MM")
+    return year, month
+
+
+def month_from_filename(filepath):
+    """(año, mes) escrito en el nombre del archivo ("horas_2026-10.csv"); None si no tiene"""
+    found = FILENAME_MONTH_RE.search(os.path.basename(filepath or ""))
+    if not found:
+        return None
+    return int(found.group(1)), int(found.group(2))
+
+
+def load_holidays(filepath=DEFAULT_HOLIDAYS_FILE):
+    """Leer la tabla local de festivos; retorna {date: nombre} (vacía si no existe el archivo)"""
+    if not filepath or not os.path.exists(filepath):
+        return {}
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {date.fromisoformat(day): name for day, name in data.items()}
+
+
+# Calendario compartido con la tabla de festivos por defecto
+work_calendar = WorkCalendar.from_file()
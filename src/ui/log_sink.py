@@ -0,0 +1,91 @@
+import logging
+import os
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor
+
+LOGGER_NAME = "replicon_automator"
+
+
+def get_file_logger(log_dir, max_bytes=1024 * 1024, backup_count=5):
+    """Obtener el logger que escribe el log completo en un archivo rotativo"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(log_dir, "replicon_automator.log"),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+        logger.addHandler(handler)
+    except OSError as e:
+        print(f"No se pudo crear el archivo de log: {e}")
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+class LogSink(QObject):
+    """Recibe mensajes de log, los agrupa y los escribe en el widget por lotes"""
+
+    def __init__(self, text_widget, max_lines=1000, flush_interval_ms=200, logger=None, parent=None):
+        super().__init__(parent)
+        self.text_widget = text_widget
+        self.logger = logger
+        # Mensajes pendientes de mostrar (acotados para no crecer sin límite)
+        self._pending = deque(maxlen=max_lines)
+        self._dropped = 0
+
+        # El widget conserva como máximo max_lines líneas (buffer circular)
+        self.text_widget.document().setMaximumBlockCount(max_lines)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(flush_interval_ms)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
+
+    def write(self, message):
+        """Agregar un mensaje al buffer y al archivo de log"""
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self._pending.append(f"[{timestamp}] {message}")
+
+        if self.logger:
+            self.logger.info(message)
+
+    def flush(self):
+        """Escribir en el widget todos los mensajes pendientes de una sola vez"""
+        if not self._pending:
+            return
+
+        lines = list(self._pending)
+        self._pending.clear()
+        if self._dropped:
+            lines.insert(0, f"... {self._dropped} mensajes omitidos (ver archivo de log) ...")
+            self._dropped = 0
+
+        document = self.text_widget.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not document.isEmpty():
+            cursor.insertText("\n")
+        cursor.insertText("\n".join(lines))
+
+        scroll_bar = self.text_widget.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+    def clear(self):
+        """Limpiar el widget y los mensajes pendientes"""
+        self._pending.clear()
+        self._dropped = 0
+        self.text_widget.clear()
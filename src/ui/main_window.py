@@ -11,122 +11,180 @@ Fecha: 2025
 
 import sys
 import os
+from datetime import datetime
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QFileDialog, 
                              QMessageBox, QTextEdit, QTabWidget, QListWidget,
                              QListWidgetItem, QFrame, QProgressBar, QApplication, QDialog,
-                             QSystemTrayIcon, QMenu, QCheckBox)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QIcon, QAction
-from selenium.webdriver.common.by import By
+                             QSystemTrayIcon, QMenu, QCheckBox, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QSpinBox, QDateEdit)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QDate
+from PyQt6.QtGui import QFont, QIcon, QAction, QTextCursor
 
 # Agregar el directorio padre al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.ui.styles import MAIN_STYLE, BUTTON_SUCCESS, BUTTON_DANGER, BUTTON_WARNING
 from src.ui.horario_dialog import HorarioDialog
-from src.core.selenium_handler import SeleniumHandler
-from src.core.csv_processor import CSVProcessor
+from src.ui.plan_dialog import PlanDialog
+from src.ui.log_sink import LogSink, get_file_logger
+from src.core.progress import STAGE_LABELS, STAGE_ENTRIES, STAGE_DONE, STAGE_ERROR
 from src.core.account_mapper import AccountMapper
+from src.core.report_builder import ReportBuilder
+from src.core.parse_cache import parse_cache
+from src.core.job_queue import JobQueue, JOB_RUNNING
+from src.core.startup_timing import preload_modules, startup_timer
+from src.core.work_calendar import month_from_filename, work_calendar
 from config.config import Config
+# AutomationRunner, CSVProcessor y JobScheduler (Selenium y pandas) se importan al usarlos;
+# preload_modules los carga en segundo plano después de mostrar la ventana
 
 class AutomationWorker(QThread):
     """Worker thread para ejecutar la automatización sin bloquear la UI"""
+    progress_event = pyqtSignal(object)  # ProgressEvent
+    finished = pyqtSignal(bool, str)
+    
+    def __init__(self, email, password, csv_file, horarios, mapeo_cuentas, headless=False, profile_dir=None,
+                 incremental=False, dry_run=False, month=None):
+        super().__init__()
+        from src.core.automation_runner import AutomationRunner
+        self.dry_run = dry_run
+        self.runner = AutomationRunner(
+            email, password, csv_file, horarios, mapeo_cuentas,
+            headless=headless,
+            on_event=self.progress_event.emit,
+            profile_dir=profile_dir,
+            month=month,
+            incremental=incremental,
+            dry_run=dry_run
+        )
+        
+    def run(self):
+        try:
+            self.runner.run()
+            if self.dry_run:
+                self.finished.emit(True, "Simulación terminada: no se abrió el navegador")
+                return
+            self.finished.emit(True, "Proceso completado exitosamente")
+        except Exception as e:
+            self.finished.emit(False, f"Error en el proceso: {str(e)}")
+    
+    def close_browser(self):
+        """Cerrar navegador si está abierto"""
+        self.runner.close_browser()
+
+class ReportWorker(QThread):
+    """Worker thread para generar el reporte de horas sin bloquear la UI"""
     progress_update = pyqtSignal(str)
+    section_ready = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
     
-    def __init__(self, email, password, csv_file, horarios, mapeo_cuentas, headless=False):
+    def __init__(self, csv_file, horarios, mapeo_cuentas, month=None):
         super().__init__()
-        self.email = email
-        self.password = password
         self.csv_file = csv_file
         self.horarios = horarios
         self.mapeo_cuentas = mapeo_cuentas
-        self.headless = headless
-        self.selenium_handler = None  # Referencia al handler para poder cerrarlo
-        
+        self.month = month  # (año, mes) del CSV; None = mes actual
+    
     def run(self):
+        from src.core.csv_processor import CSVProcessor, ProcessingCancelled
         try:
-            # Inicializar componentes
-            self.selenium_handler = SeleniumHandler()
             csv_processor = CSVProcessor()
             csv_processor.set_csv_file(self.csv_file)
             
-            # Procesar CSV
+            # Procesar CSV para obtener entradas
             self.progress_update.emit("Procesando archivo CSV...")
-            time_entries = csv_processor.process_csv_with_pandas(self.horarios, self.mapeo_cuentas)
-            
-            # Configurar navegador (en segundo plano si se especifica)
-            self.progress_update.emit("Iniciando navegador...")
-            self.selenium_handler.setup_driver(headless=self.headless)
-            
-            # Login
-            self.progress_update.emit("Iniciando sesión...")
-            self.selenium_handler.login(self.email, self.password)
-            
-            # Seleccionar mes
-            self.progress_update.emit("Seleccionando mes...")
-            self.selenium_handler.select_month()
+            time_entries = csv_processor.load_time_entries(
+                self.horarios,
+                self.mapeo_cuentas,
+                progress_callback=self.progress_update.emit,
+                should_cancel=self.isInterruptionRequested
+            )
             
-            # Procesar entradas de forma optimizada
-            total_entries = len(time_entries)
-            for i, daily_entries in enumerate(time_entries, start=2):
-                self.progress_update.emit(f"Procesando día {i-1} de {total_entries}...")
-                
-                # Verificar si es día de vacaciones o feriado
-                vacation_elements = self.selenium_handler.find_elements_safe(
-                    By.XPATH, f"//li[{i}]/ul/li/div/span[contains(text(), 'Col-Vacations')]"
-                )
-                holiday_elements = self.selenium_handler.find_elements_safe(
-                    By.XPATH, f"//li[{i}]/div/div[@class='holidayIndicator']"
-                )
-                
-                if vacation_elements or holiday_elements:
-                    continue
-                
-                # Filtrar entradas válidas
-                valid_entries = [entry for entry in daily_entries 
-                               if entry["project"] not in ["Vacation", "No work"]]
-                
-                if valid_entries:
-                    # Procesar todas las entradas del día de una vez (optimizado)
-                    self.selenium_handler.batch_entries_same_day(i, valid_entries)
+            # Calcular resumen
+            self.progress_update.emit("Calculando resumen de horas...")
+            year, month = self.month or (None, None)
+            summary = csv_processor.calculate_hours_summary(time_entries, year, month)
             
-            # Cerrar navegador
-            self.selenium_handler.close_driver()
+            # Enviar el reporte a la UI sección por sección
+            month_date = datetime(year, month, 1) if self.month else datetime.now()
+            month_name = month_date.strftime("%B %Y")
+            for section in ReportBuilder().iter_sections(summary, month_name):
+                if self.isInterruptionRequested():
+                    raise ProcessingCancelled("Reporte cancelado por el usuario")
+                self.section_ready.emit(section)
             
-            self.finished.emit(True, "Proceso completado exitosamente")
+            self.finished.emit(True, "Reporte generado correctamente")
             
+        except ProcessingCancelled as e:
+            self.finished.emit(False, str(e))
         except Exception as e:
-            # Asegurar que se cierre el navegador en caso de error
-            if self.selenium_handler:
-                try:
-                    self.selenium_handler.close_driver()
-                except:
-                    pass
-            self.finished.emit(False, f"Error en el proceso: {str(e)}")
+            self.finished.emit(False, f"Error al generar reporte: {str(e)}")
     
-    def close_browser(self):
-        """Cerrar navegador si está abierto"""
-        if self.selenium_handler:
-            try:
-                self.selenium_handler.close_driver()
-            except:
-                pass
+    def cancel(self):
+        """Solicitar la cancelación del reporte"""
+        self.requestInterruption()
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = Config()
-        self.account_mapper = AccountMapper()
-        self.csv_processor = CSVProcessor()
+        self._account_mapper = None
+        self._csv_processor = None
         self.horarios = self.config.load_horarios()
         self.csv_file = None
         self.worker = None
+        self.report_worker = None
         self.tray_icon = None
+        self._job_queue = None
+        self.job_scheduler = None
+        self._first_show = True
+        
+        # Cache en disco opcional para archivos CSV grandes
+        if self.config.PARSE_CACHE_DISK:
+            parse_cache.configure_disk(self.config.PARSE_CACHE_DIR, self.config.PARSE_CACHE_MIN_BYTES)
         
         self.init_ui()
         self.load_saved_credentials()  # Cargar credenciales guardadas
+    
+    @property
+    def account_mapper(self):
+        """AccountMapper, creado al primer uso"""
+        if self._account_mapper is None:
+            self._account_mapper = AccountMapper()
+        return self._account_mapper
+    
+    @property
+    def job_queue(self):
+        """JobQueue (base SQLite de la cola), abierta al primer uso"""
+        if self._job_queue is None:
+            self._job_queue = JobQueue(self.config.JOBS_DB)
+        return self._job_queue
+    
+    @property
+    def csv_processor(self):
+        """CSVProcessor (importa pandas), creado al primer uso"""
+        if self._csv_processor is None:
+            from src.core.csv_processor import CSVProcessor
+            self._csv_processor = CSVProcessor()
+        return self._csv_processor
+    
+    def showEvent(self, event):
+        """Tras el primer pintado: medir el arranque y precargar los módulos pesados"""
+        super().showEvent(event)
+        if self._first_show:
+            self._first_show = False
+            QTimer.singleShot(0, self.on_first_paint)
+    
+    def on_first_paint(self):
+        """La ventana ya es visible: el trabajo pesado sigue en segundo plano"""
+        startup_timer.mark("primer_pintado")
+        preload_modules(timer=startup_timer)
+        if self.config.STARTUP_TIMING:
+            print(startup_timer.to_json(), flush=True)
+            self.log_message(f"Arranque: {startup_timer.summary()}")
+        if self.config.STARTUP_EXIT:
+            QTimer.singleShot(0, QApplication.instance().quit)
         
     def get_app_icon(self):
         """Obtener el icono de la aplicación"""
@@ -224,23 +282,37 @@ class MainWindow(QMainWindow):
         automation_tab = self.create_automation_tab()
         tab_widget.addTab(automation_tab, "Automatización")
         
-        # Tab de configuración
-        config_tab = self.create_config_tab()
-        tab_widget.addTab(config_tab, "Configuración")
+        # Configuración, reportes y cola se construyen al abrirlos por primera vez
+        self.lazy_tabs = {}
+        self.add_lazy_tab(tab_widget, self.create_config_tab, "Configuración")
+        self.add_lazy_tab(tab_widget, self.create_reports_tab, "Reportes")
         
-        # Tab de reportes
-        reports_tab = self.create_reports_tab()
-        tab_widget.addTab(reports_tab, "Reportes")
+        # Tab de cola de trabajos (varias cuentas): abre la base y el refresco al mostrarla
+        self.add_lazy_tab(tab_widget, self.create_jobs_tab, "Cola")
         
-        # Tab de documentación
-        docs_tab = self.create_documentation_tab()
-        tab_widget.addTab(docs_tab, "Documentación")
+        # Tab de documentación (HTML extenso, también diferido)
+        self.add_lazy_tab(tab_widget, self.create_documentation_tab, "Documentación")
         
+        tab_widget.currentChanged.connect(self.build_lazy_tab)
+        self.tab_widget = tab_widget
         main_layout.addWidget(tab_widget)
         
         # Centrar ventana
         self.center_window()
     
+    def add_lazy_tab(self, tab_widget, builder, title):
+        """Agregar una pestaña vacía que se llena con builder() al activarla"""
+        placeholder = QWidget()
+        placeholder_layout = QVBoxLayout(placeholder)
+        placeholder_layout.setContentsMargins(0, 0, 0, 0)
+        self.lazy_tabs[tab_widget.addTab(placeholder, title)] = builder
+    
+    def build_lazy_tab(self, index):
+        """Construir la pestaña diferida index si aún no existe"""
+        builder = self.lazy_tabs.pop(index, None)
+        if builder is not None:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+    
     def create_automation_tab(self):
         """Crear tab de automatización principal"""
         widget = QWidget()
@@ -303,6 +375,20 @@ class MainWindow(QMainWindow):
         csv_layout.addWidget(self.select_csv_btn)
         cred_layout.addLayout(csv_layout)
         
+        # Mes del CSV (se toma del nombre del archivo si lo trae)
+        month_layout = QHBoxLayout()
+        month_label_title = QLabel("Mes:")
+        month_label_title.setFixedWidth(label_width)
+        month_label_title.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        month_layout.addWidget(month_label_title)
+        self.month_edit = QDateEdit(QDate.currentDate())
+        self.month_edit.setDisplayFormat("MM/yyyy")
+        self.month_edit.setToolTip("Mes al que corresponden las filas del CSV")
+        self.month_edit.dateChanged.connect(self.on_month_changed)
+        month_layout.addWidget(self.month_edit)
+        month_layout.addStretch()
+        cred_layout.addLayout(month_layout)
+        
         layout.addWidget(cred_frame)
         
         # Botones de acción
@@ -314,6 +400,13 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(False)
         buttons_layout.addWidget(self.start_btn)
         
+        self.plan_btn = QPushButton("Simular")
+        self.plan_btn.setStyleSheet(BUTTON_WARNING)
+        self.plan_btn.setToolTip("Mostrar el plan (días, entradas y duración estimada) sin abrir el navegador")
+        self.plan_btn.clicked.connect(self.preview_plan)
+        self.plan_btn.setEnabled(False)
+        buttons_layout.addWidget(self.plan_btn)
+        
         self.stop_btn = QPushButton("Detener")
         self.stop_btn.setStyleSheet(BUTTON_DANGER)
         self.stop_btn.clicked.connect(self.stop_automation)
@@ -328,8 +421,11 @@ class MainWindow(QMainWindow):
         self.background_checkbox.setToolTip("Ejecuta el navegador de forma invisible")
         self.minimize_tray_checkbox = QCheckBox("Minimizar a bandeja")
         self.minimize_tray_checkbox.setToolTip("La ventana se ocultará en la bandeja mientras corre")
+        self.incremental_checkbox = QCheckBox("Solo días modificados")
+        self.incremental_checkbox.setToolTip("Envía solo los días agregados o editados desde la última ejecución")
         options_layout.addWidget(self.background_checkbox)
         options_layout.addWidget(self.minimize_tray_checkbox)
+        options_layout.addWidget(self.incremental_checkbox)
         options_layout.addStretch(1)
         layout.addLayout(options_layout)
         
@@ -341,9 +437,19 @@ class MainWindow(QMainWindow):
         # Log de actividad
         self.log_text = QTextEdit()
         self.log_text.setMaximumHeight(150)
+        self.log_text.setReadOnly(True)
         self.log_text.setPlaceholderText("Los mensajes de actividad aparecerán aquí...")
         layout.addWidget(self.log_text)
         
+        # Los mensajes se escriben por lotes y el log completo va a un archivo rotativo
+        self.log_sink = LogSink(
+            self.log_text,
+            max_lines=self.config.LOG_MAX_LINES,
+            flush_interval_ms=self.config.LOG_FLUSH_INTERVAL_MS,
+            logger=get_file_logger(self.config.LOG_DIR),
+            parent=self
+        )
+        
         # Conectar validación de campos
         self.email_entry.textChanged.connect(self.validate_fields)
         self.password_entry.textChanged.connect(self.validate_fields)
@@ -392,10 +498,29 @@ class MainWindow(QMainWindow):
         widget = QWidget()
         layout = QVBoxLayout(widget)
         
-        # Botón para generar reporte
-        generate_report_btn = QPushButton("Generar Reporte de Horas")
-        generate_report_btn.clicked.connect(self.generate_hours_report)
-        layout.addWidget(generate_report_btn)
+        # Botones para generar o cancelar el reporte
+        report_buttons = QHBoxLayout()
+        
+        self.generate_report_btn = QPushButton("Generar Reporte de Horas")
+        self.generate_report_btn.clicked.connect(self.generate_hours_report)
+        report_buttons.addWidget(self.generate_report_btn)
+        
+        self.cancel_report_btn = QPushButton("Cancelar")
+        self.cancel_report_btn.setStyleSheet(BUTTON_DANGER)
+        self.cancel_report_btn.clicked.connect(self.cancel_hours_report)
+        self.cancel_report_btn.setEnabled(False)
+        report_buttons.addWidget(self.cancel_report_btn)
+        
+        layout.addLayout(report_buttons)
+        
+        # Barra de progreso del reporte
+        self.report_progress_bar = QProgressBar()
+        self.report_progress_bar.setVisible(False)
+        layout.addWidget(self.report_progress_bar)
+        
+        self.report_status_label = QLabel("")
+        self.report_status_label.setVisible(False)
+        layout.addWidget(self.report_status_label)
         
         # Área de reporte
         self.report_text = QTextEdit()
@@ -404,6 +529,65 @@ class MainWindow(QMainWindow):
         
         return widget
     
+    def create_jobs_tab(self):
+        """Crear tab de la cola de trabajos para varias cuentas"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        
+        info = QLabel("Agregue el correo, la contraseña y el CSV de la pestaña Automatización "
+                      "para cada empleado; la cola los ejecuta en paralelo con el navegador oculto.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+        
+        queue_buttons = QHBoxLayout()
+        self.enqueue_btn = QPushButton("Agregar a la cola")
+        self.enqueue_btn.clicked.connect(self.enqueue_current_job)
+        queue_buttons.addWidget(self.enqueue_btn)
+        
+        self.start_queue_btn = QPushButton("Iniciar cola")
+        self.start_queue_btn.setStyleSheet(BUTTON_SUCCESS)
+        self.start_queue_btn.clicked.connect(self.start_job_queue)
+        queue_buttons.addWidget(self.start_queue_btn)
+        
+        self.stop_queue_btn = QPushButton("Detener cola")
+        self.stop_queue_btn.setStyleSheet(BUTTON_DANGER)
+        self.stop_queue_btn.clicked.connect(self.stop_job_queue)
+        self.stop_queue_btn.setEnabled(False)
+        queue_buttons.addWidget(self.stop_queue_btn)
+        
+        queue_buttons.addWidget(QLabel("Navegadores:"))
+        self.max_browsers_spin = QSpinBox()
+        self.max_browsers_spin.setRange(1, 8)
+        self.max_browsers_spin.setValue(self.config.JOBS_MAX_BROWSERS)
+        queue_buttons.addWidget(self.max_browsers_spin)
+        layout.addLayout(queue_buttons)
+        
+        self.jobs_table = QTableWidget(0, 6)
+        self.jobs_table.setHorizontalHeaderLabels(["Id", "Estado", "Intentos", "Cuenta", "CSV", "Progreso / error"])
+        self.jobs_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.jobs_table)
+        
+        job_buttons = QHBoxLayout()
+        cancel_job_btn = QPushButton("Cancelar seleccionado")
+        cancel_job_btn.clicked.connect(self.cancel_selected_job)
+        job_buttons.addWidget(cancel_job_btn)
+        retry_job_btn = QPushButton("Reintentar seleccionado")
+        retry_job_btn.clicked.connect(self.retry_selected_job)
+        job_buttons.addWidget(retry_job_btn)
+        job_buttons.addStretch(1)
+        layout.addLayout(job_buttons)
+        
+        # El estado se lee de la base de datos (también refleja trabajos agregados desde la CLI)
+        self.jobs_timer = QTimer(self)
+        self.jobs_timer.timeout.connect(self.refresh_jobs_table)
+        self.jobs_timer.start(2000)
+        self.refresh_jobs_table()
+        
+        return widget
+    
     def create_documentation_tab(self):
         """Crear tab de documentación y ayuda"""
         widget = QWidget()
@@ -543,22 +727,44 @@ ND,ND,EXT/PROD:PI:1600:2000
         )
         
         if file_path:
-            self.csv_file = file_path
-            filename = os.path.basename(file_path)
-            self.csv_label.setText(f"Archivo CSV: {filename}")
+            # Tomar el mes del nombre del archivo si lo trae (antes de validar con ese mes)
+            self.csv_file = None
+            file_month = month_from_filename(file_path)
+            if file_month:
+                self.month_edit.setDate(QDate(file_month[0], file_month[1], 1))
             
-            # Validar formato del CSV
-            self.csv_processor.set_csv_file(file_path)
-            is_valid, message = self.csv_processor.validate_csv_format()
-            
-            if not is_valid:
-                QMessageBox.warning(self, "Archivo inválido", f"El archivo CSV no es válido:\n{message}")
-                self.csv_file = None
-                self.csv_label.setText("Archivo CSV: No seleccionado")
-            else:
-                self.log_message(f"Archivo CSV cargado correctamente: {filename}")
-            
-            self.validate_fields()
+            self.csv_file = file_path
+            self.csv_label.setText(f"Archivo CSV: {os.path.basename(file_path)}")
+            self.validate_selected_csv()
+    
+    def validate_selected_csv(self):
+        """Validar el CSV seleccionado con los días del mes elegido"""
+        filename = os.path.basename(self.csv_file)
+        self.csv_processor.set_csv_file(self.csv_file)
+        is_valid, message = self.csv_processor.validate_csv_format(
+            self.account_mapper.get_mapping(),
+            days_in_month=len(work_calendar.month(*self.selected_month())),
+            horarios=self.horarios
+        )
+        
+        if not is_valid:
+            QMessageBox.warning(self, "Archivo inválido", f"El archivo CSV no es válido:\n{message}")
+            self.csv_file = None
+            self.csv_label.setText("Archivo CSV: No seleccionado")
+        else:
+            self.log_message(f"Archivo CSV cargado correctamente: {filename} - {message}")
+        
+        self.validate_fields()
+    
+    def on_month_changed(self, _date):
+        """Volver a validar el CSV cargado con los días del nuevo mes"""
+        if self.csv_file:
+            self.validate_selected_csv()
+    
+    def selected_month(self):
+        """(año, mes) elegido para el CSV"""
+        selected = self.month_edit.date()
+        return selected.year(), selected.month()
     
     def validate_fields(self):
         """Validar campos obligatorios"""
@@ -567,6 +773,7 @@ ND,ND,EXT/PROD:PI:1600:2000
         csv_valid = bool(self.csv_file)
         
         self.start_btn.setEnabled(email_valid and password_valid and csv_valid)
+        self.plan_btn.setEnabled(csv_valid)
     
     def start_automation(self):
         """Iniciar proceso de automatización"""
@@ -575,12 +782,14 @@ ND,ND,EXT/PROD:PI:1600:2000
         
         # Configurar UI
         self.start_btn.setEnabled(False)
+        self.plan_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminado
+        self.progress_bar.setRange(0, 0)  # Indeterminado hasta conocer el total de entradas
+        self.progress_bar.setFormat("%p%")
         
         # Limpiar log
-        self.log_text.clear()
+        self.log_sink.clear()
         
         # Verificar si debe minimizar a bandeja
         if self.minimize_tray_checkbox.isChecked():
@@ -605,16 +814,52 @@ ND,ND,EXT/PROD:PI:1600:2000
             self.csv_file,
             self.horarios,
             self.account_mapper.get_mapping(),
-            headless=headless_mode
+            headless=headless_mode,
+            profile_dir=self.config.PROFILE_DIR if self.config.PROFILE_ENABLED else None,
+            incremental=self.incremental_checkbox.isChecked(),
+            month=self.selected_month()
         )
         
         # Conectar señales
-        self.worker.progress_update.connect(self.log_message)
+        self.worker.progress_event.connect(self.on_progress_event)
         self.worker.finished.connect(self.automation_finished)
         
         # Iniciar worker
         self.worker.start()
     
+    def preview_plan(self):
+        """Compilar el plan de ejecución en segundo plano y mostrarlo"""
+        if self.worker and self.worker.isRunning():
+            return
+        
+        self.start_btn.setEnabled(False)
+        self.plan_btn.setEnabled(False)
+        self.log_sink.clear()
+        self.log_message("Compilando plan de ejecución...")
+        
+        # Sin contraseña, pero con el correo: el manifiesto es el de la cuenta
+        self.worker = AutomationWorker(
+            self.email_entry.text().strip() or None, None, self.csv_file, self.horarios,
+            self.account_mapper.get_mapping(),
+            incremental=self.incremental_checkbox.isChecked(),
+            dry_run=True,
+            month=self.selected_month()
+        )
+        self.worker.progress_event.connect(self.on_progress_event)
+        self.worker.finished.connect(self.plan_finished)
+        self.worker.start()
+    
+    def plan_finished(self, success, message):
+        """Mostrar el plan compilado (o el error)"""
+        self.validate_fields()
+        self.log_sink.flush()
+        plan = self.worker.runner.execution_plan if self.worker else None
+        if success and plan:
+            PlanDialog(plan, self).exec()
+        else:
+            self.log_message("❌ " + message)
+            QMessageBox.critical(self, "Error", message)
+    
     def stop_automation(self):
         """Detener proceso de automatización"""
         if self.worker and self.worker.isRunning():
@@ -628,14 +873,19 @@ ND,ND,EXT/PROD:PI:1600:2000
     
     def automation_finished(self, success, message):
         """Manejar finalización de automatización"""
+        if self.worker and self.worker.runner.profile_paths:
+            self.log_message(f"Perfil de tiempos guardado en: {self.worker.runner.profile_paths[0]}")
+
         # Restaurar UI
         self.start_btn.setEnabled(True)
+        self.plan_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.progress_bar.setVisible(False)
         
         # Mostrar resultado
         if success:
             self.log_message("✅ " + message)
+            self.log_sink.flush()
             # Si está en la bandeja, mostrar notificación
             if self.tray_icon and self.tray_icon.isVisible():
                 self.tray_icon.showMessage(
@@ -648,6 +898,7 @@ ND,ND,EXT/PROD:PI:1600:2000
                 QMessageBox.information(self, "Éxito", message)
         else:
             self.log_message("❌ " + message)
+            self.log_sink.flush()
             # Si está en la bandeja, mostrar notificación de error
             if self.tray_icon and self.tray_icon.isVisible():
                 self.tray_icon.showMessage(
@@ -659,12 +910,45 @@ ND,ND,EXT/PROD:PI:1600:2000
             else:
                 QMessageBox.critical(self, "Error", message)
     
+    def on_progress_event(self, event):
+        """Actualizar log y barra de progreso a partir de un evento de la automatización"""
+        # El mensaje final lo muestra automation_finished
+        if event.message and event.stage not in (STAGE_DONE, STAGE_ERROR):
+            self.log_message(event.message)
+        
+        if event.stage == STAGE_ENTRIES and event.entries_total:
+            # Barra determinada con porcentaje y tiempo restante estimado
+            self.progress_bar.setRange(0, event.entries_total)
+            self.progress_bar.setValue(min(event.entries_done, event.entries_total))
+            eta_text = self.format_duration(event.eta) if event.eta is not None else "--:--"
+            self.progress_bar.setFormat(
+                f"%p% · {event.entries_done}/{event.entries_total} entradas · "
+                f"día {event.day}/{event.total_days} · ETA {eta_text}"
+            )
+        elif event.stage in STAGE_LABELS and event.stage != STAGE_ENTRIES:
+            self.progress_bar.setFormat(STAGE_LABELS[event.stage])
+        
+        # Al terminar mostrar el tiempo de cada etapa
+        if event.stage in (STAGE_DONE, STAGE_ERROR) and event.stage_timings:
+            timings = ", ".join(
+                f"{STAGE_LABELS.get(stage, stage)}: {self.format_duration(seconds)}"
+                for stage, seconds in event.stage_timings.items()
+            )
+            self.log_message(f"Tiempos por etapa: {timings} (total {self.format_duration(event.elapsed)})")
+    
+    @staticmethod
+    def format_duration(seconds):
+        """Formatear segundos como mm:ss o hh:mm:ss"""
+        seconds = int(round(seconds))
+        hours, remainder = divmod(seconds, 3600)
+        minutes, secs = divmod(remainder, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{secs:02d}"
+        return f"{minutes:02d}:{secs:02d}"
+    
     def log_message(self, message):
-        """Agregar mensaje al log"""
-        self.log_text.append(f"[{QTimer().remainingTime()}] {message}")
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        """Agregar mensaje al log (se muestra en el siguiente lote)"""
+        self.log_sink.write(message)
     
     def update_horarios_list(self):
         """Actualizar lista de horarios"""
@@ -712,113 +996,61 @@ ND,ND,EXT/PROD:PI:1600:2000
             self.log_message("Horario eliminado")
     
     def generate_hours_report(self):
-        """Generar reporte de horas con detalles semanales y horas extra"""
+        """Generar reporte de horas con detalles semanales y horas extra en segundo plano"""
         if not self.csv_file:
             QMessageBox.warning(self, "Advertencia", "Seleccione un archivo CSV primero")
             return
         
-        try:
-            # Procesar CSV para obtener entradas
-            time_entries = self.csv_processor.process_csv_with_pandas(
-                self.horarios, 
-                self.account_mapper.get_mapping()
-            )
-            
-            # Calcular resumen
-            summary = self.csv_processor.calculate_hours_summary(time_entries)
-            
-            # Obtener mes y año del archivo CSV
-            import os
-            from datetime import datetime
-            csv_name = os.path.basename(self.csv_file)
-            # Intentar extraer mes y año del nombre del archivo
-            current_date = datetime.now()
-            month_name = current_date.strftime("%B %Y")
-            
-            # Generar reporte
-            report = f"""
-📊 REPORTE MENSUAL DE HORAS - {month_name.upper()}
-═══════════════════════════════════════════
-
-📅 RESUMEN GENERAL:
-─────────────────
-• Total de días: {summary['total_days']}
-• Total de horas: {summary['total_hours']:.2f}h
-• Promedio de horas por día: {summary['average_hours_per_day']:.2f}h
-
-⏰ ANÁLISIS DE HORAS:
-──────────────────
-• Horas regulares: {summary['regular_hours']:.2f}h
-• Horas extra diarias: {summary['overtime_daily']:.2f}h
-• Horas extra semanales: {summary['overtime_weekly']:.2f}h
-• Estándar diario: {summary['standard_hours_per_day']}h
-• Estándar semanal: {summary['standard_hours_per_week']}h
-
-📈 HORAS POR SEMANA DEL MES:
-───────────────────────────
-"""
-            
-            for week, week_data in summary['hours_by_week'].items():
-                week_hours = week_data['hours']
-                week_days = week_data['days']
-                avg_daily = week_hours / week_days if week_days > 0 else 0
-                overtime_week = max(0, week_hours - summary['standard_hours_per_week'])
-                
-                report += f"• {week}: {week_hours:.2f}h ({week_days} días, promedio {avg_daily:.2f}h/día)"
-                if overtime_week > 0:
-                    report += f" (Extra: {overtime_week:.2f}h)"
-                report += "\n"
-            
-            report += f"""
-🏢 HORAS DE TRABAJO POR PROYECTO:
-───────────────────────────────
-"""
-            
-            # Separar proyectos de trabajo y tiempo libre
-            work_projects = {}
-            time_off_projects = {}
-            
-            for project, hours in summary['hours_by_project'].items():
-                if project in ['Vacation', 'No work', 'Holiday', 'Weekend', 'ND', 'Desconocido']:
-                    time_off_projects[project] = hours
-                else:
-                    work_projects[project] = hours
-            
-            # Mostrar proyectos de trabajo con porcentajes basados solo en horas trabajadas
-            work_total = sum(work_projects.values())
-            for project, hours in work_projects.items():
-                percentage = (hours / work_total) * 100 if work_total > 0 else 0
-                report += f"• {project}: {hours:.2f}h ({percentage:.1f}%)\n"
-            
-            # Mostrar tiempo libre por separado
-            if time_off_projects:
-                report += f"""
-🏖️ TIEMPO LIBRE / VACACIONES:
-───────────────────────────
-"""
-                for project, hours in time_off_projects.items():
-                    report += f"• {project}: {hours:.2f}h\n"
-            
-            # Agregar análisis de eficiencia
-            efficiency_score = (summary['regular_hours'] / summary['total_hours']) * 100 if summary['total_hours'] > 0 else 0
-            report += f"""
-📊 ANÁLISIS DE EFICIENCIA:
-────────────────────────
-• Porcentaje de horas regulares: {efficiency_score:.1f}%
-• Porcentaje de horas extra: {100 - efficiency_score:.1f}%
-"""
-            
-            if summary['overtime_daily'] > 10:
-                report += "⚠️ ALERTA: Alto nivel de horas extra detectado\n"
-            elif summary['overtime_daily'] > 0:
-                report += "⚡ Horas extra moderadas\n"
-            else:
-                report += "✅ Sin horas extra registradas\n"
-            
-            self.report_text.setText(report)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al generar reporte: {str(e)}")
+        if self.report_worker and self.report_worker.isRunning():
+            return
+        
+        # Configurar UI
+        self.report_text.clear()
+        self.generate_report_btn.setEnabled(False)
+        self.cancel_report_btn.setEnabled(True)
+        self.report_progress_bar.setVisible(True)
+        self.report_progress_bar.setRange(0, 0)  # Indeterminado
+        self.report_status_label.setVisible(True)
+        
+        # Crear worker thread
+        self.report_worker = ReportWorker(
+            self.csv_file,
+            self.horarios,
+            self.account_mapper.get_mapping(),
+            month=self.selected_month()
+        )
+        
+        # Conectar señales
+        self.report_worker.progress_update.connect(self.report_status_label.setText)
+        self.report_worker.section_ready.connect(self.append_report_section)
+        self.report_worker.finished.connect(self.report_finished)
+        
+        # Iniciar worker
+        self.report_worker.start()
+    
+    def append_report_section(self, section):
+        """Agregar una sección del reporte al final del área de reporte"""
+        self.report_text.moveCursor(QTextCursor.MoveOperation.End)
+        self.report_text.insertPlainText(section)
+    
+    def cancel_hours_report(self):
+        """Cancelar la generación del reporte"""
+        if self.report_worker and self.report_worker.isRunning():
+            self.report_status_label.setText("Cancelando reporte...")
+            self.report_worker.cancel()
+    
+    def report_finished(self, success, message):
+        """Manejar finalización del reporte"""
+        # Restaurar UI
+        self.generate_report_btn.setEnabled(True)
+        self.cancel_report_btn.setEnabled(False)
+        self.report_progress_bar.setVisible(False)
+        self.report_status_label.setText(message)
+        
+        if success:
+            self.report_text.moveCursor(QTextCursor.MoveOperation.Start)
+        elif not self.report_worker.isInterruptionRequested():
+            QMessageBox.critical(self, "Error", message)
     
     def generate_demo_csv(self):
         """Generar archivo CSV demo con datos de ejemplo"""
@@ -875,32 +1107,87 @@ ND,ND,EXT/PROD:PI:1600:2000
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al crear archivo demo: {str(e)}")
     
-    def closeEvent(self, event):
-        """Manejar cierre de ventana"""
-        if self.tray_icon and self.tray_icon.isVisible():
-            # Si hay proceso ejecutándose, minimizar a bandeja
-            if self.worker and self.worker.isRunning():
-                self.hide()
-                self.tray_icon.showMessage(
-                    "Automatizador de Replicon",
-                    "La aplicación sigue ejecutándose en segundo plano",
-                    QSystemTrayIcon.MessageIcon.Information,
-                    3000
-                )
-                event.ignore()
-            else:
-                # Si no hay proceso, preguntar si quiere cerrar
-                reply = QMessageBox.question(self, "Confirmar cierre",
-                                           "¿Desea cerrar la aplicación?",
-                                           QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-                if reply == QMessageBox.StandardButton.Yes:
-                    event.accept()
-                else:
-                    self.hide()
-                    event.ignore()
-        else:
-            # Comportamiento normal si no está en bandeja
-            event.accept()
+    def enqueue_current_job(self):
+        """Agregar a la cola el correo, la contraseña y el CSV actuales"""
+        if not (self.email_entry.text().strip() and self.password_entry.text().strip() and self.csv_file):
+            QMessageBox.warning(self, "Cola", "Complete el correo, la contraseña y el archivo CSV")
+            return
+        job_id = self.job_queue.enqueue(
+            self.email_entry.text().strip(),
+            self.password_entry.text().strip(),
+            self.csv_file,
+            month="%04d-%02d" % self.selected_month(),
+            incremental=self.incremental_checkbox.isChecked(),
+            max_attempts=self.config.JOBS_MAX_ATTEMPTS
+        )
+        self.log_message(f"Trabajo {job_id} agregado a la cola ({self.email_entry.text().strip()})")
+        if self.job_scheduler:
+            self.job_scheduler.notify()
+        self.refresh_jobs_table()
+    
+    def start_job_queue(self):
+        """Iniciar el despachador de la cola"""
+        if self.job_scheduler and self.job_scheduler.running:
+            return
+        from src.core.job_scheduler import JobScheduler
+        self.job_scheduler = JobScheduler(
+            self.job_queue,
+            self.horarios,
+            self.account_mapper.get_mapping(),
+            max_browsers=self.max_browsers_spin.value(),
+            account_interval=self.config.JOBS_ACCOUNT_INTERVAL,
+            retry_backoff=self.config.JOBS_RETRY_BACKOFF
+        )
+        self.job_scheduler.start()
+        self.start_queue_btn.setEnabled(False)
+        self.stop_queue_btn.setEnabled(True)
+        self.log_message(f"Cola iniciada ({self.max_browsers_spin.value()} navegadores)")
+    
+    def stop_job_queue(self):
+        """Detener la cola; los trabajos interrumpidos se reanudan al iniciarla de nuevo"""
+        if self.job_scheduler:
+            self.job_scheduler.stop()
+        self.start_queue_btn.setEnabled(True)
+        self.stop_queue_btn.setEnabled(False)
+        self.log_message("Cola detenida")
+    
+    def selected_job_id(self):
+        row = self.jobs_table.currentRow()
+        if row < 0:
+            return None
+        return int(self.jobs_table.item(row, 0).text())
+    
+    def cancel_selected_job(self):
+        job_id = self.selected_job_id()
+        if job_id is not None and not self.job_queue.cancel(job_id):
+            QMessageBox.information(self, "Cola", "Solo se pueden cancelar trabajos en cola o fallidos")
+        self.refresh_jobs_table()
+    
+    def retry_selected_job(self):
+        job_id = self.selected_job_id()
+        if job_id is not None and not self.job_queue.retry(job_id):
+            QMessageBox.information(self, "Cola", "Solo se pueden reintentar trabajos fallidos o cancelados")
+        elif self.job_scheduler:
+            self.job_scheduler.notify()
+        self.refresh_jobs_table()
+    
+    def refresh_jobs_table(self):
+        """Actualizar la tabla con el estado guardado de cada trabajo"""
+        jobs = self.job_queue.list_jobs()
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            detail = job.last_error if job.status != JOB_RUNNING and job.last_error else job.progress
+            values = [str(job.id), job.status_label, str(job.attempts), job.email,
+                      os.path.basename(job.csv_file), detail.splitlines()[0] if detail else ""]
+            for column, value in enumerate(values):
+                item = self.jobs_table.item(row, column)
+                if item is None:
+                    self.jobs_table.setItem(row, column, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+        if self.job_scheduler and not self.job_scheduler.running:
+            self.start_queue_btn.setEnabled(True)
+            self.stop_queue_btn.setEnabled(False)
     
     def closeEvent(self, event):
         """Manejar cierre de aplicación"""
@@ -912,14 +1199,21 @@ ND,ND,EXT/PROD:PI:1600:2000
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             
-            if reply == QMessageBox.StandardButton.Yes:
-                self.worker.terminate()
-                self.worker.wait()
-                event.accept()
-            else:
+            if reply != QMessageBox.StandardButton.Yes:
                 event.ignore()
-        else:
-            event.accept()
+                return
+            self.worker.terminate()
+            self.worker.wait()
+        
+        # Detener el reporte en curso antes de cerrar
+        if self.report_worker and self.report_worker.isRunning():
+            self.report_worker.cancel()
+            self.report_worker.wait()
+        
+        # Detener la cola: los trabajos en curso se reanudan en la próxima ejecución
+        if self.job_scheduler and self.job_scheduler.running:
+            self.job_scheduler.stop()
+        event.accept()
     
     def load_saved_credentials(self):
         """Cargar credenciales guardadas si existen"""
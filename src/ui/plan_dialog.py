@@ -0,0 +1,54 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPushButton, QFileDialog, QMessageBox
+from PyQt6.QtGui import QFont
+
+class PlanDialog(QDialog):
+    """Diálogo que muestra el plan de ejecución y permite guardarlo como JSON"""
+
+    def __init__(self, plan, parent=None):
+        super().__init__(parent)
+        self.plan = plan
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Plan de ejecución (simulación)")
+        self.setModal(True)
+        self.resize(720, 520)
+
+        layout = QVBoxLayout(self)
+
+        summary = QLabel(self.plan.summary())
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        # Un renglón por día
+        days_text = QTextEdit()
+        days_text.setReadOnly(True)
+        days_text.setFont(QFont("Consolas", 10))
+        days_text.setPlainText("\n".join(day.describe() for day in self.plan.days))
+        layout.addWidget(days_text)
+
+        # Botones
+        buttons_layout = QHBoxLayout()
+
+        save_btn = QPushButton("Guardar JSON")
+        save_btn.clicked.connect(self.save_plan)
+        buttons_layout.addWidget(save_btn)
+
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_btn)
+
+        layout.addLayout(buttons_layout)
+
+    def save_plan(self):
+        filepath, _ = QFileDialog.getSaveFileName(
+            self, "Guardar plan", f"plan_{self.plan.month}.json", "JSON (*.json)"
+        )
+        if not filepath:
+            return
+        try:
+            self.plan.save(filepath)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el plan: {e}")
+            return
+        QMessageBox.information(self, "Plan guardado", f"Plan guardado en {filepath}")